@@ -1,20 +1,48 @@
 """Database configuration and session management"""
 import os
+from sqlalchemy import event, inspect
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
 from sqlalchemy.orm import sessionmaker
 from dotenv import load_dotenv
 from app.models import Base
+from app.metrics import instrument_engine
+from app.logs import queue_logger
 
 load_dotenv()
 
 DATABASE_URL = os.getenv("DATABASE_URL", "sqlite+aiosqlite:///./data/meetings.db")
 
+# Seconds a connection waits for a lock held by another process
+SQLITE_BUSY_TIMEOUT = float(os.getenv("SQLITE_BUSY_TIMEOUT", "30"))
+
+# Log every SQL statement (development). Statements are logged from the
+# event loop thread, so they go through the queue listener rather than
+# echo=True, which writes to stdout inline.
+SQL_ECHO = os.getenv("SQL_ECHO", "false").lower() == "true"
+
+IS_SQLITE = DATABASE_URL.startswith("sqlite")
+
+if SQL_ECHO:
+    queue_logger("sqlalchemy.engine", "INFO")
+
 # Create async engine
 engine = create_async_engine(
     DATABASE_URL,
-    echo=True,  # Set to False in production
-    future=True
+    echo=False,
+    future=True,
+    connect_args={"timeout": SQLITE_BUSY_TIMEOUT} if IS_SQLITE else {}
 )
+instrument_engine(engine.sync_engine)
+
+
+if IS_SQLITE:
+    @event.listens_for(engine.sync_engine, "connect")
+    def _set_sqlite_pragmas(dbapi_connection, connection_record):
+        """Use WAL so several worker processes can read while one writes"""
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute(f"PRAGMA busy_timeout={int(SQLITE_BUSY_TIMEOUT * 1000)}")
+        cursor.close()
 
 # Create async session factory
 AsyncSessionLocal = sessionmaker(
@@ -24,10 +52,103 @@ AsyncSessionLocal = sessionmaker(
 )
 
 
+def _upgrade_schema(connection):
+    """
+    Bring tables created by older versions up to date
+    
+    create_all only creates missing tables, so columns and indexes added to
+    existing models later are added here.
+    """
+    inspector = inspect(connection)
+    existing_tables = set(inspector.get_table_names())
+    
+    for table in Base.metadata.sorted_tables:
+        if table.name not in existing_tables:
+            continue
+        
+        existing_columns = {column["name"] for column in inspector.get_columns(table.name)}
+        for column in table.columns:
+            if column.name not in existing_columns:
+                column_type = column.type.compile(dialect=connection.dialect)
+                connection.exec_driver_sql(
+                    f'ALTER TABLE {table.name} ADD COLUMN "{column.name}" {column_type}'
+                )
+        
+        for index in table.indexes:
+            index.create(connection, checkfirst=True)
+
+
+# Full-text search (SQLite FTS5). meetings_fts indexes the meeting text
+# columns and segments_fts the transcript_segments rows; both read the text
+# back from their tables (external content) and triggers keep them in sync
+# with every insert, update and delete. The triggers are plain SQL, so rows
+# can also be written from the sqlite3 shell or other tools. A compressed
+# transcript has no plain transcript_text for meetings_fts to index; its
+# words are found through segments_fts instead (see app.services.search).
+# Segment ids are grouped per meeting (meeting_id * SEGMENT_ROWID_STRIDE +
+# idx) so a meeting's rows form one range.
+SEGMENT_ROWID_STRIDE = 1_000_000
+FTS_COLUMNS = "title, transcript_text, summary, key_points, action_items"
+SEGMENT_FTS_COLUMNS = 'text, meeting_id, start, "end"'
+
+SEARCH_INDEX_DDL = [
+    f"""CREATE VIRTUAL TABLE IF NOT EXISTS meetings_fts USING fts5(
+        {FTS_COLUMNS}, content='meetings', content_rowid='id', tokenize='porter unicode61'
+    )""",
+    f"""CREATE TRIGGER IF NOT EXISTS meetings_fts_insert AFTER INSERT ON meetings BEGIN
+        INSERT INTO meetings_fts(rowid, {FTS_COLUMNS})
+        VALUES (new.id, new.title, new.transcript_text, new.summary, new.key_points, new.action_items);
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS meetings_fts_delete AFTER DELETE ON meetings BEGIN
+        INSERT INTO meetings_fts(meetings_fts, rowid, {FTS_COLUMNS})
+        VALUES ('delete', old.id, old.title, old.transcript_text, old.summary, old.key_points, old.action_items);
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS meetings_fts_update AFTER UPDATE OF {FTS_COLUMNS} ON meetings BEGIN
+        INSERT INTO meetings_fts(meetings_fts, rowid, {FTS_COLUMNS})
+        VALUES ('delete', old.id, old.title, old.transcript_text, old.summary, old.key_points, old.action_items);
+        INSERT INTO meetings_fts(rowid, {FTS_COLUMNS})
+        VALUES (new.id, new.title, new.transcript_text, new.summary, new.key_points, new.action_items);
+    END""",
+    """CREATE VIRTUAL TABLE IF NOT EXISTS segments_fts USING fts5(
+        text, meeting_id UNINDEXED, start UNINDEXED, "end" UNINDEXED,
+        content='transcript_segments', content_rowid='id', tokenize='porter unicode61'
+    )""",
+    f"""CREATE TRIGGER IF NOT EXISTS segments_fts_insert AFTER INSERT ON transcript_segments BEGIN
+        INSERT INTO segments_fts(rowid, {SEGMENT_FTS_COLUMNS})
+        VALUES (new.id, new.text, new.meeting_id, new.start, new."end");
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS segments_fts_delete AFTER DELETE ON transcript_segments BEGIN
+        INSERT INTO segments_fts(segments_fts, rowid, {SEGMENT_FTS_COLUMNS})
+        VALUES ('delete', old.id, old.text, old.meeting_id, old.start, old."end");
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS segments_fts_update AFTER UPDATE ON transcript_segments BEGIN
+        INSERT INTO segments_fts(segments_fts, rowid, {SEGMENT_FTS_COLUMNS})
+        VALUES ('delete', old.id, old.text, old.meeting_id, old.start, old."end");
+        INSERT INTO segments_fts(rowid, {SEGMENT_FTS_COLUMNS})
+        VALUES (new.id, new.text, new.meeting_id, new.start, new."end");
+    END""",
+]
+
+
+def _create_search_index(connection):
+    """Create the FTS5 tables and triggers, indexing existing rows once"""
+    existing_tables = set(inspect(connection).get_table_names())
+    
+    for statement in SEARCH_INDEX_DDL:
+        connection.exec_driver_sql(statement)
+    
+    for table in ("meetings_fts", "segments_fts"):
+        if table not in existing_tables:
+            connection.exec_driver_sql(f"INSERT INTO {table}({table}) VALUES ('rebuild')")
+
+
 async def init_db():
     """Initialize database tables"""
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
+        await conn.run_sync(_upgrade_schema)
+        if IS_SQLITE:
+            await conn.run_sync(_create_search_index)
 
 
 async def get_db():
@@ -0,0 +1,46 @@
+"""Logging through a queue
+
+Handlers attached here only put records on a queue; a listener thread
+formats them and writes them to stderr, so logging from the event loop
+never waits on the terminal or a log pipe.
+"""
+import os
+import queue
+import logging
+from logging.handlers import QueueHandler, QueueListener
+from dotenv import load_dotenv
+
+load_dotenv()
+
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+
+_queue = queue.SimpleQueue()
+_listener = None
+
+
+def _start_listener():
+    global _listener
+    if _listener is None:
+        handler = logging.StreamHandler()
+        handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(name)s: %(message)s"))
+        _listener = QueueListener(_queue, handler, respect_handler_level=True)
+        _listener.start()
+
+
+def queue_logger(name: str, level: str = LOG_LEVEL) -> logging.Logger:
+    """A logger whose records are written by the listener thread"""
+    _start_listener()
+    logger = logging.getLogger(name)
+    if not any(isinstance(h, QueueHandler) and h.queue is _queue for h in logger.handlers):
+        logger.addHandler(QueueHandler(_queue))
+        logger.propagate = False
+    logger.setLevel(level)
+    return logger
+
+
+def stop_logging():
+    """Flush queued records (on shutdown)"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
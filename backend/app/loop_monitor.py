@@ -0,0 +1,129 @@
+"""Event loop lag monitor and blocking-call watchdog
+
+A watchdog thread schedules a no-op on the event loop every
+LOOP_MONITOR_INTERVAL_MS and times how long the loop takes to run it; that
+delay is the loop lag (event_loop_lag_seconds on /metrics). A ping still
+pending after LOOP_BLOCK_THRESHOLD_MS means a callback is running on the
+loop without yielding: the watchdog captures the loop thread's stack right
+then, logs it, and keeps the last LOOP_BLOCK_HISTORY blocks (with how long
+each lasted) for /api/loop. A block still running when the monitor stops
+keeps the time it had lasted so far and is marked unfinished.
+"""
+import os
+import sys
+import time
+import asyncio
+import threading
+import traceback
+from collections import deque
+from datetime import datetime
+from dotenv import load_dotenv
+
+from app.logs import queue_logger
+from app.metrics import EVENT_LOOP_LAG_SECONDS, EVENT_LOOP_BLOCKS, EVENT_LOOP_BLOCK_SECONDS
+
+load_dotenv()
+
+LOOP_MONITOR_ENABLED = os.getenv("LOOP_MONITOR_ENABLED", "true").lower() == "true"
+LOOP_MONITOR_INTERVAL = float(os.getenv("LOOP_MONITOR_INTERVAL_MS", "100")) / 1000
+LOOP_BLOCK_THRESHOLD = float(os.getenv("LOOP_BLOCK_THRESHOLD_MS", "250")) / 1000
+LOOP_BLOCK_HISTORY = 50
+
+logger = queue_logger("app.loop_monitor")
+
+
+class LoopMonitor:
+    """Watchdog thread pinging one event loop"""
+
+    def __init__(self, interval: float, threshold: float):
+        self.interval = interval
+        self.threshold = threshold
+        self.blocks = deque(maxlen=LOOP_BLOCK_HISTORY)
+        self.block_count = 0
+        self.last_lag = None
+        self.max_lag = 0.0
+        self._loop = None
+        self._loop_thread = None
+        self._thread = None
+        self._stop = threading.Event()
+
+    def start(self):
+        """Start watching the running event loop"""
+        if self._thread is not None:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._loop_thread = threading.get_ident()
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="loop-monitor", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.threshold + self.interval)
+            self._thread = None
+
+    def _run(self):
+        while not self._stop.is_set():
+            answered = threading.Event()
+            sent = time.perf_counter()
+            reply = {}
+
+            def pong():
+                reply["at"] = time.perf_counter()
+                answered.set()
+
+            try:
+                self._loop.call_soon_threadsafe(pong)
+            except RuntimeError:
+                return  # loop closed
+
+            if not answered.wait(self.threshold):
+                block = self._capture()
+                while not answered.wait(self.interval):
+                    if self._stop.is_set():
+                        block["duration_seconds"] = time.perf_counter() - sent
+                        logger.warning("Event loop still blocked after %.3fs at shutdown", block["duration_seconds"])
+                        return
+                block["duration_seconds"] = reply["at"] - sent
+                block["finished"] = True
+                EVENT_LOOP_BLOCK_SECONDS.observe(block["duration_seconds"])
+                logger.warning("Event loop was blocked for %.3fs", block["duration_seconds"])
+
+            lag = reply["at"] - sent
+            EVENT_LOOP_LAG_SECONDS.observe(lag)
+            self.last_lag = lag
+            self.max_lag = max(self.max_lag, lag)
+            self._stop.wait(self.interval)
+
+    def _capture(self) -> dict:
+        """Record the loop thread's stack while it is blocked"""
+        frame = sys._current_frames().get(self._loop_thread)
+        stack = "".join(traceback.format_stack(frame)) if frame is not None else ""
+        del frame
+        block = {
+            "detected_at": datetime.utcnow().isoformat(),
+            "duration_seconds": None,  # filled in once the loop responds
+            "finished": False,
+            "stack": stack,
+        }
+        self.blocks.append(block)
+        self.block_count += 1
+        EVENT_LOOP_BLOCKS.inc()
+        logger.warning("Event loop blocked for over %.0fms in:\n%s", self.threshold * 1000, stack)
+        return block
+
+    def stats(self) -> dict:
+        """Current and worst lag, and recent blocks with their stacks (newest first)"""
+        return {
+            "running": self._thread is not None,
+            "interval_ms": self.interval * 1000,
+            "threshold_ms": self.threshold * 1000,
+            "last_lag_seconds": self.last_lag,
+            "max_lag_seconds": self.max_lag,
+            "blocks": self.block_count,
+            "recent_blocks": list(reversed(self.blocks)),
+        }
+
+
+loop_monitor = LoopMonitor(LOOP_MONITOR_INTERVAL, LOOP_BLOCK_THRESHOLD)
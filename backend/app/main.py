@@ -1,16 +1,58 @@
 """FastAPI main application"""
 import os
-from fastapi import FastAPI, File, UploadFile, Depends, HTTPException, Form
+import json
+import time
+import asyncio
+import aiofiles.os
+from fastapi import FastAPI, File, UploadFile, Depends, HTTPException, Form, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse, JSONResponse, Response, PlainTextResponse
+from typing import Optional
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 from dotenv import load_dotenv
 
-from app.database import init_db, get_db
-from app.models import Meeting, MeetingCreate, MeetingResponse, TranscriptionResponse, SummaryResponse
-from app.services.storage import save_audio_file, validate_audio_file
-from app.services.transcription import transcribe_audio, save_transcript
-from app.services.nlp import clean_transcript, generate_summary
+from app.database import init_db, get_db, AsyncSessionLocal
+from app.models import (
+    Meeting, MeetingCreate, MeetingResponse, SummaryResponse, JobResponse,
+    UploadSessionCreate, UploadSessionResponse, SearchResult, MeetingPage, SegmentPage, OutlineResponse,
+    BatchTranscribeRequest, BatchSummarizeRequest
+)
+from app.services.storage import save_audio_stream, iter_upload_file, validate_audio_file, FileTooLargeError
+from app.services.uploads import (
+    create_session, load_session, session_status, write_chunk, finalize_session, abort_session,
+    UploadSessionNotFound, UploadSessionError
+)
+from app.services.nlp import SUMMARIZER, SUMMARIZERS
+from app.services.summary_cache import summary_cache
+from app.services.sections import summarize_meeting_text, get_sections, shutdown_process_pool
+from app.services.lexicons import LexiconError
+from app.services.phrase_matcher import get_matcher, rank_phrases
+from app.services.transcription import stream_transcription, resolve_model_name, model_registry, transcript_cache
+from app.services.meetings import (
+    get_meeting as load_meeting, store_transcription, delete_meeting as remove_meeting,
+    list_meetings, InvalidCursor
+)
+from app.services.corpus import corpus_index, backfill_corpus
+from app.services.search import search_meetings, SearchUnavailable
+from app.services.segments import get_segment_range, get_segment_window, count_segments
+from app.services.audio import decoded_cache_usage
+from app.services.probe import probe_audio, AudioProbeError
+from app.services.pipeline import pipeline, PipelineItem, PipelineFull
+from app.services.batch import (
+    BATCH_MAX_ITEMS, BATCH_COMMIT_SIZE, BatchTooLarge, check_batch_size, run_bounded, summarize_results,
+    enqueue_transcriptions, summarize_meetings, STATUS_OK, STATUS_ERROR
+)
+from app.services.jobs import enqueue_job, get_job, serialize_job, find_active_job, count_queued, JOB_HANDLERS
+from app.worker import start_workers
+from app.profiling import (
+    ProfiledRoute, ProfileNotFound, PROFILING_ENABLED, token_valid, list_profiles, profile_path
+)
+from app.metrics import (
+    InstrumentedThreadPool, JOBS_QUEUED, stage_timer, render_metrics, mark_process_dead
+)
+from app.loop_monitor import LOOP_MONITOR_ENABLED, loop_monitor
+from app.logs import stop_logging
 
 load_dotenv()
 
@@ -19,6 +61,8 @@ app = FastAPI(
     description="Convert meeting audio to transcripts and summaries",
     version="1.0.0"
 )
+# Profiles handlers on request when PROFILING_ENABLED (see app/profiling.py)
+app.router.route_class = ProfiledRoute
 
 # CORS middleware
 app.add_middleware(
@@ -31,16 +75,69 @@ app.add_middleware(
 
 # Configuration
 AUDIO_UPLOAD_DIR = os.getenv("AUDIO_UPLOAD_DIR", "../data/audio")
-TRANSCRIPT_DIR = os.getenv("TRANSCRIPT_DIR", "../data/transcripts")
 MAX_FILE_SIZE_MB = int(os.getenv("MAX_FILE_SIZE_MB", "25"))
+UPLOAD_CHUNK_SIZE = int(os.getenv("UPLOAD_CHUNK_SIZE_KB", "1024")) * 1024
+# Allowance for multipart boundaries and form fields when checking Content-Length
+MULTIPART_OVERHEAD_BYTES = 64 * 1024
 ALLOWED_FORMATS = os.getenv("ALLOWED_AUDIO_FORMATS", "mp3,wav,m4a,mp4").split(",")
+JOB_WORKERS = int(os.getenv("JOB_WORKERS", "1"))  # 0 = only enqueue, run app.worker separately
+
+_worker_stop = asyncio.Event()
+_worker_tasks = []
+
+
+@app.middleware("http")
+async def reject_oversized_uploads(request: Request, call_next):
+    """Reject uploads by Content-Length before the body is received"""
+    if request.method == "POST" and request.url.path in ("/api/upload", "/api/batch/upload"):
+        content_length = request.headers.get("content-length")
+        max_bytes = MAX_FILE_SIZE_MB * 1024 * 1024 + MULTIPART_OVERHEAD_BYTES
+        if request.url.path == "/api/batch/upload":
+            max_bytes *= BATCH_MAX_ITEMS
+        if content_length and content_length.isdigit() and int(content_length) > max_bytes:
+            return JSONResponse(
+                status_code=400,
+                content={"detail": f"File too large. Max size: {MAX_FILE_SIZE_MB}MB"}
+            )
+    return await call_next(request)
 
 
 @app.on_event("startup")
 async def startup_event():
-    """Initialize database on startup"""
+    """Initialize database and start in-process job workers on startup"""
+    # Same size as asyncio's default executor, but reporting its load
+    asyncio.get_running_loop().set_default_executor(InstrumentedThreadPool("default"))
+    
+    # Watches the loop for lag and for calls that block it
+    if LOOP_MONITOR_ENABLED:
+        loop_monitor.start()
+    
     await init_db()
     print("✅ Database initialized")
+    
+    indexed = await backfill_corpus()
+    if indexed:
+        print(f"✅ Added {indexed} existing transcript(s) to the corpus index")
+    
+    if JOB_WORKERS > 0:
+        _worker_tasks.extend(start_workers(JOB_WORKERS, _worker_stop))
+        print(f"✅ Started {JOB_WORKERS} job worker(s)")
+    
+    pipeline.start()
+
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Stop in-process job workers, the processing pipeline and summarizer processes"""
+    _worker_stop.set()
+    for task in _worker_tasks:
+        task.cancel()
+    await asyncio.gather(*_worker_tasks, return_exceptions=True)
+    await pipeline.stop()
+    shutdown_process_pool()
+    loop_monitor.stop()
+    stop_logging()
+    mark_process_dead()
 
 
 @app.get("/")
@@ -49,10 +146,176 @@ async def root():
     return {
         "message": "Smart Meeting Notes Generator API",
         "version": "1.0.0",
-        "endpoints": ["/api/upload", "/api/transcribe/{meeting_id}", "/api/summarize/{meeting_id}", "/api/meetings"]
+        "endpoints": ["/api/upload", "/api/process", "/api/process/{process_id}", "/api/pipeline", "/api/uploads", "/api/batch/upload", "/api/batch/transcribe", "/api/batch/summarize", "/api/transcribe/{meeting_id}", "/api/transcribe/{meeting_id}/stream", "/api/jobs/{job_id}", "/api/summarize/{meeting_id}", "/api/meetings", "/api/meetings/{meeting_id}/phrases", "/api/meetings/{meeting_id}/segments", "/api/meetings/{meeting_id}/segments/window", "/api/meetings/{meeting_id}/outline", "/api/search", "/api/models", "/api/cache/transcriptions", "/api/cache/audio", "/api/cache/summaries", "/api/corpus", "/api/admin/profiles", "/api/loop", "/metrics"]
+    }
+
+
+def _validate_model(model: Optional[str]) -> str:
+    """Resolve a requested Whisper model or reject it with 400"""
+    try:
+        return resolve_model_name(model)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@app.get("/api/models")
+async def get_models():
+    """
+    Whisper models: enabled sizes, resident models, cold-start times and memory
+    """
+    return model_registry.stats()
+
+
+@app.get("/metrics")
+async def metrics(db: AsyncSession = Depends(get_db)):
+    """
+    Prometheus metrics: stage timings, realtime factor, queues, executors, model loads, query latency
+    """
+    queued = await count_queued(db)
+    for kind in JOB_HANDLERS:
+        JOBS_QUEUED.labels(kind).set(queued.get(kind, 0))
+    content, content_type = render_metrics()
+    return Response(content=content, media_type=content_type)
+
+
+@app.get("/api/loop")
+async def event_loop_stats():
+    """
+    Event loop lag and recent blocking calls, with the stack each was caught in
+    """
+    return loop_monitor.stats()
+
+
+def _require_profiling(request: Request):
+    """404 unless profiling is enabled; 403 without the profiling token"""
+    if not PROFILING_ENABLED:
+        raise HTTPException(status_code=404, detail="Profiling is disabled")
+    if not token_valid(request):
+        raise HTTPException(status_code=403, detail="Invalid profiling token")
+
+
+@app.get("/api/admin/profiles")
+async def get_profiles(request: Request):
+    """
+    Stored request profiles, newest first
+    """
+    _require_profiling(request)
+    return await asyncio.get_event_loop().run_in_executor(None, list_profiles)
+
+
+@app.get("/api/admin/profiles/{profile_id}")
+async def download_profile(profile_id: str, request: Request):
+    """
+    Collapsed stacks of a profiled request (input for flamegraph.pl or speedscope)
+    """
+    _require_profiling(request)
+    try:
+        path = profile_path(profile_id)
+    except ProfileNotFound as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    
+    content = await asyncio.get_event_loop().run_in_executor(None, path.read_text)
+    return PlainTextResponse(
+        content,
+        headers={"Content-Disposition": f'attachment; filename="{profile_id}.folded"'}
+    )
+
+
+@app.get("/api/cache/transcriptions")
+async def get_transcription_cache_stats():
+    """
+    Transcription cache size and hit/miss counters
+    """
+    return await asyncio.get_event_loop().run_in_executor(None, transcript_cache.stats)
+
+
+@app.get("/api/cache/audio")
+async def get_decoded_audio_stats():
+    """
+    Disk used by decoded (16 kHz PCM) audio caches
+    """
+    return await asyncio.get_event_loop().run_in_executor(None, decoded_cache_usage, AUDIO_UPLOAD_DIR)
+
+
+@app.get("/api/cache/summaries")
+async def get_summary_cache_stats(db: AsyncSession = Depends(get_db)):
+    """
+    Summary cache hit rate and summarizer time saved
+    """
+    return await summary_cache.stats(db)
+
+
+@app.get("/api/corpus")
+async def corpus_stats(db: AsyncSession = Depends(get_db)):
+    """
+    Size of the corpus-wide document frequency index used for IDF weighting
+    """
+    await corpus_index.refresh(db)
+    return corpus_index.stats()
+
+
+async def _probe_saved_audio(file_path: str, filename: str) -> dict:
+    """Read audio metadata from a saved upload; delete it and raise 400 if it is not valid audio"""
+    extension = os.path.splitext(filename)[1]
+    try:
+        with stage_timer("upload", "probe"):
+            return await asyncio.get_event_loop().run_in_executor(None, probe_audio, file_path, extension)
+    except AudioProbeError as e:
+        await aiofiles.os.remove(file_path)
+        raise HTTPException(status_code=400, detail=f"Invalid audio file: {e}")
+
+
+def _audio_metadata(probe: dict) -> dict:
+    """Meeting fields taken from a probe result"""
+    return {
+        "duration": probe["duration"],
+        "audio_format": probe["format"],
+        "codec": probe["codec"],
+        "sample_rate": probe["sample_rate"],
+        "channels": probe["channels"],
     }
 
 
+async def _create_meeting_from_upload(file: UploadFile, title: str, db: AsyncSession) -> Meeting:
+    """Validate, save and probe an uploaded file, then create its meeting"""
+    # Validate file format
+    if not validate_audio_file(file.filename, ALLOWED_FORMATS):
+        raise HTTPException(
+            status_code=400,
+            detail=f"Invalid file format. Allowed: {', '.join(ALLOWED_FORMATS)}"
+        )
+    
+    # Stream file to disk, enforcing the size limit as it arrives
+    try:
+        saved = await save_audio_stream(
+            iter_upload_file(file, UPLOAD_CHUNK_SIZE),
+            file.filename,
+            AUDIO_UPLOAD_DIR,
+            MAX_FILE_SIZE_MB * 1024 * 1024
+        )
+    except FileTooLargeError:
+        raise HTTPException(
+            status_code=400,
+            detail=f"File too large. Max size: {MAX_FILE_SIZE_MB}MB"
+        )
+    
+    # Check the headers before accepting the file
+    probe = await _probe_saved_audio(saved["path"], file.filename)
+    
+    # Create meeting record
+    meeting = Meeting(
+        title=title,
+        audio_path=saved["path"],
+        audio_hash=saved["sha256"],
+        **_audio_metadata(probe)
+    )
+    
+    db.add(meeting)
+    await db.commit()
+    
+    return meeting
+
+
 @app.post("/api/upload", response_model=MeetingResponse)
 async def upload_audio(
     file: UploadFile = File(...),
@@ -62,48 +325,303 @@ async def upload_audio(
     """
     Upload audio file and create meeting record
     """
-    # Validate file format
-    if not validate_audio_file(file.filename, ALLOWED_FORMATS):
+    return await _create_meeting_from_upload(file, title, db)
+
+
+@app.post("/api/process", status_code=202)
+async def process_audio(
+    file: UploadFile = File(...),
+    title: str = Form(...),
+    model: Optional[str] = Form(None),
+    method: Optional[str] = Form(None),
+    lexicon: Optional[str] = Form(None),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Upload, transcribe and summarize in one request
+    
+    The meeting is created, then decoded, transcribed and summarized by the
+    in-process pipeline. Poll /api/process/{process_id} for the state and
+    per-stage timings. Returns 503 if the pipeline is backed up.
+    """
+    model_name = _validate_model(model)
+    method = method or SUMMARIZER
+    if method not in SUMMARIZERS:
         raise HTTPException(
             status_code=400,
-            detail=f"Invalid file format. Allowed: {', '.join(ALLOWED_FORMATS)}"
+            detail=f"Unknown summarizer '{method}'. Available: {', '.join(SUMMARIZERS)}"
+        )
+    
+    started = time.perf_counter()
+    meeting = await _create_meeting_from_upload(file, title, db)
+    upload_seconds = time.perf_counter() - started
+    
+    item = PipelineItem(meeting.id, meeting.audio_path, meeting.audio_hash, model_name, method, lexicon)
+    item.timings["upload"] = {"wait": 0.0, "run": upload_seconds}
+    try:
+        await pipeline.submit(item)
+    except PipelineFull as e:
+        raise HTTPException(status_code=503, detail=f"{e} (meeting {meeting.id} was created)")
+    
+    return item.to_dict()
+
+
+@app.get("/api/process/{process_id}")
+async def get_process_status(process_id: str, wait: float = 0):
+    """
+    State and per-stage timings of a pipeline item
+    
+    Pass ?wait=N to wait up to N seconds (max 60) for it to finish.
+    """
+    item = pipeline.get(process_id)
+    
+    if not item:
+        raise HTTPException(status_code=404, detail="Process not found")
+    
+    if wait > 0:
+        try:
+            await asyncio.wait_for(item.done.wait(), min(wait, 60))
+        except asyncio.TimeoutError:
+            pass
+    
+    return item.to_dict()
+
+
+@app.get("/api/pipeline")
+async def get_pipeline_stats():
+    """
+    Pipeline queue depths, workers and mean wait/run time per stage
+    """
+    return pipeline.stats()
+
+
+@app.post("/api/batch/upload")
+async def batch_upload_audio(
+    files: list[UploadFile] = File(...),
+    titles: Optional[list[str]] = Form(None),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Upload many audio files, creating one meeting each
+    
+    titles are matched to files by position (default: the file name).
+    Files are saved and checked concurrently; every item reports its own
+    status and, when stored, its meeting_id.
+    """
+    try:
+        check_batch_size(len(files))
+    except BatchTooLarge as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if titles and len(titles) != len(files):
+        raise HTTPException(status_code=400, detail="Give one title per file")
+    
+    items = [{"index": i, "filename": file.filename, "status": STATUS_ERROR} for i, file in enumerate(files)]
+    valid = []
+    for i, file in enumerate(files):
+        if validate_audio_file(file.filename, ALLOWED_FORMATS):
+            valid.append(i)
+        else:
+            items[i]["detail"] = f"Invalid file format. Allowed: {', '.join(ALLOWED_FORMATS)}"
+    
+    async def store(index: int):
+        file = files[index]
+        saved = await save_audio_stream(
+            iter_upload_file(file, UPLOAD_CHUNK_SIZE),
+            file.filename,
+            AUDIO_UPLOAD_DIR,
+            MAX_FILE_SIZE_MB * 1024 * 1024
         )
+        return saved, await _probe_saved_audio(saved["path"], file.filename)
     
-    # Read and save file
-    file_content = await file.read()
+    meetings = {}
+    async for index, stored, error in run_bounded(valid, store):
+        if isinstance(error, FileTooLargeError):
+            items[index]["detail"] = f"File too large. Max size: {MAX_FILE_SIZE_MB}MB"
+        elif isinstance(error, HTTPException):
+            items[index]["detail"] = error.detail
+        elif error is not None:
+            items[index]["detail"] = str(error)
+        else:
+            saved, probe = stored
+            meeting = Meeting(
+                title=titles[index] if titles else os.path.splitext(files[index].filename)[0],
+                audio_path=saved["path"],
+                audio_hash=saved["sha256"],
+                **_audio_metadata(probe)
+            )
+            db.add(meeting)
+            meetings[index] = meeting
+            
+            if len(meetings) % BATCH_COMMIT_SIZE == 0:
+                await db.commit()
+    
+    await db.commit()
+    for index, meeting in meetings.items():
+        items[index].update(status=STATUS_OK, meeting_id=meeting.id, duration=meeting.duration)
+    
+    return summarize_results(items)
+
+
+@app.post("/api/batch/transcribe")
+async def batch_transcribe_meetings(
+    request: BatchTranscribeRequest,
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Queue transcription of many meetings
+    
+    Each item reports 'queued' with its job_id, 'not_found' or 'error'.
+    """
+    model_name = _validate_model(request.model)
+    try:
+        return await enqueue_transcriptions(db, request.meeting_ids, model_name)
+    except BatchTooLarge as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@app.post("/api/batch/summarize")
+async def batch_summarize_meetings(
+    request: BatchSummarizeRequest,
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Summarize many meetings
     
-    # Check file size
-    file_size_mb = len(file_content) / (1024 * 1024)
-    if file_size_mb > MAX_FILE_SIZE_MB:
+    Summaries run a few at a time and are committed in groups; each item
+    reports 'ok' with its summary, 'not_found' or 'error'.
+    """
+    method = request.method or SUMMARIZER
+    if method not in SUMMARIZERS:
         raise HTTPException(
             status_code=400,
-            detail=f"File too large. Max size: {MAX_FILE_SIZE_MB}MB"
+            detail=f"Unknown summarizer '{method}'. Available: {', '.join(SUMMARIZERS)}"
+        )
+    try:
+        return await summarize_meetings(db, request.meeting_ids, method, request.lexicon)
+    except (BatchTooLarge, LexiconError) as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@app.post("/api/uploads", response_model=UploadSessionResponse)
+async def create_upload_session(request: UploadSessionCreate):
+    """
+    Start a resumable upload for a large recording
+
+    Send chunks with PUT /api/uploads/{upload_id}/chunks/{index} (any order,
+    in parallel), check GET /api/uploads/{upload_id} for missing chunks, then
+    POST /api/uploads/{upload_id}/complete.
+    """
+    if not validate_audio_file(request.filename, ALLOWED_FORMATS):
+        raise HTTPException(
+            status_code=400,
+            detail=f"Invalid file format. Allowed: {', '.join(ALLOWED_FORMATS)}"
+        )
+    
+    try:
+        session = await asyncio.get_event_loop().run_in_executor(
+            None, create_session, request.filename, request.title, request.total_size, request.chunk_size
+        )
+    except UploadSessionError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    return await asyncio.get_event_loop().run_in_executor(None, session_status, session)
+
+
+async def _get_upload_session(upload_id: str) -> dict:
+    """Load an upload session or raise 404"""
+    try:
+        return await asyncio.get_event_loop().run_in_executor(None, load_session, upload_id)
+    except UploadSessionNotFound:
+        raise HTTPException(status_code=404, detail="Upload session not found")
+
+
+@app.put("/api/uploads/{upload_id}/chunks/{index}")
+async def upload_chunk(upload_id: str, index: int, request: Request):
+    """
+    Upload one chunk (raw request body); re-sending a chunk replaces it
+    """
+    session = await _get_upload_session(upload_id)
+    
+    try:
+        written = await write_chunk(session, index, request.stream())
+    except UploadSessionError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    return {"upload_id": upload_id, "index": index, "size": written}
+
+
+@app.get("/api/uploads/{upload_id}", response_model=UploadSessionResponse)
+async def get_upload_session(upload_id: str):
+    """
+    Get upload progress, including which chunks are still missing
+    """
+    session = await _get_upload_session(upload_id)
+    return await asyncio.get_event_loop().run_in_executor(None, session_status, session)
+
+
+@app.post("/api/uploads/{upload_id}/complete", response_model=MeetingResponse)
+async def complete_upload_session(
+    upload_id: str,
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Assemble a finished upload and create the meeting record
+    """
+    session = await _get_upload_session(upload_id)
+    
+    try:
+        saved = await asyncio.get_event_loop().run_in_executor(
+            None, finalize_session, session, AUDIO_UPLOAD_DIR
         )
+    except UploadSessionNotFound:
+        raise HTTPException(status_code=404, detail="Upload session not found")
+    except UploadSessionError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     
-    # Save audio file
-    audio_path = await save_audio_file(file_content, file.filename, AUDIO_UPLOAD_DIR)
+    # Check the headers before accepting the file
+    probe = await _probe_saved_audio(saved["path"], session["filename"])
     
     # Create meeting record
     meeting = Meeting(
-        title=title,
-        audio_path=audio_path
+        title=session["title"],
+        audio_path=saved["path"],
+        audio_hash=saved["sha256"],
+        **_audio_metadata(probe)
     )
     
     db.add(meeting)
     await db.commit()
-    await db.refresh(meeting)
     
     return meeting
 
 
-@app.post("/api/transcribe/{meeting_id}", response_model=TranscriptionResponse)
+@app.delete("/api/uploads/{upload_id}")
+async def delete_upload_session(upload_id: str):
+    """
+    Abort an upload and discard received chunks
+    """
+    try:
+        await asyncio.get_event_loop().run_in_executor(None, abort_session, upload_id)
+    except UploadSessionNotFound:
+        raise HTTPException(status_code=404, detail="Upload session not found")
+    
+    return {"message": "Upload aborted"}
+
+
+@app.post("/api/transcribe/{meeting_id}", response_model=JobResponse, status_code=202)
 async def transcribe_meeting(
     meeting_id: int,
+    model: Optional[str] = None,
     db: AsyncSession = Depends(get_db)
 ):
     """
-    Transcribe audio for a meeting
+    Start transcription for a meeting
+
+    Returns immediately with a job; poll /api/jobs/{job_id} for progress.
+    Pass ?model=tiny|base|small to override the default Whisper model.
     """
+    model_name = _validate_model(model)
+    
     # Get meeting
     result = await db.execute(select(Meeting).where(Meeting.id == meeting_id))
     meeting = result.scalar_one_or_none()
@@ -114,79 +632,185 @@ async def transcribe_meeting(
     if not meeting.audio_path or not os.path.exists(meeting.audio_path):
         raise HTTPException(status_code=404, detail="Audio file not found")
     
-    # Transcribe audio
-    transcript_data = await transcribe_audio(meeting.audio_path)
+    job = await enqueue_job(db, "transcribe", meeting_id, payload={"model": model_name})
     
-    # Clean transcript
-    cleaned_transcript = clean_transcript(transcript_data["text"])
+    return JobResponse(**serialize_job(job))
+
+
+@app.get("/api/transcribe/{meeting_id}/stream")
+async def stream_transcribe_meeting(
+    meeting_id: int,
+    model: Optional[str] = None,
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Transcribe audio for a meeting, streaming segments as Server-Sent Events
+
+    Events: 'start' (duration), 'segment' (start, end, text) per decoded
+    segment, then 'done' once the transcript is stored, or 'error'.
+    """
+    model_name = _validate_model(model)
     
-    # Save transcript
-    transcript_path = await save_transcript(cleaned_transcript, meeting_id, TRANSCRIPT_DIR)
+    # Get meeting
+    result = await db.execute(select(Meeting).where(Meeting.id == meeting_id))
+    meeting = result.scalar_one_or_none()
     
-    # Update meeting record
-    meeting.transcript_text = cleaned_transcript
-    meeting.transcript_path = transcript_path
-    meeting.duration = transcript_data.get("duration")
+    if not meeting:
+        raise HTTPException(status_code=404, detail="Meeting not found")
     
-    await db.commit()
+    if not meeting.audio_path or not os.path.exists(meeting.audio_path):
+        raise HTTPException(status_code=404, detail="Audio file not found")
     
-    return TranscriptionResponse(
-        meeting_id=meeting_id,
-        transcript=cleaned_transcript,
-        duration=transcript_data.get("duration")
+    if await find_active_job(db, "transcribe", meeting_id):
+        raise HTTPException(status_code=409, detail="Meeting is already being transcribed")
+    
+    audio_path = meeting.audio_path
+    audio_hash = meeting.audio_hash
+    
+    def sse(event: str, data: dict) -> str:
+        return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+    
+    async def events():
+        transcript_data = None
+        try:
+            async for item in stream_transcription(audio_path, model_name, audio_hash):
+                event = item.pop("event")
+                if event == "transcript":
+                    transcript_data = item
+                    continue
+                yield sse(event, item)
+            
+            # Persist the final transcript (with the detected language) like the job path does
+            async with AsyncSessionLocal() as session:
+                stored_meeting = await load_meeting(session, meeting_id)
+                if not stored_meeting:
+                    raise Exception("Meeting not found")
+                transcript = await store_transcription(session, stored_meeting, transcript_data)
+            
+            yield sse("done", {"meeting_id": meeting_id, "transcript": transcript, "duration": transcript_data["duration"]})
+        except Exception as e:
+            yield sse("error", {"detail": str(e)})
+    
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
     )
 
 
+@app.get("/api/jobs/{job_id}", response_model=JobResponse)
+async def get_job_status(
+    job_id: str,
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Get state, progress and timings of a background job
+    """
+    job = await get_job(db, job_id)
+    
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    
+    return JobResponse(**serialize_job(job))
+
+
 @app.post("/api/summarize/{meeting_id}", response_model=SummaryResponse)
 async def summarize_meeting(
     meeting_id: int,
+    method: Optional[str] = None,
+    lexicon: Optional[str] = None,
     db: AsyncSession = Depends(get_db)
 ):
     """
     Generate summary for a meeting
+    
+    method selects the summarizer: tfidf, textrank or heuristic (default: SUMMARIZER setting).
+    lexicon selects a team lexicon profile for key points and action items.
     """
+    method = method or SUMMARIZER
+    if method not in SUMMARIZERS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown summarizer '{method}'. Available: {', '.join(SUMMARIZERS)}"
+        )
+    
     # Get meeting
-    result = await db.execute(select(Meeting).where(Meeting.id == meeting_id))
-    meeting = result.scalar_one_or_none()
+    with stage_timer("summarize", "load"):
+        meeting = await load_meeting(db, meeting_id, with_transcript=True)
     
     if not meeting:
         raise HTTPException(status_code=404, detail="Meeting not found")
     
-    if not meeting.transcript_text:
+    transcript = meeting.transcript_text
+    if not transcript:
         raise HTTPException(status_code=400, detail="Meeting must be transcribed first")
     
     # Generate summary
-    summary_data = await generate_summary(meeting.transcript_text)
+    try:
+        await corpus_index.refresh(db)
+        with stage_timer("summarize", "summarize"):
+            summary_data, cached, sections = await summarize_meeting_text(
+                db, meeting, method, lexicon, corpus_index
+            )
+    except LexiconError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     
     # Update meeting record
     meeting.summary = summary_data["summary"]
     meeting.key_points = "\n".join(summary_data["key_points"])
     meeting.action_items = "\n".join(summary_data["action_items"])
     
-    await db.commit()
+    with stage_timer("summarize", "commit"):
+        await db.commit()
     
     return SummaryResponse(
         meeting_id=meeting_id,
         summary=summary_data["summary"],
         key_points=summary_data["key_points"],
-        action_items=summary_data["action_items"]
+        action_items=summary_data["action_items"],
+        method=method,
+        cached=cached,
+        sections=sections
     )
 
 
-@app.get("/api/meetings", response_model=list[MeetingResponse])
+@app.get("/api/meetings", response_model=MeetingPage)
 async def get_meetings(
-    skip: int = 0,
-    limit: int = 10,
+    limit: int = 20,
+    cursor: Optional[str] = None,
     db: AsyncSession = Depends(get_db)
 ):
     """
-    Get all meetings
+    List meetings, newest first
+    
+    Returns list fields only; use /api/meetings/{meeting_id} for transcript
+    and summary. Pass next_cursor back as cursor to get the following page.
     """
-    result = await db.execute(
-        select(Meeting).offset(skip).limit(limit).order_by(Meeting.created_at.desc())
-    )
-    meetings = result.scalars().all()
-    return meetings
+    limit = max(1, min(limit, 100))
+    try:
+        return await list_meetings(db, limit, cursor)
+    except InvalidCursor:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+@app.get("/api/search", response_model=list[SearchResult])
+async def search(
+    q: str,
+    limit: int = 20,
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Search titles, transcripts, summaries, key points and action items
+    
+    Results are ranked by BM25 (title and summary matches weigh more) and
+    include a highlighted snippet plus the best matching transcript segments
+    with their timestamps.
+    """
+    limit = max(1, min(limit, 100))
+    try:
+        return await search_meetings(db, q, limit)
+    except SearchUnavailable as e:
+        raise HTTPException(status_code=501, detail=str(e))
 
 
 @app.get("/api/meetings/{meeting_id}", response_model=MeetingResponse)
@@ -197,8 +821,7 @@ async def get_meeting(
     """
     Get a specific meeting
     """
-    result = await db.execute(select(Meeting).where(Meeting.id == meeting_id))
-    meeting = result.scalar_one_or_none()
+    meeting = await load_meeting(db, meeting_id, with_transcript=True)
     
     if not meeting:
         raise HTTPException(status_code=404, detail="Meeting not found")
@@ -206,6 +829,117 @@ async def get_meeting(
     return meeting
 
 
+async def _require_meeting_id(db: AsyncSession, meeting_id: int):
+    """404 unless the meeting exists (without loading its text)"""
+    if await db.scalar(select(Meeting.id).where(Meeting.id == meeting_id)) is None:
+        raise HTTPException(status_code=404, detail="Meeting not found")
+
+
+@app.get("/api/meetings/{meeting_id}/segments", response_model=SegmentPage)
+async def get_meeting_segments(
+    meeting_id: int,
+    offset: int = 0,
+    limit: int = 100,
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    A range of transcript segments, in order
+    
+    Page through a long transcript with offset and limit; total is the
+    number of stored segments.
+    """
+    await _require_meeting_id(db, meeting_id)
+    limit = max(1, min(limit, 1000))
+    
+    segments = await get_segment_range(db, meeting_id, offset, limit)
+    return {"meeting_id": meeting_id, "total": await count_segments(db, meeting_id), "segments": segments}
+
+
+@app.get("/api/meetings/{meeting_id}/segments/window", response_model=SegmentPage)
+async def get_meeting_segment_window(
+    meeting_id: int,
+    start: float = 0.0,
+    end: Optional[float] = None,
+    limit: int = 500,
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Transcript segments overlapping a time window (seconds)
+    """
+    if end is not None and end <= start:
+        raise HTTPException(status_code=400, detail="end must be after start")
+    await _require_meeting_id(db, meeting_id)
+    limit = max(1, min(limit, 1000))
+    
+    segments = await get_segment_window(db, meeting_id, start, end, limit)
+    return {"meeting_id": meeting_id, "total": await count_segments(db, meeting_id), "segments": segments}
+
+
+@app.get("/api/meetings/{meeting_id}/outline", response_model=OutlineResponse)
+async def get_meeting_outline(
+    meeting_id: int,
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Per-section summaries of a long meeting, from its last summarization
+    
+    Empty for meetings short enough to be summarized in one pass.
+    """
+    await _require_meeting_id(db, meeting_id)
+    
+    sections = await get_sections(db, meeting_id)
+    return {
+        "meeting_id": meeting_id,
+        "method": sections[0].method if sections else None,
+        "sections": [
+            {
+                "idx": section.idx,
+                "start": section.start,
+                "end": section.end,
+                "summary": section.summary,
+                "key_points": section.key_points.split("\n") if section.key_points else [],
+                "action_items": section.action_items.split("\n") if section.action_items else [],
+            }
+            for section in sections
+        ]
+    }
+
+
+@app.get("/api/meetings/{meeting_id}/phrases")
+async def get_meeting_phrases(
+    meeting_id: int,
+    lexicon: Optional[str] = None,
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Key-point and action-item phrases found in the transcript
+    
+    Each phrase is listed with its weight, number of hits, score
+    (weight x hits) and character positions, strongest first.
+    """
+    meeting = await load_meeting(db, meeting_id, with_transcript=True)
+    
+    if not meeting:
+        raise HTTPException(status_code=404, detail="Meeting not found")
+    
+    transcript = meeting.transcript_text
+    if not transcript:
+        raise HTTPException(status_code=400, detail="Meeting must be transcribed first")
+    
+    def find_phrases():
+        return {
+            kind: rank_phrases(get_matcher(kind, meeting.language, lexicon).find(transcript))
+            for kind in ("key_points", "action_items")
+        }
+    
+    try:
+        phrases = await asyncio.get_event_loop().run_in_executor(None, find_phrases)
+    except LexiconError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    return {"meeting_id": meeting_id, "language": meeting.language, **phrases}
+
+
 @app.delete("/api/meetings/{meeting_id}")
 async def delete_meeting(
     meeting_id: int,
@@ -220,7 +954,6 @@ async def delete_meeting(
     if not meeting:
         raise HTTPException(status_code=404, detail="Meeting not found")
     
-    await db.delete(meeting)
-    await db.commit()
+    await remove_meeting(db, meeting)
     
     return {"message": "Meeting deleted successfully"}
@@ -0,0 +1,163 @@
+"""Prometheus metrics, served at /metrics
+
+Covers stage timings for transcription, storage and summarization, the
+transcription realtime factor (audio seconds per wall-clock second), queue
+depths and waits, executor load, Whisper model load times, database
+query latency and event loop lag. Updating a metric is a lock and an
+addition, so they stay on in production.
+
+With several uvicorn workers or standalone job workers, point
+PROMETHEUS_MULTIPROC_DIR at an empty directory shared by all of them
+(cleared before the server starts): every process writes its samples
+there and whichever worker answers the scrape merges them.
+"""
+import os
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, ProcessPoolExecutor
+from dotenv import load_dotenv
+
+# prometheus_client picks its storage when imported, so the directory
+# must be in the environment first
+load_dotenv()
+
+from prometheus_client import (  # noqa: E402
+    CollectorRegistry, Counter, Gauge, Histogram, REGISTRY, CONTENT_TYPE_LATEST, generate_latest, multiprocess
+)
+from sqlalchemy import event  # noqa: E402
+
+PROMETHEUS_MULTIPROC_DIR = os.getenv("PROMETHEUS_MULTIPROC_DIR")
+
+STAGE_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600, 1800)
+QUERY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5)
+
+STAGE_SECONDS = Histogram(
+    "meeting_stage_seconds", "Time spent in each processing stage",
+    ["operation", "stage"], buckets=STAGE_BUCKETS
+)
+REALTIME_FACTOR = Histogram(
+    "transcription_realtime_factor", "Audio seconds transcribed per wall-clock second",
+    ["model", "mode"], buckets=(0.25, 0.5, 1, 2, 4, 8, 16, 32, 64, 128)
+)
+AUDIO_SECONDS = Counter("transcribed_audio_seconds", "Seconds of audio transcribed", ["model"])
+QUEUE_DEPTH = Gauge("queue_depth", "Items waiting in an in-process queue", ["queue"], multiprocess_mode="livesum")
+QUEUE_WAIT_SECONDS = Histogram(
+    "queue_wait_seconds", "Time items wait before work on them starts",
+    ["queue"], buckets=STAGE_BUCKETS
+)
+JOBS_QUEUED = Gauge(
+    "jobs_queued", "Jobs waiting in the database queue (counted at scrape time)",
+    ["kind"], multiprocess_mode="mostrecent"
+)
+EXECUTOR_TASKS = Gauge("executor_tasks", "Tasks submitted and not finished", ["executor"], multiprocess_mode="livesum")
+EXECUTOR_WORKERS = Gauge("executor_workers", "Worker threads or processes", ["executor"], multiprocess_mode="livesum")
+EXECUTOR_WAIT_SECONDS = Histogram(
+    "executor_wait_seconds", "Time thread pool tasks wait for a free thread",
+    ["executor"], buckets=QUERY_BUCKETS + (10, 30, 60)
+)
+MODEL_LOAD_SECONDS = Histogram(
+    "whisper_model_load_seconds", "Time to load a Whisper model",
+    ["model"], buckets=(0.5, 1, 2.5, 5, 10, 20, 40, 80, 160)
+)
+DB_QUERY_SECONDS = Histogram("db_query_seconds", "Database statement latency", ["statement"], buckets=QUERY_BUCKETS)
+SUMMARY_CACHE_LOOKUPS = Counter("summary_cache_lookups", "Summary cache lookups", ["result"])
+EVENT_LOOP_LAG_SECONDS = Histogram(
+    "event_loop_lag_seconds", "Delay before the event loop runs a callback scheduled from another thread",
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+)
+EVENT_LOOP_BLOCKS = Counter("event_loop_blocks", "Times the event loop was blocked past the threshold")
+EVENT_LOOP_BLOCK_SECONDS = Histogram(
+    "event_loop_block_seconds", "How long each detected block lasted",
+    buckets=(0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+)
+
+
+def stage_timer(operation: str, stage: str):
+    """Context manager timing one stage: with stage_timer("summarize", "load"): ..."""
+    return STAGE_SECONDS.labels(operation, stage).time()
+
+
+def observe_transcription(model: str, mode: str, audio_seconds: float, wall_seconds: float):
+    if audio_seconds and wall_seconds > 0:
+        REALTIME_FACTOR.labels(model, mode).observe(audio_seconds / wall_seconds)
+        AUDIO_SECONDS.labels(model).inc(audio_seconds)
+
+
+def _track_future(name: str, future: Future) -> Future:
+    tasks = EXECUTOR_TASKS.labels(name)
+    tasks.inc()
+    future.add_done_callback(lambda _: tasks.dec())
+    return future
+
+
+class InstrumentedThreadPool(ThreadPoolExecutor):
+    """ThreadPoolExecutor reporting tasks in flight and time waiting for a thread"""
+
+    def __init__(self, name: str, max_workers: int = None):
+        super().__init__(max_workers, thread_name_prefix=name)
+        self.metric_name = name
+        EXECUTOR_WORKERS.labels(name).inc(self._max_workers)
+
+    def submit(self, fn, /, *args, **kwargs):
+        submitted = time.perf_counter()
+        wait = EXECUTOR_WAIT_SECONDS.labels(self.metric_name)
+
+        def run():
+            wait.observe(time.perf_counter() - submitted)
+            return fn(*args, **kwargs)
+
+        return _track_future(self.metric_name, super().submit(run))
+
+    def shutdown(self, wait: bool = True, *, cancel_futures: bool = False):
+        EXECUTOR_WORKERS.labels(self.metric_name).dec(self._max_workers)
+        super().shutdown(wait, cancel_futures=cancel_futures)
+
+
+class InstrumentedProcessPool(ProcessPoolExecutor):
+    """ProcessPoolExecutor reporting tasks in flight"""
+
+    def __init__(self, name: str, max_workers: int = None, **kwargs):
+        super().__init__(max_workers, **kwargs)
+        self.metric_name = name
+        EXECUTOR_WORKERS.labels(name).inc(self._max_workers)
+
+    def submit(self, fn, /, *args, **kwargs):
+        return _track_future(self.metric_name, super().submit(fn, *args, **kwargs))
+
+    def shutdown(self, wait: bool = True, *, cancel_futures: bool = False):
+        EXECUTOR_WORKERS.labels(self.metric_name).dec(self._max_workers)
+        super().shutdown(wait, cancel_futures=cancel_futures)
+
+
+def _statement_kind(statement: str) -> str:
+    keyword = statement.lstrip().split(None, 1)[0].upper() if statement.strip() else ""
+    return keyword if keyword in ("SELECT", "INSERT", "UPDATE", "DELETE", "WITH") else "OTHER"
+
+
+def instrument_engine(sync_engine):
+    """Time every statement run through an engine"""
+
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        conn.info["query_started"] = time.perf_counter()
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        started = conn.info.pop("query_started", None)
+        if started is not None:
+            DB_QUERY_SECONDS.labels(_statement_kind(statement)).observe(time.perf_counter() - started)
+
+
+def render_metrics() -> tuple[bytes, str]:
+    """Metrics in the Prometheus text format, merged across processes if configured"""
+    if PROMETHEUS_MULTIPROC_DIR:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return generate_latest(registry), CONTENT_TYPE_LATEST
+
+
+def mark_process_dead():
+    """Drop this process's live gauges from the shared directory on shutdown"""
+    if PROMETHEUS_MULTIPROC_DIR:
+        multiprocess.mark_process_dead(os.getpid())
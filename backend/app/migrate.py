@@ -0,0 +1,177 @@
+"""Data migrations that are run by hand
+
+    cd backend && python -m app.migrate compress-transcripts --codec lzma --batch-size 100 --vacuum
+
+compress-transcripts rewrites stored transcripts with a codec (zlib, lzma,
+or none to decompress), a batch per transaction, and removes any
+.txt copies left by older versions. It reports the space saved.
+Set TRANSCRIPT_COMPRESSION to the same codec so new transcripts match.
+
+A compressed transcript is searched through its segments (see
+app.services.search), so meetings stored before segments were kept stay
+plain text; re-transcribe them to compress them.
+"""
+import os
+import time
+import argparse
+import asyncio
+from sqlalchemy import select, text
+from sqlalchemy.orm import undefer_group
+
+from app.database import AsyncSessionLocal, engine, init_db, IS_SQLITE, DATABASE_URL
+from app.models import Meeting, TranscriptSegment
+from app.services.compression import CODECS, LZMA_MAGIC
+
+
+def _stored_codec(meeting: Meeting) -> str:
+    if meeting.transcript_blob is None:
+        return "none"
+    return "lzma" if bytes(meeting.transcript_blob).startswith(LZMA_MAGIC) else "zlib"
+
+
+def _stored_size(meeting: Meeting) -> int:
+    if meeting.transcript_blob is not None:
+        return len(meeting.transcript_blob)
+    return len(meeting._transcript_text.encode("utf-8"))
+
+
+def _database_file_size() -> int:
+    if not IS_SQLITE:
+        return 0
+    path = DATABASE_URL.split("///", 1)[-1]
+    return sum(os.path.getsize(p) for p in (path, f"{path}-wal") if os.path.exists(p))
+
+
+async def compress_transcripts(codec: str, batch_size: int = 100) -> dict:
+    """
+    Rewrite every stored transcript with a codec
+
+    Args:
+        codec: 'zlib', 'lzma' or 'none'
+        batch_size: Meetings per transaction
+
+    Returns:
+        dict with 'meetings' rewritten, 'skipped' (left unchanged),
+        'unsegmented' (left plain as they have no segments to search),
+        'incompressible' (left plain as compressing would not shrink them),
+        'files_removed' and byte counts 'before', 'after' and 'saved'
+    """
+    report = {
+        "meetings": 0, "skipped": 0, "unsegmented": 0, "incompressible": 0,
+        "files_removed": 0, "before": 0, "after": 0,
+    }
+    last_id = 0
+
+    async with AsyncSessionLocal() as db:
+        while True:
+            result = await db.execute(
+                select(Meeting)
+                .options(undefer_group("transcript"))
+                .where(Meeting.has_transcript, Meeting.id > last_id)
+                .order_by(Meeting.id)
+                .limit(batch_size)
+            )
+            meetings = result.scalars().all()
+            if not meetings:
+                break
+            last_id = meetings[-1].id
+
+            result = await db.execute(
+                select(TranscriptSegment.meeting_id.distinct())
+                .where(TranscriptSegment.meeting_id.in_([meeting.id for meeting in meetings]))
+            )
+            segmented = set(result.scalars().all())
+
+            stale_files = []
+            for meeting in meetings:
+                target = codec
+                if codec != "none" and meeting.id not in segmented:
+                    # Without segments a compressed transcript could not be searched
+                    target = "none"
+                    report["unsegmented"] += 1
+
+                has_file = bool(meeting.transcript_path) and os.path.exists(meeting.transcript_path)
+                if _stored_codec(meeting) == target and not has_file:
+                    report["skipped"] += 1
+                    continue
+
+                stored_codec, before = _stored_codec(meeting), _stored_size(meeting)
+                meeting.set_transcript(meeting.transcript_text, target)
+                if _stored_codec(meeting) != target:
+                    report["incompressible"] += 1
+                    if _stored_codec(meeting) == stored_codec and not has_file:
+                        report["skipped"] += 1
+                        continue
+
+                report["before"] += before
+                if has_file:
+                    report["before"] += os.path.getsize(meeting.transcript_path)
+                    stale_files.append(meeting.transcript_path)
+
+                meeting.transcript_path = None
+                report["after"] += _stored_size(meeting)
+                report["meetings"] += 1
+
+            await db.commit()
+            # Only delete the copies once the database holds the transcripts
+            for path in stale_files:
+                os.remove(path)
+            report["files_removed"] += len(stale_files)
+            db.expunge_all()
+
+            print(f"   ... {report['meetings'] + report['skipped']} meetings processed")
+
+    report["saved"] = report["before"] - report["after"]
+    return report
+
+
+async def vacuum():
+    """Return freed pages to the file system (SQLite only)"""
+    if not IS_SQLITE:
+        return
+    async with engine.connect() as conn:
+        conn = await conn.execution_options(isolation_level="AUTOCOMMIT")
+        await conn.execute(text("VACUUM"))
+        # VACUUM goes through the WAL; fold it back into the database file
+        await conn.execute(text("PRAGMA wal_checkpoint(TRUNCATE)"))
+
+
+async def main(args):
+    await init_db()
+
+    if args.command == "compress-transcripts":
+        file_size = _database_file_size()
+        started = time.perf_counter()
+        report = await compress_transcripts(args.codec, args.batch_size)
+        elapsed = time.perf_counter() - started
+
+        print(f"✅ Rewrote {report['meetings']} transcript(s) as '{args.codec}' in {elapsed:.1f}s "
+              f"({report['skipped']} already stored that way, {report['files_removed']} text file(s) removed)")
+        if report["unsegmented"]:
+            print(f"   {report['unsegmented']} transcript(s) without segments kept as plain text so they stay searchable")
+        if report["incompressible"]:
+            print(f"   {report['incompressible']} transcript(s) kept as plain text as compressing would not shrink them")
+        if report["before"]:
+            print(f"   Transcripts: {report['before'] / 1024:,.1f} KB -> {report['after'] / 1024:,.1f} KB "
+                  f"(saved {report['saved'] / 1024:,.1f} KB, {100 * report['saved'] / report['before']:.0f}%)")
+
+        if args.vacuum:
+            await vacuum()
+            new_size = _database_file_size()
+            print(f"   Database file: {file_size / 1024:,.1f} KB -> {new_size / 1024:,.1f} KB after VACUUM")
+        elif IS_SQLITE:
+            print("   Run with --vacuum to shrink the database file")
+
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run data migrations")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    compress = subparsers.add_parser("compress-transcripts", help="Compress (or decompress) stored transcripts")
+    compress.add_argument("--codec", choices=CODECS, default="lzma", help="Target codec (none decompresses)")
+    compress.add_argument("--batch-size", type=int, default=100, help="Meetings per transaction")
+    compress.add_argument("--vacuum", action="store_true", help="VACUUM the SQLite database afterwards")
+
+    asyncio.run(main(parser.parse_args()))
@@ -1,9 +1,13 @@
 """Database models and Pydantic schemas"""
 from datetime import datetime
-from typing import Optional
+from typing import Optional, Any
 from pydantic import BaseModel, Field
-from sqlalchemy import Column, Integer, String, DateTime, Float, Text
+from sqlalchemy import Column, Integer, String, DateTime, Float, Text, Boolean, LargeBinary, Index, text, or_
 from sqlalchemy.ext.declarative import declarative_base
+from sqlalchemy.ext.hybrid import hybrid_property
+from sqlalchemy.orm import deferred
+
+from app.services.compression import TRANSCRIPT_COMPRESSION, compress_text, transcript_body
 
 Base = declarative_base()
 
@@ -17,14 +21,169 @@ class Meeting(Base):
     title = Column(String(255), nullable=False)
     date = Column(DateTime, default=datetime.utcnow)
     audio_path = Column(String(500), nullable=False)
+    audio_hash = Column(String(64), nullable=True, index=True)  # SHA-256 of the audio file
     transcript_path = Column(String(500), nullable=True)
-    transcript_text = Column(Text, nullable=True)
+    # Transcript body: plain text or compressed (see transcript_text); loaded on demand
+    _transcript_text = deferred(Column("transcript_text", Text, nullable=True), group="transcript")
+    transcript_blob = deferred(Column(LargeBinary, nullable=True), group="transcript")
     summary = Column(Text, nullable=True)
     key_points = Column(Text, nullable=True)
     action_items = Column(Text, nullable=True)
     duration = Column(Float, nullable=True)  # in seconds
+    audio_format = Column(String(20), nullable=True)  # container: wav, mp3, mp4, webm
+    codec = Column(String(50), nullable=True)
+    sample_rate = Column(Integer, nullable=True)
+    channels = Column(Integer, nullable=True)
+    language = Column(String(10), nullable=True)  # detected by Whisper
+    terms_indexed = Column(Boolean, nullable=True, default=False)  # counted in corpus_terms
     created_at = Column(DateTime, default=datetime.utcnow)
 
+    __table_args__ = (
+        # Keyset pagination of the meeting list
+        Index("ix_meetings_created_at_id", "created_at", "id"),
+    )
+
+    def __init__(self, **kwargs):
+        # Set the deferred transcript columns so new meetings never lazy-load them
+        kwargs.setdefault("transcript_text", None)
+        super().__init__(**kwargs)
+
+    @property
+    def transcript_text(self) -> Optional[str]:
+        """
+        Transcript text, decompressed if stored compressed
+
+        Both columns are deferred; load them first (undefer_group("transcript")
+        or app.services.meetings.load_transcript).
+        """
+        blob = self.transcript_blob
+        if self._transcript_text is not None or blob is None:
+            return self._transcript_text
+        cached = self.__dict__.get("_decoded_transcript")
+        if cached is None or cached[0] is not blob:
+            cached = (blob, transcript_body(None, blob))
+            self.__dict__["_decoded_transcript"] = cached
+        return cached[1]
+
+    @transcript_text.setter
+    def transcript_text(self, value: Optional[str]):
+        self.set_transcript(value, TRANSCRIPT_COMPRESSION)
+
+    def set_transcript(self, value: Optional[str], codec: str):
+        """Store the transcript as plain text (codec 'none') or compressed, unless that is no smaller"""
+        blob = None
+        if value is not None and codec != "none":
+            blob = compress_text(value, codec)
+            if len(blob) >= len(value.encode("utf-8")):
+                blob = None
+        if blob is None:
+            self._transcript_text, self.transcript_blob = value, None
+        else:
+            self._transcript_text, self.transcript_blob = None, blob
+
+    @hybrid_property
+    def has_transcript(self) -> bool:
+        return self._transcript_text is not None or self.transcript_blob is not None
+
+    @has_transcript.expression
+    def has_transcript(cls):
+        return or_(cls._transcript_text.is_not(None), cls.transcript_blob.is_not(None))
+
+
+class TranscriptSegment(Base):
+    """Timestamped transcript segment (one row per Whisper segment)"""
+    __tablename__ = "transcript_segments"
+
+    # meeting_id * SEGMENT_ROWID_STRIDE + idx, so a meeting's segments are one key range
+    id = Column(Integer, primary_key=True, autoincrement=False)
+    meeting_id = Column(Integer, nullable=False)
+    idx = Column(Integer, nullable=False)  # position in the transcript
+    start = Column(Float, nullable=False)  # seconds
+    end = Column(Float, nullable=False)
+    text = Column(Text, nullable=False)
+    avg_logprob = Column(Float, nullable=True)
+
+    __table_args__ = (
+        Index("ix_transcript_segments_meeting_start", "meeting_id", "start"),
+    )
+
+
+class TranscriptSection(Base):
+    """Summary of one section of a long transcript (hierarchical summarization)"""
+    __tablename__ = "transcript_sections"
+
+    meeting_id = Column(Integer, primary_key=True, autoincrement=False)
+    idx = Column(Integer, primary_key=True, autoincrement=False)  # position in the transcript
+    start = Column(Float, nullable=False)  # seconds
+    end = Column(Float, nullable=False)
+    method = Column(String(20), nullable=False)
+    summary = Column(Text, nullable=False)
+    key_points = Column(Text, nullable=True)  # newline-separated, like Meeting.key_points
+    action_items = Column(Text, nullable=True)
+
+
+class CorpusTerm(Base):
+    """Number of transcripts containing a term (corpus document frequency)"""
+    __tablename__ = "corpus_terms"
+
+    term = Column(String(100), primary_key=True)
+    doc_freq = Column(Integer, nullable=False, default=0)
+
+
+class SummaryCacheEntry(Base):
+    """Persisted summary result, keyed by transcript hash, summarizer and its settings"""
+    __tablename__ = "summary_cache"
+
+    key = Column(String(64), primary_key=True)  # SHA-256 of the key material
+    transcript_hash = Column(String(64), nullable=False, index=True)
+    method = Column(String(20), nullable=False)
+    result = Column(Text, nullable=False)  # JSON
+    compute_seconds = Column(Float, nullable=False, default=0.0)
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+
+class CorpusStats(Base):
+    """Single-row corpus totals; version changes on every index update"""
+    __tablename__ = "corpus_stats"
+
+    id = Column(Integer, primary_key=True)
+    documents = Column(Integer, nullable=False, default=0)
+    version = Column(Integer, nullable=False, default=0)
+    tokenizer = Column(Integer, nullable=True)  # TOKENIZER_VERSION the terms were counted with
+
+
+class Job(Base):
+    """Background job database model (durable work queue)"""
+    __tablename__ = "jobs"
+
+    id = Column(String(32), primary_key=True)
+    kind = Column(String(50), nullable=False)
+    meeting_id = Column(Integer, nullable=False, index=True)
+    state = Column(String(20), nullable=False, default="queued")
+    progress = Column(Float, nullable=False, default=0.0)
+    payload = Column(Text, nullable=True)  # JSON
+    result = Column(Text, nullable=True)  # JSON
+    error = Column(Text, nullable=True)
+    attempts = Column(Integer, nullable=False, default=0)
+    max_attempts = Column(Integer, nullable=False, default=3)
+    lease_owner = Column(String(255), nullable=True)
+    lease_expires_at = Column(DateTime, nullable=True)
+    heartbeat_at = Column(DateTime, nullable=True)
+    available_at = Column(DateTime, default=datetime.utcnow)  # earliest (re)try time
+    created_at = Column(DateTime, default=datetime.utcnow)
+    started_at = Column(DateTime, nullable=True)
+    finished_at = Column(DateTime, nullable=True)
+
+    __table_args__ = (
+        Index("ix_jobs_state_available", "state", "available_at"),
+        # At most one active job of a kind per meeting
+        Index(
+            "ux_jobs_active_meeting", "kind", "meeting_id", unique=True,
+            sqlite_where=text("state IN ('queued', 'running')"),
+            postgresql_where=text("state IN ('queued', 'running')")
+        ),
+    )
+
 
 # Pydantic Schemas for API
 class MeetingCreate(BaseModel):
@@ -38,18 +197,75 @@ class MeetingResponse(BaseModel):
     title: str
     date: datetime
     audio_path: str
+    audio_hash: Optional[str] = None
     transcript_path: Optional[str] = None
     transcript_text: Optional[str] = None
     summary: Optional[str] = None
     key_points: Optional[str] = None
     action_items: Optional[str] = None
     duration: Optional[float] = None
+    audio_format: Optional[str] = None
+    codec: Optional[str] = None
+    sample_rate: Optional[int] = None
+    channels: Optional[int] = None
+    language: Optional[str] = None
     created_at: datetime
 
     class Config:
         from_attributes = True
 
 
+class MeetingSummary(BaseModel):
+    """Schema for a meeting list row (no transcript or summary text)"""
+    id: int
+    title: str
+    date: datetime
+    duration: Optional[float] = None
+    language: Optional[str] = None
+    transcribed: bool = False
+    summarized: bool = False
+    created_at: datetime
+
+
+class MeetingPage(BaseModel):
+    """Schema for one page of the meeting list"""
+    items: list[MeetingSummary]
+    next_cursor: Optional[str] = None
+
+
+class BatchTranscribeRequest(BaseModel):
+    """Schema for queueing transcription of many meetings"""
+    meeting_ids: list[int]
+    model: Optional[str] = None
+
+
+class BatchSummarizeRequest(BaseModel):
+    """Schema for summarizing many meetings"""
+    meeting_ids: list[int]
+    method: Optional[str] = None
+    lexicon: Optional[str] = None
+
+
+class UploadSessionCreate(BaseModel):
+    """Schema for starting a resumable upload"""
+    filename: str = Field(..., min_length=1, max_length=255)
+    title: str = Field(..., min_length=1, max_length=255)
+    total_size: int = Field(..., gt=0)
+    chunk_size: Optional[int] = None
+
+
+class UploadSessionResponse(BaseModel):
+    """Schema for resumable upload status"""
+    upload_id: str
+    filename: str
+    title: str
+    total_size: int
+    chunk_size: int
+    total_chunks: int
+    received_chunks: list[int]
+    missing_chunks: list[int]
+
+
 class TranscriptionResponse(BaseModel):
     """Schema for transcription response"""
     meeting_id: int
@@ -63,3 +279,78 @@ class SummaryResponse(BaseModel):
     summary: str
     key_points: list[str]
     action_items: list[str]
+    method: Optional[str] = None
+    cached: bool = False
+    sections: int = 0  # sections summarized separately (long transcripts)
+
+
+class SegmentResponse(BaseModel):
+    """Schema for a stored transcript segment"""
+    idx: int
+    start: float
+    end: float
+    text: str
+    avg_logprob: Optional[float] = None
+
+    class Config:
+        from_attributes = True
+
+
+class SegmentPage(BaseModel):
+    """Schema for a slice of a meeting's segments"""
+    meeting_id: int
+    total: int
+    segments: list[SegmentResponse]
+
+
+class SectionResponse(BaseModel):
+    """Schema for one section of a meeting outline"""
+    idx: int
+    start: float
+    end: float
+    summary: str
+    key_points: list[str]
+    action_items: list[str]
+
+
+class OutlineResponse(BaseModel):
+    """Schema for the per-section outline of a long meeting"""
+    meeting_id: int
+    method: Optional[str] = None
+    sections: list[SectionResponse]
+
+
+class SearchSegment(BaseModel):
+    """Schema for a matching transcript segment"""
+    start: float
+    end: float
+    snippet: str
+
+
+class SearchResult(BaseModel):
+    """Schema for a search hit"""
+    meeting_id: int
+    title: str
+    date: Optional[datetime] = None
+    duration: Optional[float] = None
+    rank: float
+    snippet: str
+    segments: list[SearchSegment] = []
+
+
+class JobResponse(BaseModel):
+    """Schema for background job status"""
+    id: str
+    kind: str
+    meeting_id: int
+    state: str
+    progress: float
+    attempts: int = 0
+    max_attempts: int = 1
+    error: Optional[str] = None
+    result: Optional[dict[str, Any]] = None
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    wait_seconds: Optional[float] = None
+    run_seconds: Optional[float] = None
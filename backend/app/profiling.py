@@ -0,0 +1,249 @@
+"""Opt-in request profiling with collapsed-stack output
+
+With PROFILING_ENABLED, a request carrying ``X-Profile: 1`` (or the query
+flag ``profile=1``) is profiled by a sampling thread: every
+PROFILE_INTERVAL_MS it records the stack of the event loop thread while the
+request's handler task is running, and of every executor thread working for
+the request (work passed through ``profiled``). Stacks are written as
+collapsed stacks (``root;caller;callee count`` lines, the input of
+flamegraph.pl and speedscope) to PROFILE_DIR, one file per request id,
+listed and downloaded through /api/admin/profiles.
+
+When PROFILING_TOKEN is set, both the flag and the admin endpoints also
+need the ``X-Profile-Token`` header. With profiling disabled, handlers are
+not wrapped at all and ``profiled`` costs one context variable lookup.
+Work in process pools is not sampled.
+"""
+import os
+import re
+import sys
+import json
+import time
+import uuid
+import asyncio
+import threading
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from contextvars import ContextVar
+from datetime import datetime
+from functools import wraps
+from pathlib import Path
+from typing import Callable, Optional
+from fastapi import Request
+from fastapi.routing import APIRoute
+from dotenv import load_dotenv
+
+load_dotenv()
+
+PROFILING_ENABLED = os.getenv("PROFILING_ENABLED", "false").lower() == "true"
+PROFILING_TOKEN = os.getenv("PROFILING_TOKEN", "")
+PROFILE_DIR = os.getenv("PROFILE_DIR", "../data/profiles")
+PROFILE_INTERVAL = float(os.getenv("PROFILE_INTERVAL_MS", "5")) / 1000
+PROFILE_KEEP = int(os.getenv("PROFILE_KEEP", "200"))  # newest profiles kept on disk
+
+PROFILE_ID_PATTERN = re.compile(r"^[A-Za-z0-9_-]{1,64}$")
+
+_current_profile: ContextVar[Optional["RequestProfile"]] = ContextVar("current_profile", default=None)
+
+
+class ProfileNotFound(Exception):
+    """Raised for unknown or malformed profile ids"""
+
+
+def _frame_name(frame) -> str:
+    return f"{frame.f_globals.get('__name__', '?')}:{frame.f_code.co_name}"
+
+
+def _collapse(root: str, frame) -> str:
+    names = []
+    while frame is not None:
+        names.append(_frame_name(frame))
+        frame = frame.f_back
+    names.append(root)
+    return ";".join(reversed(names))
+
+
+class RequestProfile:
+    """Stacks sampled for one request"""
+
+    def __init__(self, profile_id: str, method: str, path: str):
+        self.id = profile_id
+        self.method = method
+        self.path = path
+        self.started_at = datetime.utcnow()
+        self.started = time.perf_counter()
+        self.loop = asyncio.get_running_loop()
+        self.loop_thread = threading.get_ident()
+        self.task = asyncio.current_task()
+        self.threads = {}  # thread ident -> label, while working for this request
+        self.stacks = Counter()
+        self.samples = 0
+
+    def sample(self, frames: dict):
+        if asyncio.current_task(self.loop) is self.task:
+            frame = frames.get(self.loop_thread)
+            if frame is not None:
+                self.stacks[_collapse("loop", frame)] += 1
+                self.samples += 1
+        for ident, label in list(self.threads.items()):
+            frame = frames.get(ident)
+            if frame is not None:
+                self.stacks[_collapse(label, frame)] += 1
+                self.samples += 1
+
+    def metadata(self, status_code: Optional[int]) -> dict:
+        return {
+            "id": self.id,
+            "method": self.method,
+            "path": self.path,
+            "status_code": status_code,
+            "started_at": self.started_at.isoformat(),
+            "duration_seconds": time.perf_counter() - self.started,
+            "samples": self.samples,
+            "interval_ms": PROFILE_INTERVAL * 1000,
+        }
+
+
+class _Sampler:
+    """One daemon thread sampling every active profile; exits when none are left"""
+
+    def __init__(self):
+        self._profiles = set()
+        self._lock = threading.Lock()
+        self._thread = None
+
+    def add(self, profile: RequestProfile):
+        with self._lock:
+            self._profiles.add(profile)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="profile-sampler", daemon=True)
+                self._thread.start()
+
+    def remove(self, profile: RequestProfile):
+        with self._lock:
+            self._profiles.discard(profile)
+
+    def _run(self):
+        while True:
+            with self._lock:
+                active = list(self._profiles)
+                if not active:
+                    self._thread = None
+                    return
+            frames = sys._current_frames()
+            for profile in active:
+                profile.sample(frames)
+            del frames
+            time.sleep(PROFILE_INTERVAL)
+
+
+_sampler = _Sampler()
+
+
+def profiled(fn: Callable, executor=None) -> Callable:
+    """
+    Wrap executor work so the current request's profile samples its thread
+
+    Returns fn itself when no profile is active, or when it runs in a
+    process pool (the wrapper could not be pickled).
+    """
+    profile = _current_profile.get()
+    if profile is None or isinstance(executor, ProcessPoolExecutor):
+        return fn
+
+    @wraps(fn)
+    def run(*args, **kwargs):
+        ident = threading.get_ident()
+        profile.threads[ident] = f"executor:{threading.current_thread().name}"
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            profile.threads.pop(ident, None)
+
+    return run
+
+
+def token_valid(request: Request) -> bool:
+    return not PROFILING_TOKEN or request.headers.get("x-profile-token") == PROFILING_TOKEN
+
+
+def _wants_profile(request: Request) -> bool:
+    flag = request.headers.get("x-profile") or request.query_params.get("profile")
+    return flag in ("1", "true") and token_valid(request)
+
+
+def _profile_id(request: Request) -> str:
+    request_id = request.headers.get("x-request-id", "")
+    return request_id if PROFILE_ID_PATTERN.match(request_id) else uuid.uuid4().hex
+
+
+def _save(profile: RequestProfile, status_code: Optional[int]):
+    directory = Path(PROFILE_DIR)
+    directory.mkdir(parents=True, exist_ok=True)
+    lines = [f"{stack} {count}\n" for stack, count in profile.stacks.most_common()]
+    (directory / f"{profile.id}.folded").write_text("".join(lines))
+    (directory / f"{profile.id}.json").write_text(json.dumps(profile.metadata(status_code)))
+
+    # Drop the oldest profiles over the limit
+    stored = sorted(directory.glob("*.json"), key=lambda p: p.stat().st_mtime, reverse=True)
+    for old in stored[PROFILE_KEEP:]:
+        old.unlink(missing_ok=True)
+        old.with_suffix(".folded").unlink(missing_ok=True)
+
+
+class ProfiledRoute(APIRoute):
+    """APIRoute whose handler is profiled on request; used as the app's route_class"""
+
+    def get_route_handler(self) -> Callable:
+        handler = super().get_route_handler()
+        if not PROFILING_ENABLED:
+            return handler
+
+        async def profiled_handler(request: Request):
+            if not _wants_profile(request):
+                return await handler(request)
+
+            profile = RequestProfile(_profile_id(request), request.method, request.url.path)
+            token = _current_profile.set(profile)
+            _sampler.add(profile)
+            response = None
+            try:
+                response = await handler(request)
+                response.headers["X-Profile-Id"] = profile.id
+                return response
+            finally:
+                _sampler.remove(profile)
+                _current_profile.reset(token)
+                status_code = response.status_code if response is not None else None
+                await asyncio.get_running_loop().run_in_executor(None, _save, profile, status_code)
+
+        return profiled_handler
+
+
+def list_profiles() -> list[dict]:
+    """Stored profiles, newest first"""
+    directory = Path(PROFILE_DIR)
+    if not directory.exists():
+        return []
+    profiles = []
+    for path in directory.glob("*.json"):
+        try:
+            profiles.append(json.loads(path.read_text()))
+        except (OSError, ValueError):
+            continue
+    return sorted(profiles, key=lambda p: p["started_at"], reverse=True)
+
+
+def profile_path(profile_id: str) -> Path:
+    """
+    Collapsed-stack file of a stored profile
+
+    Raises:
+        ProfileNotFound: If the id is malformed or nothing is stored under it
+    """
+    if not PROFILE_ID_PATTERN.match(profile_id):
+        raise ProfileNotFound(f"Profile '{profile_id}' not found")
+    path = Path(PROFILE_DIR) / f"{profile_id}.folded"
+    if not path.exists():
+        raise ProfileNotFound(f"Profile '{profile_id}' not found")
+    return path
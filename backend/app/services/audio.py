@@ -0,0 +1,95 @@
+"""Decoded audio cache: each upload is decoded to 16 kHz mono PCM once
+
+The decoded samples are stored as a float32 ``.npy`` file beside the audio
+and opened memory-mapped, so the duration probe, Whisper, chunked
+transcription and later re-transcriptions all read the same pages without
+decoding (or copying) the recording again.
+"""
+import os
+from pathlib import Path
+import numpy as np
+from dotenv import load_dotenv
+
+load_dotenv()
+
+SAMPLE_RATE = 16000  # Whisper input rate
+DECODED_SUFFIX = ".pcm16k.npy"
+
+DECODED_AUDIO_CACHE = os.getenv("DECODED_AUDIO_CACHE", "true").lower() == "true"
+
+
+def decoded_path(audio_path: str) -> Path:
+    """Path of the decoded PCM cache for an audio file"""
+    return Path(audio_path + DECODED_SUFFIX)
+
+
+def decode_audio(audio_path: str) -> np.ndarray:
+    """
+    Get 16 kHz mono float32 samples for an audio file
+
+    Decodes with ffmpeg on first use and memory-maps the cached result
+    afterwards. The cache is rebuilt if the audio file is newer than it.
+
+    Args:
+        audio_path: Path to the audio file
+
+    Returns:
+        Read-only (memory-mapped) sample array
+    """
+    import whisper
+
+    if not DECODED_AUDIO_CACHE:
+        return whisper.load_audio(audio_path, sr=SAMPLE_RATE)
+
+    cache_path = decoded_path(audio_path)
+    if not _is_fresh(audio_path, cache_path):
+        audio = whisper.load_audio(audio_path, sr=SAMPLE_RATE)
+
+        # Write then rename so concurrent readers never see a partial file
+        tmp_path = cache_path.with_name(f"{cache_path.name}.{os.getpid()}.tmp")
+        with open(tmp_path, "wb") as f:
+            np.save(f, audio)
+        os.replace(tmp_path, cache_path)
+
+    return np.load(cache_path, mmap_mode="r")
+
+
+def _is_fresh(audio_path: str, cache_path: Path) -> bool:
+    """True if the cache exists and is not older than the audio file"""
+    try:
+        return cache_path.stat().st_mtime >= os.stat(audio_path).st_mtime
+    except OSError:
+        return False
+
+
+def audio_duration(audio: np.ndarray) -> float:
+    """Duration in seconds of decoded samples"""
+    return len(audio) / SAMPLE_RATE
+
+
+def remove_decoded_audio(audio_path: str) -> int:
+    """
+    Delete the decoded cache for an audio file
+
+    Returns:
+        Bytes freed
+    """
+    cache_path = decoded_path(audio_path)
+    try:
+        size = cache_path.stat().st_size
+        cache_path.unlink()
+        return size
+    except OSError:
+        return 0
+
+
+def decoded_cache_usage(audio_dir: str) -> dict:
+    """Number and total size of decoded audio caches in a directory"""
+    files = 0
+    total = 0
+    if os.path.isdir(audio_dir):
+        for entry in os.scandir(audio_dir):
+            if entry.name.endswith(DECODED_SUFFIX):
+                files += 1
+                total += entry.stat().st_size
+    return {"enabled": DECODED_AUDIO_CACHE, "files": files, "size_mb": total / (1024 * 1024)}
@@ -0,0 +1,230 @@
+"""Batch processing of many meetings in one request
+
+Batch requests validate all items first, load every meeting with one IN
+query, run the work with bounded concurrency and commit results in groups.
+Each item gets its own status, so one bad item does not fail the batch.
+"""
+import os
+import time
+import asyncio
+from typing import Awaitable, Callable, Optional
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import load_only, undefer_group
+from dotenv import load_dotenv
+
+from app.models import Meeting
+from app.services.nlp import generate_summary
+from app.services.summary_cache import lookup_summary, store_summary
+from app.services.sections import summarize_meeting_text, is_long
+from app.services.corpus import corpus_index
+from app.services.jobs import enqueue_jobs
+
+load_dotenv()
+
+BATCH_MAX_ITEMS = int(os.getenv("BATCH_MAX_ITEMS", "50"))
+BATCH_CONCURRENCY = int(os.getenv("BATCH_CONCURRENCY", "4"))
+BATCH_COMMIT_SIZE = int(os.getenv("BATCH_COMMIT_SIZE", "10"))  # results per transaction
+
+STATUS_OK = "ok"
+STATUS_QUEUED = "queued"
+STATUS_NOT_FOUND = "not_found"
+STATUS_ERROR = "error"
+
+
+class BatchTooLarge(Exception):
+    """Raised when a batch is empty or has more than BATCH_MAX_ITEMS items"""
+
+
+def check_batch_size(count: int):
+    if count == 0:
+        raise BatchTooLarge("Batch is empty")
+    if count > BATCH_MAX_ITEMS:
+        raise BatchTooLarge(f"Batch too large: {count} items (max {BATCH_MAX_ITEMS})")
+
+
+def unique_ids(meeting_ids: list[int]) -> list[int]:
+    """Meeting ids without duplicates, in request order"""
+    check_batch_size(len(meeting_ids))
+    return list(dict.fromkeys(meeting_ids))
+
+
+async def run_bounded(items: list, worker: Callable[..., Awaitable], concurrency: int = BATCH_CONCURRENCY):
+    """
+    Run worker(item) for every item, at most `concurrency` at a time
+
+    Yields:
+        (item, result, error) as each item finishes; error is the exception
+        raised by the worker, if any
+    """
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+
+    async def run(item):
+        async with semaphore:
+            try:
+                return item, await worker(item), None
+            except Exception as e:
+                return item, None, e
+
+    for finished in asyncio.as_completed([run(item) for item in items]):
+        yield await finished
+
+
+def summarize_results(items: list[dict]) -> dict:
+    """Batch response: per-item results plus counts per status"""
+    counts = {}
+    for item in items:
+        counts[item["status"]] = counts.get(item["status"], 0) + 1
+    return {"items": items, "counts": counts}
+
+
+async def enqueue_transcriptions(db: AsyncSession, meeting_ids: list[int], model_name: str) -> dict:
+    """
+    Queue transcription jobs for many meetings
+
+    Args:
+        db: Database session
+        meeting_ids: Meeting IDs
+        model_name: Resolved Whisper model name
+
+    Returns:
+        Batch response; queued items carry their 'job_id'
+    """
+    meeting_ids = unique_ids(meeting_ids)
+    result = await db.execute(
+        select(Meeting).options(load_only(Meeting.id, Meeting.audio_path)).where(Meeting.id.in_(meeting_ids))
+    )
+    audio_paths = {meeting.id: meeting.audio_path for meeting in result.scalars()}
+
+    loop = asyncio.get_event_loop()
+    exists = await loop.run_in_executor(
+        None, lambda: {mid: bool(path) and os.path.exists(path) for mid, path in audio_paths.items()}
+    )
+
+    items = {}
+    for meeting_id in meeting_ids:
+        if meeting_id not in audio_paths:
+            items[meeting_id] = {"meeting_id": meeting_id, "status": STATUS_NOT_FOUND, "detail": "Meeting not found"}
+        elif not exists[meeting_id]:
+            items[meeting_id] = {"meeting_id": meeting_id, "status": STATUS_ERROR, "detail": "Audio file not found"}
+
+    queueable = [mid for mid in meeting_ids if mid not in items]
+    if queueable:
+        jobs = await enqueue_jobs(db, "transcribe", queueable, payload={"model": model_name})
+        for meeting_id, (job, created) in jobs.items():
+            items[meeting_id] = {
+                "meeting_id": meeting_id,
+                "status": STATUS_QUEUED,
+                "job_id": job.id,
+                "detail": None if created else "Already queued",
+            }
+
+    return summarize_results([items[mid] for mid in meeting_ids])
+
+
+async def summarize_meetings(
+    db: AsyncSession,
+    meeting_ids: list[int],
+    method: str,
+    lexicon: Optional[str] = None
+) -> dict:
+    """
+    Summarize many meetings, BATCH_CONCURRENCY at a time
+
+    Summaries are committed every BATCH_COMMIT_SIZE meetings, so finished
+    work survives a failure later in the batch.
+
+    Args:
+        db: Database session
+        meeting_ids: Meeting IDs
+        method: Summarizer name
+        lexicon: Team lexicon profile
+
+    Returns:
+        Batch response; summarized items carry 'summary', 'key_points'
+        and 'action_items'
+    """
+    meeting_ids = unique_ids(meeting_ids)
+    result = await db.execute(
+        select(Meeting).options(undefer_group("transcript")).where(Meeting.id.in_(meeting_ids))
+    )
+    meetings = {meeting.id: meeting for meeting in result.scalars()}
+
+    items = {}
+    pending = []
+    for meeting_id in meeting_ids:
+        meeting = meetings.get(meeting_id)
+        if meeting is None:
+            items[meeting_id] = {"meeting_id": meeting_id, "status": STATUS_NOT_FOUND, "detail": "Meeting not found"}
+        elif not meeting.has_transcript:
+            items[meeting_id] = {"meeting_id": meeting_id, "status": STATUS_ERROR, "detail": "Meeting must be transcribed first"}
+        else:
+            pending.append(meeting)
+
+    await corpus_index.refresh(db)
+
+    # Cache lookups share the session, so they run one at a time; only the
+    # summarizer itself runs concurrently
+    lookups = {}
+    to_compute = []
+    one_pass = [meeting for meeting in pending if not is_long(meeting)]
+    for meeting in one_pass:
+        lookup = await lookup_summary(db, meeting.transcript_text, method, meeting.language, lexicon, corpus_index)
+        lookups[meeting.id] = lookup
+        if lookup.result is None:
+            to_compute.append(meeting)
+
+    async def summarize(meeting: Meeting) -> tuple[dict, float]:
+        started = time.perf_counter()
+        summary_data = await generate_summary(meeting.transcript_text, method, meeting.language, lexicon, corpus_index)
+        return summary_data, time.perf_counter() - started
+
+    async def summaries():
+        # Long meetings one at a time; each already spreads its sections over processes
+        for meeting in pending:
+            if meeting.id in lookups:
+                continue
+            try:
+                summary_data = (await summarize_meeting_text(db, meeting, method, lexicon, corpus_index)).result
+            except Exception as e:
+                yield meeting, None, e
+                continue
+            yield meeting, summary_data, None
+
+        for meeting in one_pass:
+            if lookups[meeting.id].result is not None:
+                yield meeting, lookups[meeting.id].result, None
+        async for meeting, computed, error in run_bounded(to_compute, summarize):
+            if error is not None:
+                yield meeting, None, error
+                continue
+            summary_data, seconds = computed
+            await store_summary(db, lookups[meeting.id], summary_data, seconds)
+            yield meeting, summary_data, None
+
+    uncommitted = 0
+    async for meeting, summary_data, error in summaries():
+        if error is not None:
+            items[meeting.id] = {"meeting_id": meeting.id, "status": STATUS_ERROR, "detail": str(error)}
+            continue
+
+        meeting.summary = summary_data["summary"]
+        meeting.key_points = "\n".join(summary_data["key_points"])
+        meeting.action_items = "\n".join(summary_data["action_items"])
+        items[meeting.id] = {
+            "meeting_id": meeting.id,
+            "status": STATUS_OK,
+            "summary": summary_data["summary"],
+            "key_points": summary_data["key_points"],
+            "action_items": summary_data["action_items"],
+        }
+
+        uncommitted += 1
+        if uncommitted >= BATCH_COMMIT_SIZE:
+            await db.commit()
+            uncommitted = 0
+
+    if uncommitted:
+        await db.commit()
+
+    return summarize_results([items[mid] for mid in meeting_ids])
@@ -0,0 +1,218 @@
+"""Chunked transcription of long recordings across a process pool
+
+Long audio is cut at quiet points into chunks that overlap by a few seconds.
+Each chunk is transcribed in a worker process holding its own Whisper model
+(memory-mapped decoded audio is shared with workers by path, not copied),
+and the per-chunk segments are shifted back onto the recording timeline. In
+the overlap between two chunks only segments whose midpoint falls on a chunk's
+own side of the cut are kept, so overlapping speech is not emitted twice.
+"""
+import os
+import multiprocessing
+from concurrent.futures import as_completed
+from typing import Callable, Optional
+import numpy as np
+
+from app.services.model_registry import ModelRegistry
+from app.services.audio import SAMPLE_RATE
+from app.metrics import InstrumentedProcessPool
+
+# Frame size used to look for quiet cut points
+ENERGY_FRAME_SECONDS = 0.03
+
+# Per-process model registry, created by _init_worker
+_worker_registry = None
+
+
+def find_chunk_boundaries(
+    audio: np.ndarray,
+    chunk_seconds: float,
+    overlap_seconds: float,
+    search_seconds: float = 10.0,
+    sample_rate: int = SAMPLE_RATE
+) -> list[dict]:
+    """
+    Plan chunks that are cut at the quietest point near each target length
+
+    Args:
+        audio: Mono PCM samples
+        chunk_seconds: Target chunk length
+        overlap_seconds: Audio added on both sides of each cut
+        search_seconds: How far around the target a cut may move
+        sample_rate: Sample rate of audio
+
+    Returns:
+        List of dicts with sample offsets 'start'/'end' (audio to decode) and
+        'core_start'/'core_end' (the part of the timeline this chunk owns)
+    """
+    total = len(audio)
+    chunk = int(chunk_seconds * sample_rate)
+    overlap = int(overlap_seconds * sample_rate)
+    search = int(search_seconds * sample_rate)
+    frame = max(1, int(ENERGY_FRAME_SECONDS * sample_rate))
+
+    cuts = [0]
+    while total - cuts[-1] > chunk + search:
+        target = cuts[-1] + chunk
+        lo = max(cuts[-1] + frame, target - search)
+        hi = min(total, target + search)
+
+        # Mean energy per frame in the search window; cut in the quietest frame
+        window = audio[lo:hi]
+        n_frames = len(window) // frame
+        if n_frames == 0:
+            cuts.append(target)
+            continue
+        energy = np.square(window[:n_frames * frame].reshape(n_frames, frame), dtype=np.float32).mean(axis=1)
+        quietest = int(np.argmin(energy))
+        cuts.append(lo + quietest * frame + frame // 2)
+    cuts.append(total)
+
+    return [
+        {
+            "start": max(0, core_start - overlap),
+            "end": min(total, core_end + overlap),
+            "core_start": core_start,
+            "core_end": core_end,
+        }
+        for core_start, core_end in zip(cuts[:-1], cuts[1:])
+    ]
+
+
+def stitch_chunks(chunk_results: list[dict], sample_rate: int = SAMPLE_RATE) -> dict:
+    """
+    Merge per-chunk segments into one transcript on the recording timeline
+
+    Args:
+        chunk_results: Dicts with the chunk plan fields and chunk-relative 'segments'
+        sample_rate: Sample rate the offsets refer to
+
+    Returns:
+        dict with 'text', absolute-time 'segments' and the first chunk's 'language'
+    """
+    segments = []
+    chunk_results = sorted(chunk_results, key=lambda c: c["start"])
+    for chunk in chunk_results:
+        offset = chunk["start"] / sample_rate
+        core_start = chunk["core_start"] / sample_rate
+        core_end = chunk["core_end"] / sample_rate
+
+        for segment in chunk["segments"]:
+            start = segment["start"] + offset
+            end = segment["end"] + offset
+            midpoint = (start + end) / 2
+            # Overlap regions are owned by exactly one chunk
+            if core_start <= midpoint < core_end:
+                segments.append({**segment, "start": start, "end": end})
+
+    text = "".join(segment["text"] for segment in segments)
+    language = chunk_results[0].get("language") if chunk_results else None
+    return {"text": text, "segments": segments, "language": language}
+
+
+def _normalize_segments(segments: list[dict]) -> list[dict]:
+    """Keep the segment fields we store"""
+    return [
+        {
+            "start": float(segment["start"]),
+            "end": float(segment["end"]),
+            "text": segment["text"],
+            "avg_logprob": segment.get("avg_logprob"),
+        }
+        for segment in segments
+    ]
+
+
+def _init_worker(device: str, threads: int, memory_budget_mb: float):
+    """Process pool initializer: set up this worker's model replicas"""
+    global _worker_registry
+    import torch
+
+    torch.set_num_threads(threads)
+    _worker_registry = ModelRegistry(device, memory_budget_mb)
+
+
+def _transcribe_chunk(chunk: dict, audio, model_name: str) -> dict:
+    """Transcribe one chunk in a worker process
+
+    audio is either the chunk's samples or the path of a decoded .npy file,
+    which is memory-mapped and sliced here instead of being pickled.
+    """
+    if isinstance(audio, str):
+        audio = np.load(audio, mmap_mode="r")[chunk["start"]:chunk["end"]]
+    result = _worker_registry.get(model_name).transcribe(audio, fp16=False)
+    return {**chunk, "segments": _normalize_segments(result["segments"]), "language": result.get("language")}
+
+
+class ChunkedTranscriber:
+    """Process pool of Whisper replicas transcribing chunks in parallel"""
+
+    def __init__(self, device: str, workers: int, memory_budget_mb: float):
+        self.device = device
+        self.workers = workers
+        self.memory_budget_mb = memory_budget_mb
+        self._pool = None
+
+    def _get_pool(self) -> InstrumentedProcessPool:
+        """Create the pool on first use"""
+        if self._pool is None:
+            # Share the cores between replicas instead of oversubscribing
+            threads = max(1, (os.cpu_count() or 1) // self.workers)
+            self._pool = InstrumentedProcessPool(
+                "transcribe-chunks",
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+                initargs=(self.device, threads, self.memory_budget_mb)
+            )
+        return self._pool
+
+    def transcribe(
+        self,
+        audio: np.ndarray,
+        model_name: str,
+        chunk_seconds: float,
+        overlap_seconds: float,
+        progress: Optional[Callable[[float], None]] = None
+    ) -> dict:
+        """
+        Transcribe decoded audio chunk by chunk in parallel
+
+        Args:
+            audio: 16 kHz mono float32 samples (ideally memory-mapped from disk)
+            model_name: Whisper model each replica uses
+            chunk_seconds: Target chunk length
+            overlap_seconds: Overlap added around each cut
+            progress: Optional callback receiving the finished fraction
+
+        Returns:
+            dict with 'text' and 'segments'
+        """
+        chunks = find_chunk_boundaries(audio, chunk_seconds, overlap_seconds)
+        pool = self._get_pool()
+
+        # Workers map the same decoded file instead of receiving copies
+        shared_path = audio.filename if isinstance(audio, np.memmap) else None
+
+        futures = [
+            pool.submit(
+                _transcribe_chunk, chunk,
+                shared_path or audio[chunk["start"]:chunk["end"]],
+                model_name
+            )
+            for chunk in chunks
+        ]
+
+        results = []
+        for future in as_completed(futures):
+            results.append(future.result())
+            if progress:
+                progress(len(results) / len(chunks))
+
+        return stitch_chunks(results)
+
+    def shutdown(self):
+        """Stop the worker processes"""
+        if self._pool is not None:
+            self._pool.shutdown(cancel_futures=True)
+            self._pool = None
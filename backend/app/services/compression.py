@@ -0,0 +1,62 @@
+"""Transcript body compression (zlib / lzma from the standard library)
+
+The database holds the only copy of a transcript: compressed in
+``meetings.transcript_blob`` when TRANSCRIPT_COMPRESSION is zlib or lzma,
+plain text in ``meetings.transcript_text`` when it is none. The codec is
+recognised from the stream header, so rows written with different settings
+can coexist.
+"""
+import os
+import lzma
+import zlib
+from typing import Optional
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# none, zlib or lzma
+TRANSCRIPT_COMPRESSION = os.getenv("TRANSCRIPT_COMPRESSION", "none").lower()
+
+CODECS = ["none", "zlib", "lzma"]
+
+ZLIB_LEVEL = 9
+LZMA_PRESET = 6
+
+# xz container magic; zlib streams start with a CMF byte of 0x78 (deflate, 32K window)
+LZMA_MAGIC = b"\xfd7zXZ\x00"
+
+
+def compress_text(text: str, codec: str) -> bytes:
+    """
+    Compress a transcript body
+
+    Args:
+        text: Transcript text
+        codec: 'zlib' or 'lzma'
+
+    Returns:
+        Compressed UTF-8 bytes
+    """
+    data = text.encode("utf-8")
+    if codec == "zlib":
+        return zlib.compress(data, ZLIB_LEVEL)
+    if codec == "lzma":
+        return lzma.compress(data, preset=LZMA_PRESET)
+    raise ValueError(f"Unknown transcript codec '{codec}'")
+
+
+def decompress_text(blob: Optional[bytes]) -> Optional[str]:
+    """Decompress a body written by compress_text (either codec)"""
+    if blob is None:
+        return None
+    blob = bytes(blob)
+    if blob.startswith(LZMA_MAGIC):
+        return lzma.decompress(blob).decode("utf-8")
+    return zlib.decompress(blob).decode("utf-8")
+
+
+def transcript_body(text: Optional[str], blob: Optional[bytes]) -> Optional[str]:
+    """Transcript from whichever column holds it"""
+    if text is not None:
+        return text
+    return decompress_text(blob)
@@ -0,0 +1,280 @@
+"""Corpus-wide document frequencies for IDF weighting
+
+Every stored transcript is counted once in the ``corpus_terms`` table
+(term -> number of transcripts containing it). The counts are updated
+incrementally whenever a transcript is stored, replaced or deleted, in the
+same transaction as that change, so they never need a rescan of all
+transcripts.
+
+Each process keeps the table in memory as a CorpusIndex: a term -> slot
+dict over a NumPy count array. Local updates are applied to it directly;
+``corpus_stats.version`` detects updates made by other processes, in
+which case the terms table is reloaded.
+
+Terms are counted with the summarizer's tokenizer. When TOKENIZER_VERSION
+changes, the counts are cleared and rebuilt from the stored transcripts at
+startup (backfill_corpus).
+"""
+import os
+import asyncio
+import numpy as np
+from typing import Optional, NamedTuple
+from sqlalchemy import select, update, delete
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import undefer_group
+from dotenv import load_dotenv
+
+from app.database import IS_SQLITE, AsyncSessionLocal
+from app.models import Meeting, CorpusTerm, CorpusStats
+from app.services.nlp import STOP_WORDS
+from app.services.summarizer import TOKEN_PATTERN
+
+if IS_SQLITE:
+    from sqlalchemy.dialects.sqlite import insert
+else:
+    from sqlalchemy.dialects.postgresql import insert
+
+load_dotenv()
+
+# Below this many transcripts corpus IDF is too noisy; per-transcript IDF is used
+CORPUS_IDF_MIN_DOCUMENTS = int(os.getenv("CORPUS_IDF_MIN_DOCUMENTS", "5"))
+
+MAX_TERM_LENGTH = 100
+# Bump when TOKEN_PATTERN changes; stored counts are then rebuilt
+TOKENIZER_VERSION = 2
+BATCH_SIZE = 500  # terms per statement (keeps under SQLite's variable limit)
+
+
+def document_terms(text: Optional[str]) -> list[str]:
+    """Distinct terms of a transcript, tokenized like the summarizer"""
+    if not text:
+        return []
+    terms = set(TOKEN_PATTERN.findall(text.lower())) - STOP_WORDS
+    return sorted(t for t in terms if len(t) <= MAX_TERM_LENGTH)
+
+
+class CorpusDelta(NamedTuple):
+    """A committed change to the corpus counts"""
+    added: list[str]
+    removed: list[str]
+    documents: int
+    version: int
+
+
+async def update_corpus(db: AsyncSession, added_text: Optional[str] = None, removed_text: Optional[str] = None) -> CorpusDelta:
+    """
+    Count one transcript in and/or one transcript out of the corpus
+
+    Runs in the caller's transaction; call CorpusIndex.apply with the result
+    after committing.
+
+    Args:
+        db: Database session
+        added_text: Transcript being stored
+        removed_text: Transcript being replaced or deleted
+
+    Returns:
+        CorpusDelta describing the change
+    """
+    added = document_terms(added_text)
+    removed = document_terms(removed_text)
+    documents = (added_text is not None) - (removed_text is not None)
+
+    for i in range(0, len(added), BATCH_SIZE):
+        stmt = insert(CorpusTerm).values([{"term": t, "doc_freq": 1} for t in added[i:i + BATCH_SIZE]])
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[CorpusTerm.term],
+            set_={"doc_freq": CorpusTerm.doc_freq + 1}
+        )
+        await db.execute(stmt)
+
+    for i in range(0, len(removed), BATCH_SIZE):
+        batch = removed[i:i + BATCH_SIZE]
+        await db.execute(
+            update(CorpusTerm).where(CorpusTerm.term.in_(batch)).values(doc_freq=CorpusTerm.doc_freq - 1)
+        )
+        # Only terms of the removed transcript can have dropped to zero
+        await db.execute(delete(CorpusTerm).where(CorpusTerm.term.in_(batch), CorpusTerm.doc_freq <= 0))
+
+    # Bump the version (creating the stats row on first use)
+    await db.execute(
+        insert(CorpusStats)
+        .values(id=1, documents=0, version=0, tokenizer=TOKENIZER_VERSION)
+        .on_conflict_do_nothing(index_elements=[CorpusStats.id])
+    )
+    result = await db.execute(
+        update(CorpusStats)
+        .where(CorpusStats.id == 1)
+        .values(documents=CorpusStats.documents + documents, version=CorpusStats.version + 1)
+        .returning(CorpusStats.version)
+    )
+    return CorpusDelta(added, removed, documents, result.scalar_one())
+
+
+class CorpusIndex:
+    """In-memory document frequencies: term -> slot dict over a count array"""
+
+    def __init__(self):
+        self.vocabulary = {}
+        self.doc_freq = np.zeros(1024, dtype=np.int32)
+        self.documents = 0
+        self.version = None  # None = not loaded or out of date
+        self._lock = asyncio.Lock()
+
+    def __len__(self) -> int:
+        return len(self.vocabulary)
+
+    async def refresh(self, db: AsyncSession):
+        """Reload from the database if another process changed the counts"""
+        result = await db.execute(select(CorpusStats.documents, CorpusStats.version).where(CorpusStats.id == 1))
+        row = result.first()
+        version = row.version if row else 0
+        if version == self.version:
+            return
+
+        async with self._lock:
+            if version == self.version:
+                return
+            result = await db.execute(select(CorpusTerm.term, CorpusTerm.doc_freq))
+            terms = result.all()
+
+            vocabulary = {}
+            doc_freq = np.zeros(max(1024, len(terms) * 2), dtype=np.int32)
+            for slot, (term, count) in enumerate(terms):
+                vocabulary[term] = slot
+                doc_freq[slot] = count
+
+            # Swap in whole objects so readers in other threads see either state
+            self.vocabulary, self.doc_freq = vocabulary, doc_freq
+            self.documents = row.documents if row else 0
+            self.version = version
+
+    def apply(self, delta: CorpusDelta):
+        """Apply a committed local change, or mark the index stale if changes were missed"""
+        if self.version is None or delta.version != self.version + 1:
+            self.version = None
+            return
+
+        for term in delta.added:
+            slot = self.vocabulary.get(term)
+            if slot is None:
+                slot = len(self.vocabulary)
+                if slot == len(self.doc_freq):
+                    self.doc_freq = np.concatenate([self.doc_freq, np.zeros_like(self.doc_freq)])
+                self.vocabulary[term] = slot
+            self.doc_freq[slot] += 1
+        for term in delta.removed:
+            slot = self.vocabulary.get(term)
+            if slot is not None and self.doc_freq[slot] > 0:
+                self.doc_freq[slot] -= 1
+                if not self.doc_freq[slot]:
+                    # Gone from the table too; the slot is reclaimed on the next reload
+                    del self.vocabulary[term]
+
+        self.documents += delta.documents
+        self.version = delta.version
+
+    def idf(self, terms: list[str]) -> Optional[np.ndarray]:
+        """
+        Smoothed corpus IDF for each term, ln((1 + N) / (1 + df)) + 1
+
+        Returns:
+            Array aligned with terms, or None while the corpus is too small
+        """
+        documents = self.documents
+        if documents < CORPUS_IDF_MIN_DOCUMENTS:
+            return None
+        vocabulary, doc_freq = self.vocabulary, self.doc_freq
+        slots = np.fromiter((vocabulary.get(t, -1) for t in terms), dtype=np.int64, count=len(terms))
+        df = np.where(slots >= 0, doc_freq[np.maximum(slots, 0)], 0)
+        return np.log((1 + documents) / (1 + df)) + 1.0
+
+    def snapshot(self, text: str) -> "CorpusSnapshot":
+        """IDF of one transcript's terms, small enough to send to a worker process"""
+        terms = document_terms(text)
+        idf = self.idf(terms)
+        if idf is None:
+            return CorpusSnapshot(None, self.documents)
+        return CorpusSnapshot(dict(zip(terms, idf.tolist())), self.documents)
+
+    def stats(self) -> dict:
+        return {
+            "documents": self.documents,
+            "terms": len(self.vocabulary),
+            "version": self.version,
+            "min_documents": CORPUS_IDF_MIN_DOCUMENTS,
+            "memory_mb": self.doc_freq.nbytes / (1024 * 1024),
+        }
+
+
+class CorpusSnapshot:
+    """Frozen corpus IDF for a fixed set of terms; usable wherever a CorpusIndex is"""
+
+    def __init__(self, idf: Optional[dict], documents: int):
+        self._idf = idf
+        self.documents = documents
+
+    def idf(self, terms: list[str]) -> Optional[np.ndarray]:
+        if self._idf is None:
+            return None
+        # Terms outside the snapshot are in no stored transcript
+        unseen = np.log(1 + self.documents) + 1.0
+        return np.array([self._idf.get(t, unseen) for t in terms])
+
+
+corpus_index = CorpusIndex()
+
+
+async def reset_stale_corpus(db: AsyncSession) -> bool:
+    """
+    Clear counts made with another tokenizer so every transcript is counted again
+
+    Returns:
+        True if the counts were cleared
+    """
+    result = await db.execute(select(CorpusStats.tokenizer).where(CorpusStats.id == 1))
+    row = result.first()
+    if row is None or row.tokenizer == TOKENIZER_VERSION:
+        return False
+
+    await db.execute(delete(CorpusTerm))
+    await db.execute(update(Meeting).values(terms_indexed=False))
+    await db.execute(
+        update(CorpusStats)
+        .where(CorpusStats.id == 1)
+        .values(documents=0, version=CorpusStats.version + 1, tokenizer=TOKENIZER_VERSION)
+    )
+    await db.commit()
+    corpus_index.version = None
+    return True
+
+
+async def backfill_corpus(batch_size: int = 50) -> int:
+    """
+    Count transcripts stored before the corpus index existed, or counted
+    with an older tokenizer
+
+    Returns:
+        Number of meetings indexed
+    """
+    indexed = 0
+    async with AsyncSessionLocal() as db:
+        await reset_stale_corpus(db)
+        while True:
+            result = await db.execute(
+                select(Meeting)
+                .options(undefer_group("transcript"))
+                .where(Meeting.has_transcript)
+                .where((Meeting.terms_indexed.is_(None)) | (Meeting.terms_indexed.is_(False)))
+                .limit(batch_size)
+            )
+            meetings = result.scalars().all()
+            if not meetings:
+                return indexed
+
+            for meeting in meetings:
+                delta = await update_corpus(db, added_text=meeting.transcript_text)
+                meeting.terms_indexed = True
+                await db.commit()
+                corpus_index.apply(delta)
+                indexed += 1
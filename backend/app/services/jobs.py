@@ -0,0 +1,422 @@
+"""Durable background job queue for long-running meeting processing
+
+Jobs live in the ``jobs`` table so any number of worker processes can share
+the work. A worker claims a job with a conditional UPDATE (so two workers can
+never claim the same row), holds it under a lease that it renews with
+heartbeats, and either completes it or releases it for a retry. Jobs whose
+lease expired because their worker died are picked up again by the next claim.
+"""
+import os
+import json
+import uuid
+from datetime import datetime, timedelta
+from typing import Optional
+from sqlalchemy import select, update, and_, or_, func
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from dotenv import load_dotenv
+
+from app.models import Job
+from app.services.transcription import transcribe_audio
+from app.services.meetings import get_meeting, store_transcription
+
+load_dotenv()
+
+# Queue settings
+JOB_LEASE_SECONDS = int(os.getenv("JOB_LEASE_SECONDS", "60"))
+JOB_MAX_ATTEMPTS = int(os.getenv("JOB_MAX_ATTEMPTS", "3"))
+JOB_RETRY_BACKOFF_SECONDS = int(os.getenv("JOB_RETRY_BACKOFF_SECONDS", "10"))
+
+# Job states
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_COMPLETED = "completed"
+JOB_FAILED = "failed"
+
+ACTIVE_STATES = (JOB_QUEUED, JOB_RUNNING)
+
+
+class JobContext:
+    """Handle passed to job handlers for reporting progress"""
+
+    def __init__(self, job: Job):
+        self.job_id = job.id
+        self.kind = job.kind
+        self.meeting_id = job.meeting_id
+        self.payload = json.loads(job.payload) if job.payload else {}
+        self.attempt = job.attempts
+        self.progress = job.progress or 0.0
+
+    def set_progress(self, progress: float):
+        """Record progress (0.0 - 1.0); it is persisted with the next heartbeat"""
+        self.progress = max(0.0, min(1.0, progress))
+
+
+# Job kind -> async handler(db, ctx) returning a JSON-serializable result
+JOB_HANDLERS = {}
+
+
+def register_handler(kind: str):
+    """Decorator registering the handler for a job kind"""
+    def decorator(func):
+        JOB_HANDLERS[kind] = func
+        return func
+    return decorator
+
+
+async def enqueue_job(
+    db: AsyncSession,
+    kind: str,
+    meeting_id: int,
+    payload: Optional[dict] = None,
+    max_attempts: Optional[int] = None
+) -> Job:
+    """
+    Queue a job, or return the job of this kind already active for the meeting
+
+    Args:
+        db: Database session
+        kind: Job type, e.g. "transcribe"
+        meeting_id: Meeting the job works on
+        payload: Optional handler arguments
+        max_attempts: Attempts before the job is marked failed
+
+    Returns:
+        The queued (or already active) job
+    """
+    existing = await find_active_job(db, kind, meeting_id)
+    if existing:
+        return existing
+
+    job = Job(
+        id=uuid.uuid4().hex,
+        kind=kind,
+        meeting_id=meeting_id,
+        state=JOB_QUEUED,
+        payload=json.dumps(payload) if payload else None,
+        max_attempts=max_attempts or JOB_MAX_ATTEMPTS,
+        available_at=datetime.utcnow()
+    )
+    db.add(job)
+
+    try:
+        await db.commit()
+    except IntegrityError:
+        # Another request queued the same job concurrently
+        await db.rollback()
+        return await find_active_job(db, kind, meeting_id)
+
+    return job
+
+
+async def enqueue_jobs(
+    db: AsyncSession,
+    kind: str,
+    meeting_ids: list[int],
+    payload: Optional[dict] = None
+) -> dict[int, tuple[Job, bool]]:
+    """
+    Queue one job per meeting in a single transaction
+
+    Meetings that already have an active job of this kind keep it. If a
+    concurrent request queues one of the same jobs first, falls back to
+    enqueue_job per meeting.
+
+    Args:
+        db: Database session
+        kind: Job type, e.g. "transcribe"
+        meeting_ids: Meetings to queue jobs for
+        payload: Optional handler arguments (shared by all jobs)
+
+    Returns:
+        dict mapping meeting id to (job, created)
+    """
+    result = await db.execute(
+        select(Job).where(
+            Job.kind == kind,
+            Job.meeting_id.in_(meeting_ids),
+            Job.state.in_(ACTIVE_STATES)
+        )
+    )
+    jobs = {job.meeting_id: (job, False) for job in result.scalars()}
+
+    now = datetime.utcnow()
+    for meeting_id in meeting_ids:
+        if meeting_id in jobs:
+            continue
+        job = Job(
+            id=uuid.uuid4().hex,
+            kind=kind,
+            meeting_id=meeting_id,
+            state=JOB_QUEUED,
+            payload=json.dumps(payload) if payload else None,
+            max_attempts=JOB_MAX_ATTEMPTS,
+            available_at=now
+        )
+        db.add(job)
+        jobs[meeting_id] = (job, True)
+
+    try:
+        await db.commit()
+    except IntegrityError:
+        await db.rollback()
+        jobs = {}
+        for meeting_id in meeting_ids:
+            existing = await find_active_job(db, kind, meeting_id)
+            job = existing or await enqueue_job(db, kind, meeting_id, payload)
+            jobs[meeting_id] = (job, existing is None)
+
+    return jobs
+
+
+async def get_job(db: AsyncSession, job_id: str) -> Optional[Job]:
+    """Get a job by id"""
+    result = await db.execute(select(Job).where(Job.id == job_id))
+    return result.scalar_one_or_none()
+
+
+async def find_active_job(db: AsyncSession, kind: str, meeting_id: int) -> Optional[Job]:
+    """Return the queued or running job of this kind for a meeting, if any"""
+    result = await db.execute(
+        select(Job).where(
+            Job.kind == kind,
+            Job.meeting_id == meeting_id,
+            Job.state.in_(ACTIVE_STATES)
+        )
+    )
+    return result.scalars().first()
+
+
+async def count_queued(db: AsyncSession) -> dict[str, int]:
+    """Number of queued jobs per kind"""
+    result = await db.execute(
+        select(Job.kind, func.count()).where(Job.state == JOB_QUEUED).group_by(Job.kind)
+    )
+    return dict(result.all())
+
+
+def _claimable(now: datetime):
+    """Condition for jobs that may be claimed right now"""
+    return or_(
+        and_(Job.state == JOB_QUEUED, Job.available_at <= now),
+        and_(
+            Job.state == JOB_RUNNING,
+            Job.lease_expires_at < now,
+            Job.attempts < Job.max_attempts
+        )
+    )
+
+
+async def claim_job(db: AsyncSession, worker_id: str, kinds: Optional[list[str]] = None) -> Optional[Job]:
+    """
+    Atomically claim the oldest available job
+
+    Queued jobs and running jobs whose lease expired are both claimable.
+
+    Args:
+        db: Database session
+        worker_id: Unique id of the claiming worker
+        kinds: Only claim these job kinds (default: all registered kinds)
+
+    Returns:
+        The claimed job, or None if nothing is available
+    """
+    now = datetime.utcnow()
+    kinds = kinds or list(JOB_HANDLERS)
+
+    # Expired leases that used up their attempts will never run again
+    await db.execute(
+        update(Job)
+        .where(
+            Job.state == JOB_RUNNING,
+            Job.lease_expires_at < now,
+            Job.attempts >= Job.max_attempts
+        )
+        .values(
+            state=JOB_FAILED,
+            error="Lease expired after final attempt",
+            lease_owner=None,
+            lease_expires_at=None,
+            finished_at=now
+        )
+        .execution_options(synchronize_session=False)
+    )
+    await db.commit()
+
+    result = await db.execute(
+        select(Job.id)
+        .where(Job.kind.in_(kinds), _claimable(now))
+        .order_by(Job.created_at)
+        .limit(5)
+    )
+    candidate_ids = result.scalars().all()
+
+    for job_id in candidate_ids:
+        # Compare-and-swap: only succeeds if the job is still claimable
+        result = await db.execute(
+            update(Job)
+            .where(Job.id == job_id, _claimable(now))
+            .values(
+                state=JOB_RUNNING,
+                lease_owner=worker_id,
+                lease_expires_at=now + timedelta(seconds=JOB_LEASE_SECONDS),
+                heartbeat_at=now,
+                attempts=Job.attempts + 1,
+                error=None,
+                started_at=now
+            )
+            .execution_options(synchronize_session=False)
+        )
+        await db.commit()
+
+        if result.rowcount == 1:
+            job = await get_job(db, job_id)
+            await db.refresh(job)
+            return job
+
+    return None
+
+
+async def heartbeat(db: AsyncSession, job_id: str, worker_id: str, progress: Optional[float] = None) -> bool:
+    """
+    Extend a job lease
+
+    Args:
+        db: Database session
+        job_id: Job ID
+        worker_id: Worker holding the lease
+        progress: Latest progress to persist
+
+    Returns:
+        False if the worker no longer owns the job
+    """
+    now = datetime.utcnow()
+    values = {
+        "lease_expires_at": now + timedelta(seconds=JOB_LEASE_SECONDS),
+        "heartbeat_at": now
+    }
+    if progress is not None:
+        values["progress"] = progress
+
+    result = await db.execute(
+        update(Job)
+        .where(Job.id == job_id, Job.lease_owner == worker_id, Job.state == JOB_RUNNING)
+        .values(**values)
+        .execution_options(synchronize_session=False)
+    )
+    await db.commit()
+    return result.rowcount == 1
+
+
+async def complete_job(db: AsyncSession, job_id: str, worker_id: str, result: Optional[dict]) -> bool:
+    """Mark a job completed; returns False if the lease was lost"""
+    outcome = await db.execute(
+        update(Job)
+        .where(Job.id == job_id, Job.lease_owner == worker_id, Job.state == JOB_RUNNING)
+        .values(
+            state=JOB_COMPLETED,
+            progress=1.0,
+            result=json.dumps(result) if result is not None else None,
+            lease_owner=None,
+            lease_expires_at=None,
+            finished_at=datetime.utcnow()
+        )
+        .execution_options(synchronize_session=False)
+    )
+    await db.commit()
+    return outcome.rowcount == 1
+
+
+async def fail_job(db: AsyncSession, job_id: str, worker_id: str, error: str) -> bool:
+    """
+    Record a failed attempt
+
+    The job is re-queued with exponential backoff until it runs out of
+    attempts, then marked failed.
+
+    Returns:
+        False if the lease was lost
+    """
+    job = await get_job(db, job_id)
+    if not job or job.lease_owner != worker_id or job.state != JOB_RUNNING:
+        return False
+
+    now = datetime.utcnow()
+    job.error = error
+    job.lease_owner = None
+    job.lease_expires_at = None
+
+    if job.attempts < job.max_attempts:
+        job.state = JOB_QUEUED
+        job.available_at = now + timedelta(
+            seconds=JOB_RETRY_BACKOFF_SECONDS * 2 ** (job.attempts - 1)
+        )
+    else:
+        job.state = JOB_FAILED
+        job.finished_at = now
+
+    await db.commit()
+    return True
+
+
+def job_timings(job: Job) -> dict:
+    """
+    Compute queue and run times for a job
+
+    Args:
+        job: Job row
+
+    Returns:
+        dict with 'wait_seconds' and 'run_seconds' (None when not applicable)
+    """
+    now = datetime.utcnow()
+    started = job.started_at
+    finished = job.finished_at
+
+    wait_seconds = ((started or now) - job.created_at).total_seconds()
+    run_seconds = ((finished or now) - started).total_seconds() if started else None
+
+    return {"wait_seconds": wait_seconds, "run_seconds": run_seconds}
+
+
+def serialize_job(job: Job) -> dict:
+    """Convert a job row into JobResponse fields"""
+    return {
+        "id": job.id,
+        "kind": job.kind,
+        "meeting_id": job.meeting_id,
+        "state": job.state,
+        "progress": job.progress or 0.0,
+        "attempts": job.attempts or 0,
+        "max_attempts": job.max_attempts,
+        "error": job.error,
+        "result": json.loads(job.result) if job.result else None,
+        "created_at": job.created_at,
+        "started_at": job.started_at,
+        "finished_at": job.finished_at,
+        **job_timings(job)
+    }
+
+
+@register_handler("transcribe")
+async def _transcription_handler(db: AsyncSession, ctx: JobContext) -> dict:
+    """Transcribe a meeting's audio and store the result on the meeting"""
+    meeting = await get_meeting(db, ctx.meeting_id)
+    if not meeting:
+        raise Exception("Meeting not found")
+
+    ctx.set_progress(0.05)
+    transcript_data = await transcribe_audio(
+        meeting.audio_path,
+        progress=lambda done: ctx.set_progress(0.05 + 0.85 * done),
+        model_name=ctx.payload.get("model"),
+        audio_hash=meeting.audio_hash
+    )
+    ctx.set_progress(0.9)
+
+    cleaned_transcript = await store_transcription(db, meeting, transcript_data)
+
+    return {
+        "duration": transcript_data.get("duration"),
+        "transcript_chars": len(cleaned_transcript)
+    }
@@ -0,0 +1,144 @@
+"""Per-language (and per-team) phrase lists used by cleaning and summarization
+
+Each lexicon kind ('fillers', 'key_points', 'action_items') has built-in
+lists for a few languages. JSON files in LEXICON_DIR refine them in layers:
+
+    LEXICON_DIR/<lang>.json             language-wide
+    LEXICON_DIR/<profile>/<lang>.json   one team's vocabulary (profile)
+
+    {"key_points": {"go/no-go": 2.0, "sign-off": 1.5}, "action_items": ["ticket"], "extend": true}
+
+Entries are a list of phrases (weight 1.0) or a phrase -> weight mapping.
+Without ``"extend": true`` a file replaces the lists below it. Files are
+re-read when they change.
+"""
+import os
+import re
+import json
+from functools import lru_cache
+from pathlib import Path
+from typing import Optional
+from dotenv import load_dotenv
+
+load_dotenv()
+
+LEXICON_DIR = os.getenv("LEXICON_DIR", "../data/lexicons")
+DEFAULT_LANGUAGE = os.getenv("DEFAULT_LANGUAGE", "en")
+LEXICON_PROFILE = os.getenv("LEXICON_PROFILE") or None
+
+LEXICON_KINDS = ["fillers", "key_points", "action_items"]
+
+BUILTIN_LEXICONS = {
+    "fillers": {
+        "en": ["um", "uh", "like", "you know", "so", "basically", "actually"],
+        "es": ["eh", "em", "este", "o sea", "pues", "bueno", "sabes"],
+        "fr": ["euh", "ben", "bah", "genre", "en fait", "du coup", "tu vois"],
+        "de": ["äh", "ähm", "halt", "also", "sozusagen", "eigentlich", "weißt du"],
+        "pt": ["hum", "tipo", "então", "né", "sabe"],
+        "it": ["ehm", "cioè", "allora", "tipo", "insomma", "praticamente"],
+    },
+    "key_points": {
+        "en": ["important", "key", "main", "significant", "critical", "essential",
+               "decided", "agreed", "concluded", "discussed"],
+    },
+    "action_items": {
+        "en": ["will", "should", "need to", "must", "have to", "going to",
+               "plan to", "follow up", "schedule", "assign", "complete"],
+    },
+}
+
+PROFILE_PATTERN = re.compile(r'[A-Za-z0-9_-]+')
+
+
+class LexiconError(Exception):
+    """Raised for unknown lexicon kinds, bad profile names or unreadable files"""
+
+
+def normalize_language(language: str = None) -> str:
+    """Lower-case ISO code without region ('en-US' -> 'en'), or the default"""
+    if not language:
+        return DEFAULT_LANGUAGE
+    return language.lower().replace("_", "-").split("-")[0]
+
+
+def _lexicon_files(language: str, profile: Optional[str]) -> list[Path]:
+    """Override files for a language, lowest layer first"""
+    if profile and not PROFILE_PATTERN.fullmatch(profile):
+        raise LexiconError(f"Invalid lexicon profile '{profile}'")
+    files = [Path(LEXICON_DIR) / f"{language}.json"]
+    if profile:
+        files.append(Path(LEXICON_DIR) / profile / f"{language}.json")
+    return files
+
+
+def lexicon_version(language: str = None, profile: Optional[str] = None) -> tuple:
+    """Modification times of the override files; changes when any file does"""
+    profile = profile or LEXICON_PROFILE
+    version = []
+    for path in _lexicon_files(normalize_language(language), profile):
+        try:
+            version.append(path.stat().st_mtime_ns)
+        except OSError:
+            version.append(None)
+    return tuple(version)
+
+
+@lru_cache(maxsize=128)
+def _read_file(path: str, mtime: int) -> dict:
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError) as e:
+        raise LexiconError(f"Cannot read lexicon {path}: {e}")
+
+
+def _as_weights(entries) -> dict[str, float]:
+    if isinstance(entries, dict):
+        return {str(phrase): float(weight) for phrase, weight in entries.items()}
+    return {str(phrase): 1.0 for phrase in entries}
+
+
+@lru_cache(maxsize=128)
+def _load_lexicon(kind: str, language: str, profile: Optional[str], version: tuple) -> tuple[tuple[str, float], ...]:
+    phrases = _as_weights(BUILTIN_LEXICONS[kind].get(language, []))
+
+    for path, mtime in zip(_lexicon_files(language, profile), version):
+        if mtime is None:
+            continue
+        data = _read_file(str(path), mtime)
+        if kind not in data:
+            continue
+        overrides = _as_weights(data[kind])
+        phrases = {**phrases, **overrides} if data.get("extend") else overrides
+
+    # Normalize case and spacing; later layers win on duplicates
+    normalized = {}
+    for phrase, weight in phrases.items():
+        phrase = " ".join(phrase.lower().split())
+        if phrase and weight > 0:
+            normalized[phrase] = weight
+    return tuple(normalized.items())
+
+
+def load_lexicon(kind: str, language: str = None, profile: Optional[str] = None) -> dict[str, float]:
+    """
+    Phrases of one lexicon kind with their weights
+
+    Args:
+        kind: One of LEXICON_KINDS
+        language: ISO language code (default: DEFAULT_LANGUAGE)
+        profile: Team lexicon profile (default: LEXICON_PROFILE)
+
+    Returns:
+        dict mapping lower-case phrase to weight (empty if none are defined)
+    """
+    if kind not in LEXICON_KINDS:
+        raise LexiconError(f"Unknown lexicon kind '{kind}'")
+    language = normalize_language(language)
+    profile = profile or LEXICON_PROFILE
+    return dict(_load_lexicon(kind, language, profile, lexicon_version(language, profile)))
+
+
+def get_fillers(language: str = None) -> tuple[str, ...]:
+    """Filler words and phrases for a language"""
+    return tuple(load_lexicon("fillers", language))
@@ -0,0 +1,236 @@
+"""Meeting persistence helpers shared by the API and background jobs"""
+import base64
+import asyncio
+import aiofiles.os
+from datetime import datetime
+from typing import Optional
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, tuple_, inspect
+from sqlalchemy.orm import load_only, undefer_group
+
+from app.models import Meeting
+from app.services.nlp import clean_transcript, clean_segments, segments_text
+from app.services.audio import remove_decoded_audio
+from app.services.corpus import update_corpus, corpus_index
+from app.services.segments import replace_segments, delete_segments
+from app.services.summary_cache import summary_cache
+from app.services.sections import delete_sections
+from app.metrics import stage_timer
+
+TRANSCRIPT_COLUMNS = {"_transcript_text", "transcript_blob"}
+
+
+async def get_meeting(db: AsyncSession, meeting_id: int, with_transcript: bool = False):
+    """
+    Load a meeting by id
+
+    Args:
+        db: Database session
+        meeting_id: Meeting ID
+        with_transcript: Also load the transcript (otherwise loaded on demand
+            with load_transcript)
+
+    Returns:
+        Meeting instance or None if it does not exist
+    """
+    query = select(Meeting).where(Meeting.id == meeting_id)
+    if with_transcript:
+        query = query.options(undefer_group("transcript"))
+    result = await db.execute(query)
+    return result.scalar_one_or_none()
+
+
+async def load_transcript(db: AsyncSession, meeting: Meeting) -> Optional[str]:
+    """
+    Transcript text of a meeting, loading (and decompressing) it on first use
+
+    Args:
+        db: Database session
+        meeting: Meeting instance
+
+    Returns:
+        Transcript text or None if not transcribed
+    """
+    unloaded = inspect(meeting).unloaded & TRANSCRIPT_COLUMNS
+    if unloaded:
+        await db.refresh(meeting, attribute_names=sorted(unloaded))
+    return meeting.transcript_text
+
+
+class InvalidCursor(Exception):
+    """Raised for malformed pagination cursors"""
+
+
+def encode_cursor(created_at: datetime, meeting_id: int) -> str:
+    """Opaque cursor pointing just after a list row"""
+    raw = f"{created_at.isoformat()}|{meeting_id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, int]:
+    """(created_at, id) of the row a cursor points after; InvalidCursor if malformed"""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        created_at, meeting_id = raw.split("|")
+        return datetime.fromisoformat(created_at), int(meeting_id)
+    except (ValueError, UnicodeDecodeError):
+        raise InvalidCursor(cursor)
+
+
+async def list_meetings(db: AsyncSession, limit: int = 20, cursor: Optional[str] = None) -> dict:
+    """
+    One page of the meeting list, newest first
+
+    Only the list columns are loaded; transcript and summary text stay in
+    the database. Pages are keyed on (created_at, id), so every page is an
+    index range scan however deep it is.
+
+    Args:
+        db: Database session
+        limit: Page size
+        cursor: next_cursor of the previous page
+
+    Returns:
+        dict with 'items' (list row dicts) and 'next_cursor' (None on the last page)
+    """
+    query = (
+        select(
+            Meeting,
+            Meeting.has_transcript.label("transcribed"),
+            Meeting.summary.is_not(None).label("summarized"),
+        )
+        .options(load_only(
+            Meeting.id, Meeting.title, Meeting.date, Meeting.duration, Meeting.language, Meeting.created_at
+        ))
+        .order_by(Meeting.created_at.desc(), Meeting.id.desc())
+        .limit(limit + 1)
+    )
+    if cursor:
+        query = query.where(tuple_(Meeting.created_at, Meeting.id) < tuple_(*decode_cursor(cursor)))
+
+    rows = (await db.execute(query)).all()
+    items = [
+        {
+            "id": meeting.id,
+            "title": meeting.title,
+            "date": meeting.date,
+            "duration": meeting.duration,
+            "language": meeting.language,
+            "transcribed": bool(transcribed),
+            "summarized": bool(summarized),
+            "created_at": meeting.created_at,
+        }
+        for meeting, transcribed, summarized in rows[:limit]
+    ]
+
+    next_cursor = None
+    if len(rows) > limit:
+        last = items[-1]
+        next_cursor = encode_cursor(last["created_at"], last["id"])
+
+    return {"items": items, "next_cursor": next_cursor}
+
+
+async def store_transcription(db: AsyncSession, meeting: Meeting, transcript_data: dict) -> str:
+    """
+    Clean a raw transcription result and persist it on the meeting
+
+    Args:
+        db: Database session
+        meeting: Meeting being transcribed
+        transcript_data: Result of transcribe_audio
+
+    Returns:
+        Cleaned transcript text
+    """
+    # Clean transcript; segments keep their timestamps and make up the text
+    language = transcript_data.get("language")
+    segments = transcript_data.get("segments")
+    with stage_timer("store", "clean"):
+        if segments:
+            cleaned_segments = clean_segments(segments, language)
+            cleaned_transcript = segments_text(cleaned_segments)
+        else:
+            cleaned_segments = []
+            cleaned_transcript = clean_transcript(transcript_data["text"], language)
+
+    # The database holds the only copy of a transcript (plain or compressed,
+    # see TRANSCRIPT_COMPRESSION); a .txt copy left by older versions is removed
+    stale_path = meeting.transcript_path
+
+    with stage_timer("store", "index"):
+        # Count the new transcript in the corpus (and the replaced one out)
+        previous_transcript = await load_transcript(db, meeting)
+        delta = await update_corpus(
+            db, added_text=cleaned_transcript, removed_text=previous_transcript if meeting.terms_indexed else None
+        )
+        
+        # Summaries of the replaced transcript can no longer be asked for
+        if previous_transcript and previous_transcript != cleaned_transcript:
+            await summary_cache.forget(db, previous_transcript)
+        
+        # Replace the stored segments (and with them the segment search index)
+        await replace_segments(db, meeting.id, cleaned_segments)
+        await delete_sections(db, meeting.id)
+    
+    # Update meeting record
+    meeting.transcript_text = cleaned_transcript
+    meeting.terms_indexed = True
+    meeting.transcript_path = None
+    meeting.duration = transcript_data.get("duration") or meeting.duration
+    meeting.language = language or meeting.language
+
+    with stage_timer("store", "commit"):
+        await db.commit()
+    corpus_index.apply(delta)
+
+    if stale_path and await aiofiles.os.path.exists(stale_path):
+        await aiofiles.os.remove(stale_path)
+
+    return cleaned_transcript
+
+
+async def delete_meeting_artifacts(meeting: Meeting) -> dict:
+    """
+    Remove derived files that belong to a meeting being deleted
+
+    Args:
+        meeting: Meeting being deleted
+
+    Returns:
+        dict with the number of bytes freed
+    """
+    freed = 0
+    if meeting.audio_path:
+        freed += await asyncio.get_event_loop().run_in_executor(None, remove_decoded_audio, meeting.audio_path)
+    return {"freed_bytes": freed}
+
+
+async def delete_meeting(db: AsyncSession, meeting: Meeting) -> dict:
+    """
+    Delete a meeting, its segments, derived files and corpus counts
+
+    Args:
+        db: Database session
+        meeting: Meeting to delete
+
+    Returns:
+        dict with the number of bytes freed
+    """
+    freed = await delete_meeting_artifacts(meeting)
+
+    transcript = await load_transcript(db, meeting)
+    delta = None
+    if meeting.terms_indexed:
+        delta = await update_corpus(db, removed_text=transcript)
+    if transcript:
+        await summary_cache.forget(db, transcript)
+
+    await delete_segments(db, meeting.id)
+    await delete_sections(db, meeting.id)
+    await db.delete(meeting)
+    await db.commit()
+    if delta:
+        corpus_index.apply(delta)
+
+    return freed
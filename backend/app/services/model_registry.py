@@ -0,0 +1,145 @@
+"""Lazily loaded Whisper models with LRU eviction under a memory budget"""
+import os
+import time
+import threading
+from collections import OrderedDict
+from datetime import datetime
+from typing import Optional
+
+from app.metrics import MODEL_LOAD_SECONDS
+
+
+def _model_bytes(model) -> int:
+    """Size of a model's parameters and buffers in bytes"""
+    tensors = list(model.parameters()) + list(model.buffers())
+    return sum(t.numel() * t.element_size() for t in tensors)
+
+
+def process_rss_bytes() -> Optional[int]:
+    """Current resident set size of this process, where the OS exposes it"""
+    try:
+        with open("/proc/self/statm") as f:
+            resident_pages = int(f.read().split()[1])
+        return resident_pages * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+class ModelRegistry:
+    """
+    Whisper models keyed by size name, loaded on first use
+
+    Several models can be resident at once. When the total model size exceeds
+    the memory budget, the least recently used models are evicted (the model
+    that was just requested is always kept).
+    """
+
+    def __init__(self, device: str, memory_budget_mb: float, allowed_models: Optional[list[str]] = None):
+        self.device = device
+        self.memory_budget_bytes = int(memory_budget_mb * 1024 * 1024)
+        self.allowed_models = allowed_models
+        self._models = OrderedDict()  # name -> entry dict, least recently used first
+        self._lock = threading.Lock()
+        self._load_locks = {}
+        self.loads = 0
+        self.evictions = 0
+
+    def get(self, name: str):
+        """
+        Return the model, loading it if it is not resident
+
+        Args:
+            name: Whisper model name, e.g. "base"
+
+        Returns:
+            Loaded Whisper model
+        """
+        if self.allowed_models and name not in self.allowed_models:
+            raise ValueError(f"Model '{name}' is not enabled. Allowed: {', '.join(self.allowed_models)}")
+
+        with self._lock:
+            entry = self._touch(name)
+            if entry:
+                return entry["model"]
+            load_lock = self._load_locks.setdefault(name, threading.Lock())
+
+        # Only one thread loads a given model; others wait for it
+        with load_lock:
+            with self._lock:
+                entry = self._touch(name)
+                if entry:
+                    return entry["model"]
+
+            import whisper
+
+            print(f"Loading Whisper model '{name}' on {self.device}...")
+            started = time.perf_counter()
+            model = whisper.load_model(name, device=self.device)
+            load_seconds = time.perf_counter() - started
+            MODEL_LOAD_SECONDS.labels(name).observe(load_seconds)
+            print(f"✅ Whisper model '{name}' loaded in {load_seconds:.1f}s")
+
+            with self._lock:
+                self._models[name] = {
+                    "model": model,
+                    "bytes": _model_bytes(model),
+                    "load_seconds": load_seconds,
+                    "loaded_at": datetime.utcnow(),
+                    "last_used": datetime.utcnow(),
+                    "uses": 1,
+                }
+                self.loads += 1
+                self._evict(keep=name)
+
+            return model
+
+    def _touch(self, name: str) -> Optional[dict]:
+        """Mark a resident model as most recently used (lock held)"""
+        entry = self._models.get(name)
+        if entry:
+            self._models.move_to_end(name)
+            entry["last_used"] = datetime.utcnow()
+            entry["uses"] += 1
+        return entry
+
+    def _evict(self, keep: str):
+        """Drop least recently used models until within budget (lock held)"""
+        while self.resident_bytes() > self.memory_budget_bytes:
+            victim = next((n for n in self._models if n != keep), None)
+            if victim is None:
+                break
+            del self._models[victim]
+            self.evictions += 1
+            print(f"♻️ Evicted Whisper model '{victim}' to stay within the memory budget")
+
+    def resident_bytes(self) -> int:
+        """Total size of resident models"""
+        return sum(entry["bytes"] for entry in self._models.values())
+
+    def stats(self) -> dict:
+        """Loaded models, cold-start times and memory usage"""
+        with self._lock:
+            models = [
+                {
+                    "name": name,
+                    "size_mb": entry["bytes"] / (1024 * 1024),
+                    "load_seconds": entry["load_seconds"],
+                    "loaded_at": entry["loaded_at"],
+                    "last_used": entry["last_used"],
+                    "uses": entry["uses"],
+                }
+                for name, entry in reversed(self._models.items())
+            ]
+            resident = self.resident_bytes()
+
+        rss = process_rss_bytes()
+        return {
+            "device": self.device,
+            "allowed_models": self.allowed_models,
+            "memory_budget_mb": self.memory_budget_bytes / (1024 * 1024),
+            "resident_mb": resident / (1024 * 1024),
+            "process_rss_mb": rss / (1024 * 1024) if rss is not None else None,
+            "loads": self.loads,
+            "evictions": self.evictions,
+            "models": models,
+        }
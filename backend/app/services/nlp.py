@@ -2,61 +2,161 @@
 import os
 import re
 import asyncio
-from collections import Counter
+from functools import lru_cache
 from dotenv import load_dotenv
 
+from app.services.lexicons import get_fillers, normalize_language, lexicon_version, LexiconError
+from app.services.phrase_matcher import get_matcher, group_by_span
+from app.profiling import profiled
+
 load_dotenv()
 
+# Summarization method: heuristic (first/middle/last), tfidf or textrank
+SUMMARIZER = os.getenv("SUMMARIZER", "heuristic")
+SUMMARIZERS = ["heuristic", "tfidf", "textrank"]
+# Bump a method's version when its output changes; cached summaries of older versions are ignored
+SUMMARIZER_VERSIONS = {"heuristic": 1, "tfidf": 2, "textrank": 2}
+
+STOP_WORDS = {'the', 'is', 'at', 'which', 'on', 'a', 'an', 'and', 'or', 'but', 'in', 'with', 'to', 'for', 'of', 'as', 'by', 'from'}
+MAX_LIST_ITEMS = 5
+
+
+def _filler_alternation(language: str = None) -> str:
+    """Regex alternation of a language's fillers, longest first"""
+    alternatives = sorted(
+        (re.escape(filler) for filler in get_fillers(language)),
+        key=len, reverse=True
+    )
+    return '|'.join(alternatives)
+
+
+@lru_cache(maxsize=32)
+def _compiled_cleaner(language: str, version: tuple):
+    """
+    Cleaning function for a language, built once and reused
+    
+    A single case-insensitive pattern matches runs of whitespace and fillers,
+    so cleaning is one left-to-right pass however long the lexicon is. A
+    lone space between two ordinary words is excluded by the lookahead, so
+    the replacement callback only runs where the text actually changes.
+    """
+    fillers = _filler_alternation(language)
+    if fillers:
+        filler = re.compile(r'\b(?:' + fillers + r')\b', re.IGNORECASE)
+        pattern = re.compile(
+            r'(?!(?<=[\s\S]) (?![\s.,!?]|$|(?:' + fillers + r')\b))(?:\s|\b(?:' + fillers + r')\b)+',
+            re.IGNORECASE
+        )
+    else:
+        filler = None
+        pattern = re.compile(r'(?!(?<=[\s\S]) (?![\s.,!?]|$))\s+')
+    
+    def replace(match: re.Match) -> str:
+        # Drop the run at either end of the text and before punctuation,
+        # otherwise collapse it to one space if it separated two words
+        text = match.string
+        start, end = match.span()
+        if start == 0 or end == len(text) or text[end] in '.,!?':
+            return ''
+        run = filler.sub('', match.group()) if filler else match.group()
+        return ' ' if run and not run.strip() else ''
+    
+    return lambda text: pattern.sub(replace, text)
+
 
-def clean_transcript(text: str) -> str:
+def clean_transcript(text: str, language: str = None) -> str:
     """
     Clean transcript by removing filler words and fixing formatting
     
     Args:
         text: Raw transcript text
+        language: Transcript language, selects the filler lexicon (default: DEFAULT_LANGUAGE)
         
     Returns:
         Cleaned transcript text
     """
-    # Remove common filler words
-    filler_words = [
-        r'\bum\b', r'\buh\b', r'\blike\b', r'\byou know\b', 
-        r'\bso\b', r'\bbasically\b', r'\bactually\b'
-    ]
-    
-    cleaned = text
-    for filler in filler_words:
-        cleaned = re.sub(filler, '', cleaned, flags=re.IGNORECASE)
-    
-    # Remove extra spaces
-    cleaned = re.sub(r'\s+', ' ', cleaned)
-    
-    # Fix spacing around punctuation
-    cleaned = re.sub(r'\s+([.,!?])', r'\1', cleaned)
+    language = normalize_language(language)
+    return _compiled_cleaner(language, lexicon_version(language))(text)
+
+
+def clean_segments(segments: list[dict], language: str = None) -> list[dict]:
+    """
+    Clean each transcript segment, keeping its start and end times
     
-    return cleaned.strip()
+    Args:
+        segments: Segments with 'start', 'end' and 'text'
+        language: Transcript language (default: DEFAULT_LANGUAGE)
+        
+    Returns:
+        Cleaned segments; segments that were only fillers are dropped
+    """
+    language = normalize_language(language)
+    cleaner = _compiled_cleaner(language, lexicon_version(language))
+    cleaned = []
+    for segment in segments:
+        text = cleaner(segment["text"])
+        if text:
+            cleaned.append({**segment, "text": text})
+    return cleaned
+
 
+def segments_text(segments: list[dict]) -> str:
+    """Join cleaned segment texts into one transcript"""
+    parts = []
+    for segment in segments:
+        text = segment["text"]
+        if parts and text[0] not in '.,!?':
+            parts.append(' ')
+        parts.append(text)
+    return ''.join(parts)
 
-async def generate_summary(transcript: str) -> dict:
+
+async def generate_summary(
+    transcript: str,
+    method: str = None,
+    language: str = None,
+    profile: str = None,
+    corpus=None,
+    executor=None
+) -> dict:
     """
     Generate meeting summary using extractive summarization
     
     Args:
         transcript: Meeting transcript text
+        method: One of SUMMARIZERS (default: SUMMARIZER setting)
+        language: Transcript language, selects the cue-phrase lexicons
+        profile: Team lexicon profile (default: LEXICON_PROFILE)
+        corpus: CorpusIndex giving corpus-wide IDF to the tfidf and textrank methods
+        executor: Executor to run in (default: the event loop's)
         
     Returns:
         dict with 'summary', 'key_points', and 'action_items'
     """
+    method = method or SUMMARIZER
+    if method not in SUMMARIZERS:
+        raise ValueError(f"Unknown summarizer '{method}'. Available: {', '.join(SUMMARIZERS)}")
+    
     try:
         loop = asyncio.get_event_loop()
-        result = await loop.run_in_executor(None, _generate_summary_sync, transcript)
+        if method == "heuristic":
+            result = await loop.run_in_executor(
+                executor, profiled(_generate_summary_sync, executor), transcript, language, profile
+            )
+        else:
+            from app.services.summarizer import summarize
+            result = await loop.run_in_executor(
+                executor, profiled(summarize, executor), transcript, method, language, profile, corpus
+            )
         return result
     
+    except LexiconError:
+        raise
     except Exception as e:
         raise Exception(f"Summarization failed: {str(e)}")
 
 
-def _generate_summary_sync(transcript: str) -> dict:
+def _generate_summary_sync(transcript: str, language: str = None, profile: str = None) -> dict:
     """Synchronous summarization helper using extractive method"""
     
     # Split into sentences
@@ -70,8 +170,7 @@ def _generate_summary_sync(transcript: str) -> dict:
             "action_items": ["No action items found"]
         }
     
-    # Extract top sentences for summary (first, middle, last significant sentences)
-    num_sentences = min(5, len(sentences))
+    # First, middle and last significant sentences
     summary_sentences = []
     
     if len(sentences) > 0:
@@ -81,32 +180,13 @@ def _generate_summary_sync(transcript: str) -> dict:
     if len(sentences) > 1:
         summary_sentences.append(sentences[-1])  # Last
     
-    # Score remaining sentences by word frequency
-    words = ' '.join(sentences).lower().split()
-    word_freq = Counter(words)
-    
-    # Remove common words
-    stop_words = {'the', 'is', 'at', 'which', 'on', 'a', 'an', 'and', 'or', 'but', 'in', 'with', 'to', 'for', 'of', 'as', 'by', 'from'}
-    for word in stop_words:
-        word_freq.pop(word, None)
-    
-    # Get most important sentences based on word frequency
-    sentence_scores = []
-    for sentence in sentences:
-        score = sum(word_freq.get(word.lower(), 0) for word in sentence.split())
-        sentence_scores.append((score, sentence))
-    
-    # Sort and get top sentences
-    sentence_scores.sort(reverse=True)
-    top_sentences = [s[1] for s in sentence_scores[:num_sentences]]
-    
     full_summary = '. '.join(summary_sentences[:3]) + '.'
     
     # Extract key points (sentences with keywords)
-    key_points = _extract_key_points(transcript)
+    key_points = _extract_key_points(transcript, language, profile)
     
     # Extract action items (sentences with action verbs)
-    action_items = _extract_action_items(transcript)
+    action_items = _extract_action_items(transcript, language, profile)
     
     return {
         "summary": full_summary,
@@ -115,35 +195,34 @@ def _generate_summary_sync(transcript: str) -> dict:
     }
 
 
-def _extract_key_points(text: str) -> list[str]:
-    """Extract key points from text"""
-    sentences = re.split(r'[.!?]+', text)
-    keywords = ['important', 'key', 'main', 'significant', 'critical', 'essential', 
-                'decided', 'agreed', 'concluded', 'discussed']
-    
-    key_points = []
-    for sentence in sentences:
-        sentence = sentence.strip()
-        if any(keyword in sentence.lower() for keyword in keywords) and len(sentence.split()) > 5:
-            key_points.append(sentence)
-            if len(key_points) >= 5:  # Limit to top 5
-                break
+def _extract_cue_sentences(text: str, kind: str, language: str = None, profile: str = None) -> list[str]:
+    """
+    Sentences containing the most (weighted) lexicon phrases
+    
+    The transcript is scanned once by the lexicon's phrase matcher and the
+    hits are assigned to sentences. Sentences are ranked by the total weight
+    of the distinct phrases they contain, earlier sentences first on ties,
+    and the best are returned in transcript order.
+    """
+    spans = [m.span() for m in re.finditer(r'[^.!?]+', text) if len(m.group().split()) > 5]
+    starts = [start for start, _ in spans]
+    ends = [end for _, end in spans]
+    grouped = group_by_span(get_matcher(kind, language, profile).find(text), starts, ends)
+    
+    def weight(i: int) -> float:
+        return sum({hit.phrase: hit.weight for hit in grouped[i]}.values())
     
+    best = sorted(grouped, key=lambda i: (-weight(i), i))[:MAX_LIST_ITEMS]
+    return [text[starts[i]:ends[i]].strip() for i in sorted(best)]
+
+
+def _extract_key_points(text: str, language: str = None, profile: str = None) -> list[str]:
+    """Extract key points from text"""
+    key_points = _extract_cue_sentences(text, "key_points", language, profile)
     return key_points if key_points else ["No specific key points identified"]
 
 
-def _extract_action_items(text: str) -> list[str]:
+def _extract_action_items(text: str, language: str = None, profile: str = None) -> list[str]:
     """Extract action items from text"""
-    sentences = re.split(r'[.!?]+', text)
-    action_verbs = ['will', 'should', 'need to', 'must', 'have to', 'going to',
-                   'plan to', 'follow up', 'schedule', 'assign', 'complete']
-    
-    action_items = []
-    for sentence in sentences:
-        sentence = sentence.strip()
-        if any(verb in sentence.lower() for verb in action_verbs) and len(sentence.split()) > 5:
-            action_items.append(sentence)
-            if len(action_items) >= 5:  # Limit to top 5
-                break
-    
+    action_items = _extract_cue_sentences(text, "action_items", language, profile)
     return action_items if action_items else ["No specific action items identified"]
@@ -0,0 +1,156 @@
+"""Multi-phrase matching (Aho-Corasick over words)
+
+A lexicon of any size is compiled once into a word-level Aho-Corasick
+automaton. Scanning a transcript is then a single pass over its words,
+independent of the number of phrases, and every hit carries its phrase and
+character span. Matching is on whole words and case-insensitive.
+"""
+import re
+from bisect import bisect_right
+from collections import deque
+from functools import lru_cache
+from typing import NamedTuple, Optional
+
+from app.services.lexicons import load_lexicon, lexicon_version, normalize_language, LEXICON_PROFILE
+
+WORD_PATTERN = re.compile(r"\w+(?:'\w+)*")
+
+
+class PhraseHit(NamedTuple):
+    """One occurrence of a lexicon phrase"""
+    phrase: str
+    weight: float
+    start: int  # character offsets in the scanned text
+    end: int
+
+
+class PhraseMatcher:
+    """Aho-Corasick automaton whose alphabet is lower-cased words"""
+
+    def __init__(self, phrases: dict[str, float]):
+        self.phrases = []  # (phrase, weight, length in words)
+        self._goto = [{}]
+        self._fail = [0]
+        self._output = [()]
+
+        for phrase, weight in phrases.items():
+            words = [w.lower() for w in WORD_PATTERN.findall(phrase)]
+            if not words:
+                continue
+            node = 0
+            for word in words:
+                child = self._goto[node].get(word)
+                if child is None:
+                    child = len(self._goto)
+                    self._goto[node][word] = child
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._output.append(())
+                node = child
+            self._output[node] += (len(self.phrases),)
+            self.phrases.append((phrase, weight, len(words)))
+
+        # Breadth-first: a node's failure target is always shallower, so its
+        # outputs are final by the time they are inherited
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for word, child in self._goto[node].items():
+                queue.append(child)
+                fallback = self._fail[node]
+                while fallback and word not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[child] = self._goto[fallback].get(word, 0)
+                self._output[child] += self._output[self._fail[child]]
+
+    def __len__(self) -> int:
+        return len(self.phrases)
+
+    def find(self, text: str) -> list[PhraseHit]:
+        """
+        All phrase occurrences in the text, including overlapping ones
+
+        Args:
+            text: Text to scan
+
+        Returns:
+            Hits ordered by end position
+        """
+        if not self.phrases:
+            return []
+
+        goto, fail, output, phrases = self._goto, self._fail, self._output, self.phrases
+        word_starts = []
+        hits = []
+        node = 0
+
+        for match in WORD_PATTERN.finditer(text):
+            word = match.group().lower()
+            word_starts.append(match.start())
+            while node and word not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(word, 0)
+
+            for phrase_id in output[node]:
+                phrase, weight, length = phrases[phrase_id]
+                hits.append(PhraseHit(phrase, weight, word_starts[-length], match.end()))
+
+        return hits
+
+
+@lru_cache(maxsize=64)
+def _cached_matcher(kind: str, language: str, profile: Optional[str], version: tuple) -> PhraseMatcher:
+    return PhraseMatcher(load_lexicon(kind, language, profile))
+
+
+def get_matcher(kind: str, language: str = None, profile: Optional[str] = None) -> PhraseMatcher:
+    """
+    Compiled matcher for a lexicon, rebuilt only when its files change
+
+    Args:
+        kind: Lexicon kind ('key_points', 'action_items' or 'fillers')
+        language: ISO language code (default: DEFAULT_LANGUAGE)
+        profile: Team lexicon profile (default: LEXICON_PROFILE)
+    """
+    language = normalize_language(language)
+    profile = profile or LEXICON_PROFILE
+    return _cached_matcher(kind, language, profile, lexicon_version(language, profile))
+
+
+def group_by_span(hits: list[PhraseHit], starts: list[int], ends: list[int]) -> dict[int, list[PhraseHit]]:
+    """
+    Assign hits to the spans (e.g. sentences) containing them
+
+    Args:
+        hits: Phrase hits
+        starts: Sorted span start offsets
+        ends: Span end offsets
+
+    Returns:
+        dict mapping span number to its hits; hits outside every span are dropped
+    """
+    grouped = {}
+    for hit in hits:
+        span = bisect_right(starts, hit.start) - 1
+        if span >= 0 and hit.end <= ends[span]:
+            grouped.setdefault(span, []).append(hit)
+    return grouped
+
+
+def rank_phrases(hits: list[PhraseHit]) -> list[dict]:
+    """
+    Summarize hits per phrase, strongest first
+
+    Returns:
+        List of dicts with 'phrase', 'weight', 'count', 'score' and 'positions'
+        ([start, end] character offsets); score is weight x count
+    """
+    ranked = {}
+    for hit in hits:
+        entry = ranked.setdefault(hit.phrase, {"phrase": hit.phrase, "weight": hit.weight, "count": 0, "positions": []})
+        entry["count"] += 1
+        entry["positions"].append([hit.start, hit.end])
+
+    for entry in ranked.values():
+        entry["score"] = entry["weight"] * entry["count"]
+    return sorted(ranked.values(), key=lambda e: (-e["score"], e["positions"][0][0]))
@@ -0,0 +1,277 @@
+"""In-process pipeline: decode -> transcribe -> summarize
+
+Each stage has its own workers and a bounded queue in front of it, so
+stages overlap across meetings: while Whisper transcribes meeting N, the
+decode stage is already decoding meeting N+1 into the PCM cache (which
+transcription then reads without decoding again), and summaries run on a
+small pool of their own. A full queue makes the stage before it wait, and
+a full decode queue makes new submissions wait (backpressure) up to
+PIPELINE_SUBMIT_TIMEOUT. With DECODED_AUDIO_CACHE off there is nothing to
+decode ahead, so the decode stage only reads the duration from the
+container headers.
+
+Items are tracked in memory with per-stage queue wait and run times;
+the last PIPELINE_HISTORY finished items are kept for status polling.
+"""
+import os
+import time
+import uuid
+import asyncio
+from collections import OrderedDict
+from typing import Optional
+from sqlalchemy.ext.asyncio import AsyncSession
+from dotenv import load_dotenv
+
+from app.database import AsyncSessionLocal
+from app.services.audio import decode_audio, audio_duration, DECODED_AUDIO_CACHE
+from app.services.probe import probe_audio
+from app.services.transcription import transcribe_audio
+from app.services.meetings import get_meeting, store_transcription
+from app.services.sections import summarize_meeting_text
+from app.services.corpus import corpus_index
+from app.services.jobs import find_active_job
+from app.metrics import InstrumentedThreadPool, QUEUE_DEPTH, QUEUE_WAIT_SECONDS, STAGE_SECONDS
+
+load_dotenv()
+
+PIPELINE_QUEUE_SIZE = int(os.getenv("PIPELINE_QUEUE_SIZE", "4"))  # items waiting per stage
+PIPELINE_DECODE_WORKERS = int(os.getenv("PIPELINE_DECODE_WORKERS", "1"))
+PIPELINE_TRANSCRIBE_WORKERS = int(os.getenv("PIPELINE_TRANSCRIBE_WORKERS", "1"))
+PIPELINE_SUMMARY_WORKERS = int(os.getenv("PIPELINE_SUMMARY_WORKERS", "2"))
+PIPELINE_SUBMIT_TIMEOUT = float(os.getenv("PIPELINE_SUBMIT_TIMEOUT", "30"))
+PIPELINE_HISTORY = 200
+
+STAGES = ["decode", "transcribe", "summarize"]
+
+ITEM_QUEUED = "queued"
+ITEM_RUNNING = "running"
+ITEM_COMPLETED = "completed"
+ITEM_FAILED = "failed"
+
+
+class PipelineFull(Exception):
+    """Raised when the first stage stays full for PIPELINE_SUBMIT_TIMEOUT"""
+
+
+class PipelineItem:
+    """One meeting going through the pipeline"""
+
+    def __init__(self, meeting_id: int, audio_path: str, audio_hash: Optional[str],
+                 model_name: Optional[str], method: Optional[str], lexicon: Optional[str]):
+        self.id = uuid.uuid4().hex
+        self.meeting_id = meeting_id
+        self.audio_path = audio_path
+        self.audio_hash = audio_hash
+        self.model_name = model_name
+        self.method = method
+        self.lexicon = lexicon
+        self.state = ITEM_QUEUED
+        self.stage = STAGES[0]
+        self.error = None
+        self.duration = None
+        self.timings = {}  # stage -> {"wait": seconds queued, "run": seconds working}
+        self.created_at = time.time()
+        self.finished_at = None
+        self.enqueued_at = time.perf_counter()
+        self.done = asyncio.Event()
+
+    def to_dict(self) -> dict:
+        return {
+            "id": self.id,
+            "meeting_id": self.meeting_id,
+            "state": self.state,
+            "stage": self.stage,
+            "error": self.error,
+            "duration": self.duration,
+            "timings": self.timings,
+            "total_seconds": (self.finished_at or time.time()) - self.created_at,
+        }
+
+
+class ProcessingPipeline:
+    """Stage workers connected by bounded queues"""
+
+    def __init__(self):
+        self.items = OrderedDict()  # id -> PipelineItem
+        self.workers = {
+            "decode": PIPELINE_DECODE_WORKERS,
+            "transcribe": PIPELINE_TRANSCRIBE_WORKERS,
+            "summarize": PIPELINE_SUMMARY_WORKERS,
+        }
+        self._queues = {}
+        self._tasks = []
+        self._decode_pool = None
+        self._summary_pool = None
+        self._latency = {stage: {"count": 0, "failed": 0, "wait": 0.0, "run": 0.0, "max_run": 0.0} for stage in STAGES}
+        self._handlers = {
+            "decode": self._decode,
+            "transcribe": self._transcribe,
+            "summarize": self._summarize,
+        }
+
+    def start(self):
+        """Start the stage workers (in the running event loop)"""
+        if self._tasks:
+            return
+        self._queues = {stage: asyncio.Queue(maxsize=PIPELINE_QUEUE_SIZE) for stage in STAGES}
+        self._decode_pool = InstrumentedThreadPool("pipeline-decode", PIPELINE_DECODE_WORKERS)
+        self._summary_pool = InstrumentedThreadPool("pipeline-summary", PIPELINE_SUMMARY_WORKERS)
+        for position, stage in enumerate(STAGES):
+            next_stage = STAGES[position + 1] if position + 1 < len(STAGES) else None
+            for _ in range(self.workers[stage]):
+                self._tasks.append(asyncio.create_task(self._run_stage(stage, next_stage)))
+
+    async def stop(self):
+        """Cancel the workers; queued and running items are marked failed"""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        for item in self.items.values():
+            if not item.done.is_set():
+                item.state, item.error = ITEM_FAILED, "Pipeline stopped"
+                self._finish(item)
+        for pool in (self._decode_pool, self._summary_pool):
+            if pool:
+                pool.shutdown(wait=False)
+
+    async def submit(self, item: PipelineItem) -> PipelineItem:
+        """
+        Queue an item for the first stage
+
+        Raises:
+            PipelineFull: if the decode queue stays full for PIPELINE_SUBMIT_TIMEOUT
+        """
+        self.start()
+        try:
+            await asyncio.wait_for(self._queues[STAGES[0]].put(item), PIPELINE_SUBMIT_TIMEOUT)
+        except asyncio.TimeoutError:
+            raise PipelineFull("Processing pipeline is full, try again later")
+        self._report_depth(STAGES[0])
+
+        self.items[item.id] = item
+        self._trim_history()
+        return item
+
+    def get(self, item_id: str) -> Optional[PipelineItem]:
+        return self.items.get(item_id)
+
+    def _report_depth(self, stage: str):
+        QUEUE_DEPTH.labels(f"pipeline-{stage}").set(self._queues[stage].qsize())
+
+    def _trim_history(self):
+        finished = [i for i, item in self.items.items() if item.done.is_set()]
+        for item_id in finished[:max(0, len(finished) - PIPELINE_HISTORY)]:
+            del self.items[item_id]
+
+    async def _run_stage(self, stage: str, next_stage: Optional[str]):
+        queue = self._queues[stage]
+        latency = self._latency[stage]
+        while True:
+            item = await queue.get()
+            self._report_depth(stage)
+            started = time.perf_counter()
+            wait = started - item.enqueued_at
+            item.state, item.stage = ITEM_RUNNING, stage
+            try:
+                await self._handlers[stage](item)
+            except Exception as e:
+                item.state, item.error = ITEM_FAILED, str(e)
+                latency["failed"] += 1
+            run = time.perf_counter() - started
+            item.timings[stage] = {"wait": wait, "run": run}
+            QUEUE_WAIT_SECONDS.labels(f"pipeline-{stage}").observe(wait)
+            STAGE_SECONDS.labels("pipeline", stage).observe(run)
+
+            latency["count"] += 1
+            latency["wait"] += wait
+            latency["run"] += run
+            latency["max_run"] = max(latency["max_run"], run)
+
+            if item.state == ITEM_FAILED:
+                self._finish(item)
+            elif next_stage:
+                item.state, item.stage = ITEM_QUEUED, next_stage
+                item.enqueued_at = time.perf_counter()
+                # Waits while the next stage is backed up
+                await self._queues[next_stage].put(item)
+                self._report_depth(next_stage)
+            else:
+                item.state = ITEM_COMPLETED
+                self._finish(item)
+            queue.task_done()
+
+    def _finish(self, item: PipelineItem):
+        item.finished_at = time.time()
+        item.done.set()
+
+    async def _decode(self, item: PipelineItem):
+        """Decode into the PCM cache; transcription memory-maps it"""
+        loop = asyncio.get_event_loop()
+        if not DECODED_AUDIO_CACHE:
+            # Transcription decodes the file itself; do not decode it twice
+            info = await loop.run_in_executor(self._decode_pool, probe_audio, item.audio_path)
+            item.duration = info["duration"]
+            return
+        item.duration = await loop.run_in_executor(
+            self._decode_pool, lambda: audio_duration(decode_audio(item.audio_path))
+        )
+
+    async def _check_not_transcribing(self, db: AsyncSession, meeting_id: int):
+        """Fail the item if a transcription job owns the meeting, as /api/transcribe/{id}/stream does"""
+        if await find_active_job(db, "transcribe", meeting_id):
+            raise Exception("Meeting is already being transcribed")
+
+    async def _transcribe(self, item: PipelineItem):
+        async with AsyncSessionLocal() as db:
+            await self._check_not_transcribing(db, item.meeting_id)
+        transcript_data = await transcribe_audio(
+            item.audio_path, model_name=item.model_name, audio_hash=item.audio_hash
+        )
+        async with AsyncSessionLocal() as db:
+            meeting = await get_meeting(db, item.meeting_id)
+            if not meeting:
+                raise Exception("Meeting not found")
+            # A job queued while Whisper ran would store its own transcript
+            await self._check_not_transcribing(db, item.meeting_id)
+            await store_transcription(db, meeting, transcript_data)
+
+    async def _summarize(self, item: PipelineItem):
+        async with AsyncSessionLocal() as db:
+            meeting = await get_meeting(db, item.meeting_id, with_transcript=True)
+            if not meeting:
+                raise Exception("Meeting not found")
+            if not meeting.transcript_text:
+                return  # nothing was said
+
+            await corpus_index.refresh(db)
+            summary_data = (await summarize_meeting_text(
+                db, meeting, item.method, item.lexicon, corpus_index, executor=self._summary_pool
+            )).result
+            meeting.summary = summary_data["summary"]
+            meeting.key_points = "\n".join(summary_data["key_points"])
+            meeting.action_items = "\n".join(summary_data["action_items"])
+            await db.commit()
+
+    def stats(self) -> dict:
+        """Queue depths, workers and mean wait/run seconds per stage"""
+        stages = {}
+        for stage in STAGES:
+            latency = self._latency[stage]
+            count = latency["count"]
+            queue = self._queues.get(stage)
+            stages[stage] = {
+                "workers": self.workers[stage],
+                "queued": queue.qsize() if queue else 0,
+                "queue_size": PIPELINE_QUEUE_SIZE,
+                "processed": count,
+                "failed": latency["failed"],
+                "avg_wait": latency["wait"] / count if count else None,
+                "avg_run": latency["run"] / count if count else None,
+                "max_run": latency["max_run"] if count else None,
+            }
+        in_flight = sum(1 for item in self.items.values() if not item.done.is_set())
+        return {"running": bool(self._tasks), "in_flight": in_flight, "stages": stages}
+
+
+pipeline = ProcessingPipeline()
@@ -0,0 +1,488 @@
+"""Header-only audio metadata probe
+
+Reads container headers (RIFF/WAVE, MPEG audio frames, ISO-BMFF/MP4 boxes,
+EBML/WebM elements) to get duration, sample rate, channels and codec without
+decoding any audio. Used at upload time to reject corrupt or mislabelled
+files and to know a recording's length before any expensive work starts.
+"""
+import os
+import struct
+from pathlib import Path
+from typing import BinaryIO, Optional
+
+
+class AudioProbeError(Exception):
+    """Raised when a file is not a readable audio file of the expected type"""
+
+
+# File extension -> container format
+EXTENSION_FORMATS = {
+    "wav": "wav",
+    "mp3": "mp3",
+    "mpeg": "mp3",
+    "mpga": "mp3",
+    "m4a": "mp4",
+    "mp4": "mp4",
+    "webm": "webm",
+}
+
+# Largest metadata block (MP4 moov box, WebM head) read into memory
+MAX_HEADER_BYTES = 64 * 1024 * 1024
+
+
+def probe_audio(file_path: str, extension: Optional[str] = None) -> dict:
+    """
+    Read audio metadata from container headers
+
+    Args:
+        file_path: Path to the audio file
+        extension: Expected file extension (default: taken from file_path)
+
+    Returns:
+        dict with 'format', 'codec', 'duration', 'sample_rate' and 'channels'
+        (duration may be None for streams that do not record it)
+
+    Raises:
+        AudioProbeError: If the file is corrupt, unsupported, or its content
+            does not match its extension
+    """
+    extension = (extension or Path(file_path).suffix).lower().lstrip(".")
+    file_size = os.path.getsize(file_path)
+
+    with open(file_path, "rb") as f:
+        head = f.read(64)
+        detected = _detect_format(head)
+        if detected is None:
+            raise AudioProbeError("Unrecognized or corrupt audio file")
+
+        expected = EXTENSION_FORMATS.get(extension)
+        if expected and expected != detected:
+            raise AudioProbeError(f"File content is {detected.upper()} but its extension is .{extension}")
+
+        f.seek(0)
+        parser = {"wav": _probe_wav, "mp3": _probe_mp3, "mp4": _probe_mp4, "webm": _probe_webm}[detected]
+        try:
+            info = parser(f, file_size)
+        except (struct.error, IndexError, ValueError) as e:
+            raise AudioProbeError(f"Corrupt {detected.upper()} file: {e}")
+
+    if info.get("duration") is not None and info["duration"] < 0:
+        raise AudioProbeError(f"Corrupt {detected.upper()} file: negative duration")
+
+    return {"format": detected, **info}
+
+
+def _detect_format(head: bytes) -> Optional[str]:
+    """Identify the container from its magic bytes"""
+    if head[:4] == b"RIFF" and head[8:12] == b"WAVE":
+        return "wav"
+    if head[4:8] == b"ftyp":
+        return "mp4"
+    if head[:4] == b"\x1a\x45\xdf\xa3":
+        return "webm"
+    if head[:3] == b"ID3" or (len(head) > 1 and head[0] == 0xFF and head[1] & 0xE0 == 0xE0):
+        return "mp3"
+    return None
+
+
+# ---------------------------------------------------------------------------
+# WAV
+# ---------------------------------------------------------------------------
+
+WAV_CODECS = {1: "pcm", 3: "pcm_float", 6: "alaw", 7: "mulaw", 0x55: "mp3", 0xFFFE: "pcm_extensible"}
+
+
+def _probe_wav(f: BinaryIO, file_size: int) -> dict:
+    """Parse the RIFF chunk list up to the data chunk"""
+    f.seek(12)
+    fmt = None
+
+    while True:
+        header = f.read(8)
+        if len(header) < 8:
+            raise ValueError("no data chunk")
+        chunk_id, chunk_size = struct.unpack("<4sI", header)
+
+        if chunk_id == b"fmt ":
+            body = f.read(chunk_size)
+            audio_format, channels, sample_rate, byte_rate = struct.unpack("<HHII", body[:12])
+            fmt = (audio_format, channels, sample_rate, byte_rate)
+            if chunk_size % 2:
+                f.seek(1, os.SEEK_CUR)
+        elif chunk_id == b"data":
+            if fmt is None:
+                raise ValueError("data chunk before fmt chunk")
+            audio_format, channels, sample_rate, byte_rate = fmt
+            if not channels or not sample_rate or not byte_rate:
+                raise ValueError("invalid fmt chunk")
+
+            # Streamed WAVs may leave the size unset; use what is on disk
+            data_size = min(chunk_size, file_size - f.tell())
+            return {
+                "codec": WAV_CODECS.get(audio_format, f"wav_0x{audio_format:04x}"),
+                "duration": data_size / byte_rate,
+                "sample_rate": sample_rate,
+                "channels": channels,
+            }
+        else:
+            f.seek(chunk_size + chunk_size % 2, os.SEEK_CUR)
+
+
+# ---------------------------------------------------------------------------
+# MP3 (MPEG audio)
+# ---------------------------------------------------------------------------
+
+MPEG_SAMPLE_RATES = {3: [44100, 48000, 32000], 2: [22050, 24000, 16000], 0: [11025, 12000, 8000]}
+MPEG_BITRATES = {
+    (3, 3): [0, 32, 64, 96, 128, 160, 192, 224, 256, 288, 320, 352, 384, 416, 448],
+    (3, 2): [0, 32, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320, 384],
+    (3, 1): [0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320],
+    (2, 3): [0, 32, 48, 56, 64, 80, 96, 112, 128, 144, 160, 176, 192, 224, 256],
+    (2, 2): [0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160],
+    (2, 1): [0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160],
+}
+MPEG_CODECS = {3: "mp1", 2: "mp2", 1: "mp3"}
+
+
+def _parse_mpeg_header(header: bytes) -> Optional[dict]:
+    """Decode a 4-byte MPEG audio frame header, or None if it is not one"""
+    if len(header) < 4 or header[0] != 0xFF or header[1] & 0xE0 != 0xE0:
+        return None
+
+    version = (header[1] >> 3) & 0x03  # 3 = MPEG1, 2 = MPEG2, 0 = MPEG2.5
+    layer = (header[1] >> 1) & 0x03  # 3 = Layer I, 2 = Layer II, 1 = Layer III
+    bitrate_index = header[2] >> 4
+    sample_rate_index = (header[2] >> 2) & 0x03
+    padding = (header[2] >> 1) & 0x01
+    channel_mode = header[3] >> 6
+
+    if version == 1 or layer == 0 or bitrate_index in (0, 15) or sample_rate_index == 3:
+        return None
+
+    bitrate = MPEG_BITRATES[(3 if version == 3 else 2, layer)][bitrate_index] * 1000
+    sample_rate = MPEG_SAMPLE_RATES[version][sample_rate_index]
+
+    if layer == 3:
+        samples_per_frame = 384
+        frame_length = (12 * bitrate // sample_rate + padding) * 4
+    else:
+        samples_per_frame = 1152 if (layer == 2 or version == 3) else 576
+        frame_length = samples_per_frame // 8 * bitrate // sample_rate + padding
+
+    return {
+        "version": version,
+        "layer": layer,
+        "bitrate": bitrate,
+        "sample_rate": sample_rate,
+        "channels": 1 if channel_mode == 3 else 2,
+        "samples_per_frame": samples_per_frame,
+        "frame_length": frame_length,
+    }
+
+
+def _probe_mp3(f: BinaryIO, file_size: int) -> dict:
+    """Find the first valid frame; use a Xing/Info/VBRI header or the CBR bitrate"""
+    audio_start = 0
+    head = f.read(10)
+    if head[:3] == b"ID3":
+        # ID3v2 size is a 28-bit syncsafe integer, plus an optional footer
+        tag_size = (head[6] << 21) | (head[7] << 14) | (head[8] << 7) | head[9]
+        audio_start = 10 + tag_size + (10 if head[5] & 0x10 else 0)
+
+    f.seek(audio_start)
+    buf = f.read(128 * 1024)
+
+    frame = None
+    offset = 0
+    while offset < len(buf) - 4:
+        offset = buf.find(b"\xff", offset)
+        if offset < 0:
+            break
+        candidate = _parse_mpeg_header(buf[offset:offset + 4])
+        if candidate:
+            # Require the next frame to line up as well, to avoid false syncs
+            following = offset + candidate["frame_length"]
+            if following + 4 > len(buf) or _parse_mpeg_header(buf[following:following + 4]):
+                frame = candidate
+                break
+        offset += 1
+
+    if frame is None:
+        raise ValueError("no MPEG audio frame found")
+
+    frame_start = audio_start + offset
+    frame_data = buf[offset:offset + frame["frame_length"]]
+    frame_count = _vbr_frame_count(frame, frame_data)
+
+    if frame_count:
+        duration = frame_count * frame["samples_per_frame"] / frame["sample_rate"]
+    else:
+        audio_bytes = file_size - frame_start
+        if audio_bytes >= 128:
+            f.seek(file_size - 128)
+            if f.read(3) == b"TAG":
+                audio_bytes -= 128
+        duration = audio_bytes * 8 / frame["bitrate"]
+
+    return {
+        "codec": MPEG_CODECS[frame["layer"]],
+        "duration": duration,
+        "sample_rate": frame["sample_rate"],
+        "channels": frame["channels"],
+    }
+
+
+def _vbr_frame_count(frame: dict, data: bytes) -> Optional[int]:
+    """Total frame count from a Xing/Info or VBRI header in the first frame"""
+    if frame["version"] == 3:
+        side_info = 17 if frame["channels"] == 1 else 32
+    else:
+        side_info = 9 if frame["channels"] == 1 else 17
+
+    xing = 4 + side_info
+    if data[xing:xing + 4] in (b"Xing", b"Info"):
+        flags = struct.unpack(">I", data[xing + 4:xing + 8])[0]
+        if flags & 0x01:
+            return struct.unpack(">I", data[xing + 8:xing + 12])[0]
+
+    if data[36:40] == b"VBRI":
+        return struct.unpack(">I", data[50:54])[0]
+
+    return None
+
+
+# ---------------------------------------------------------------------------
+# MP4 / M4A (ISO base media file format)
+# ---------------------------------------------------------------------------
+
+MP4_CODECS = {"mp4a": "aac", "alac": "alac", "Opus": "opus", "fLaC": "flac", "ac-3": "ac3", "ec-3": "eac3", ".mp3": "mp3"}
+
+
+def _iter_boxes(data: bytes, start: int = 0, end: Optional[int] = None):
+    """Yield (type, body_start, body_end) for boxes in an in-memory buffer"""
+    end = len(data) if end is None else end
+    offset = start
+    while offset + 8 <= end:
+        size, box_type = struct.unpack(">I4s", data[offset:offset + 8])
+        header = 8
+        if size == 1:
+            size = struct.unpack(">Q", data[offset + 8:offset + 16])[0]
+            header = 16
+        elif size == 0:
+            size = end - offset
+        if size < header or offset + size > end:
+            raise ValueError(f"box '{box_type.decode('latin-1')}' overruns its parent")
+        yield box_type.decode("latin-1"), offset + header, offset + size
+        offset += size
+
+
+def _find_box(data: bytes, path: list[str], start: int = 0, end: Optional[int] = None):
+    """Find the body range of a nested box, e.g. ['mdia', 'mdhd']"""
+    for box_type, body_start, body_end in _iter_boxes(data, start, end):
+        if box_type == path[0]:
+            if len(path) == 1:
+                return body_start, body_end
+            return _find_box(data, path[1:], body_start, body_end)
+    return None
+
+
+def _parse_media_header(data: bytes, start: int) -> Optional[float]:
+    """Duration in seconds from an mvhd/mdhd body"""
+    version = data[start]
+    if version == 1:
+        timescale, duration = struct.unpack(">IQ", data[start + 20:start + 32])
+    else:
+        timescale, duration = struct.unpack(">II", data[start + 12:start + 20])
+    return duration / timescale if timescale else None
+
+
+def _probe_mp4(f: BinaryIO, file_size: int) -> dict:
+    """Walk top-level boxes to moov, then read the audio track's headers"""
+    moov = None
+    offset = 0
+    while offset + 8 <= file_size:
+        f.seek(offset)
+        header = f.read(16)
+        size, box_type = struct.unpack(">I4s", header[:8])
+        if size == 1:
+            size = struct.unpack(">Q", header[8:16])[0]
+        elif size == 0:
+            size = file_size - offset
+        if size < 8:
+            raise ValueError("invalid box size")
+
+        if box_type == b"moov":
+            if size > MAX_HEADER_BYTES:
+                raise ValueError("moov box too large")
+            f.seek(offset)
+            moov = f.read(size)
+            break
+        offset += size  # skip mdat and friends without reading them
+
+    if moov is None:
+        raise ValueError("no moov box")
+
+    movie_duration = None
+    mvhd = _find_box(moov, ["moov", "mvhd"])
+    if mvhd:
+        movie_duration = _parse_media_header(moov, mvhd[0])
+
+    moov_body = _find_box(moov, ["moov"])
+    for box_type, trak_start, trak_end in _iter_boxes(moov, *moov_body):
+        if box_type != "trak":
+            continue
+        hdlr = _find_box(moov, ["mdia", "hdlr"], trak_start, trak_end)
+        if not hdlr or moov[hdlr[0] + 8:hdlr[0] + 12] != b"soun":
+            continue
+
+        mdhd = _find_box(moov, ["mdia", "mdhd"], trak_start, trak_end)
+        stsd = _find_box(moov, ["mdia", "minf", "stbl", "stsd"], trak_start, trak_end)
+        if not stsd:
+            raise ValueError("audio track without sample description")
+
+        # First sample entry: size, fourcc, then the AudioSampleEntry fields
+        entry = stsd[0] + 8
+        fourcc = moov[entry + 4:entry + 8].decode("latin-1")
+        channels, _, _, _, sample_rate = struct.unpack(">HHHHI", moov[entry + 24:entry + 36])
+
+        return {
+            "codec": MP4_CODECS.get(fourcc, fourcc.strip()),
+            "duration": _parse_media_header(moov, mdhd[0]) if mdhd else movie_duration,
+            "sample_rate": sample_rate >> 16,
+            "channels": channels,
+        }
+
+    raise ValueError("no audio track")
+
+
+# ---------------------------------------------------------------------------
+# WebM / Matroska (EBML)
+# ---------------------------------------------------------------------------
+
+EBML_HEADER = 0x1A45DFA3
+EBML_DOCTYPE = 0x4282
+MKV_SEGMENT = 0x18538067
+MKV_INFO = 0x1549A966
+MKV_TIMECODE_SCALE = 0x2AD7B1
+MKV_DURATION = 0x4489
+MKV_TRACKS = 0x1654AE6B
+MKV_TRACK_ENTRY = 0xAE
+MKV_TRACK_TYPE = 0x83
+MKV_CODEC_ID = 0x86
+MKV_AUDIO = 0xE1
+MKV_SAMPLING_FREQUENCY = 0xB5
+MKV_CHANNELS = 0x9F
+MKV_CLUSTER = 0x1F43B675
+
+MKV_CODECS = {"A_OPUS": "opus", "A_VORBIS": "vorbis", "A_AAC": "aac", "A_MPEG/L3": "mp3", "A_FLAC": "flac", "A_PCM/INT/LIT": "pcm"}
+
+
+def _read_vint(data: bytes, offset: int, keep_marker: bool) -> tuple[int, int]:
+    """Read an EBML variable-length integer; returns (value, length)"""
+    first = data[offset]
+    if first == 0:
+        raise ValueError("invalid EBML variable-length integer")
+    length = 1
+    mask = 0x80
+    while not first & mask:
+        mask >>= 1
+        length += 1
+
+    if len(data) < offset + length:
+        raise ValueError("truncated EBML element")
+
+    value = first if keep_marker else first & (mask - 1)
+    for byte in data[offset + 1:offset + length]:
+        value = (value << 8) | byte
+
+    # All value bits set means "unknown size" (live streams)
+    if not keep_marker and value == (1 << (7 * length)) - 1:
+        value = -1
+    return value, length
+
+
+def _iter_elements(data: bytes, start: int, end: int):
+    """Yield (id, body_start, body_end) for EBML elements in a buffer"""
+    offset = start
+    while offset < end:
+        element_id, id_length = _read_vint(data, offset, keep_marker=True)
+        size, size_length = _read_vint(data, offset + id_length, keep_marker=False)
+        body_start = offset + id_length + size_length
+        body_end = end if size < 0 else min(end, body_start + size)
+        yield element_id, body_start, body_end
+        offset = body_end
+
+
+def _read_uint(data: bytes, start: int, end: int) -> int:
+    return int.from_bytes(data[start:end], "big")
+
+
+def _read_float(data: bytes, start: int, end: int) -> float:
+    return struct.unpack(">f" if end - start == 4 else ">d", data[start:end])[0]
+
+
+def _probe_webm(f: BinaryIO, file_size: int) -> dict:
+    """Read the EBML header, segment Info and the first audio TrackEntry"""
+    data = f.read(min(file_size, 4 * 1024 * 1024))
+
+    elements = _iter_elements(data, 0, len(data))
+    element_id, header_start, header_end = next(elements, (None, 0, 0))
+    if element_id != EBML_HEADER:
+        raise ValueError("missing EBML header")
+    for child_id, start, end in _iter_elements(data, header_start, header_end):
+        if child_id == EBML_DOCTYPE and data[start:end].rstrip(b"\x00") not in (b"webm", b"matroska"):
+            raise ValueError("not a WebM/Matroska document")
+
+    element_id, segment_start, segment_end = next(elements, (None, 0, 0))
+    if element_id != MKV_SEGMENT:
+        raise ValueError("missing Segment")
+
+    timecode_scale = 1_000_000
+    raw_duration = None
+    track = None
+
+    # Info and Tracks precede the first Cluster in files written by browsers and ffmpeg
+    for element_id, start, end in _iter_elements(data, segment_start, segment_end):
+        if element_id == MKV_INFO:
+            for child_id, child_start, child_end in _iter_elements(data, start, end):
+                if child_id == MKV_TIMECODE_SCALE:
+                    timecode_scale = _read_uint(data, child_start, child_end)
+                elif child_id == MKV_DURATION:
+                    raw_duration = _read_float(data, child_start, child_end)
+        elif element_id == MKV_TRACKS:
+            track = _find_audio_track(data, start, end)
+        elif element_id == MKV_CLUSTER or (track and raw_duration is not None):
+            break
+
+    if track is None:
+        raise ValueError("no audio track")
+
+    return {
+        "codec": MKV_CODECS.get(track["codec_id"], track["codec_id"].lower()),
+        # MediaRecorder output has no Duration element; that is not an error
+        "duration": raw_duration * timecode_scale / 1e9 if raw_duration is not None else None,
+        "sample_rate": track["sample_rate"],
+        "channels": track["channels"],
+    }
+
+
+def _find_audio_track(data: bytes, start: int, end: int) -> Optional[dict]:
+    """First TrackEntry with TrackType audio"""
+    for element_id, entry_start, entry_end in _iter_elements(data, start, end):
+        if element_id != MKV_TRACK_ENTRY:
+            continue
+        track = {"type": None, "codec_id": "", "sample_rate": 8000, "channels": 1}
+        for child_id, child_start, child_end in _iter_elements(data, entry_start, entry_end):
+            if child_id == MKV_TRACK_TYPE:
+                track["type"] = _read_uint(data, child_start, child_end)
+            elif child_id == MKV_CODEC_ID:
+                track["codec_id"] = data[child_start:child_end].rstrip(b"\x00").decode("ascii", "replace")
+            elif child_id == MKV_AUDIO:
+                for audio_id, audio_start, audio_end in _iter_elements(data, child_start, child_end):
+                    if audio_id == MKV_SAMPLING_FREQUENCY:
+                        track["sample_rate"] = int(_read_float(data, audio_start, audio_end))
+                    elif audio_id == MKV_CHANNELS:
+                        track["channels"] = _read_uint(data, audio_start, audio_end)
+        if track["type"] == 2:
+            return track
+    return None
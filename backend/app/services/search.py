@@ -0,0 +1,146 @@
+"""Full-text search over meetings and transcript segments (SQLite FTS5)
+
+meetings_fts covers title, transcript, summary, key points and action
+items; segments_fts covers the stored transcript segments, so hits can
+point at the moment in the recording where the words were said. Both are
+kept in sync by triggers (see app.database).
+
+Compressed transcripts are not in meetings_fts, so meetings are also found
+through their segments. For those, every query word has to occur in one
+segment, and the best segment's rank and snippet stand in for the meeting's.
+
+Matched words in snippets are wrapped in MATCH_START / MATCH_END, control
+characters that do not occur in transcripts or typed text, so clients can
+highlight them without mistaking brackets in the text for matches.
+"""
+import os
+import re
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+from dotenv import load_dotenv
+
+from app.database import IS_SQLITE, SEGMENT_ROWID_STRIDE
+
+load_dotenv()
+
+SEARCH_SEGMENTS_PER_MEETING = int(os.getenv("SEARCH_SEGMENTS_PER_MEETING", "3"))
+SNIPPET_TOKENS = 12
+MATCH_START = "\x02"
+MATCH_END = "\x03"
+
+# bm25 column weights: title, transcript, summary, key points, action items
+RANK_WEIGHTS = "8.0, 1.0, 3.0, 2.0, 2.0"
+
+QUERY_TOKEN_PATTERN = re.compile(r"\w+", re.UNICODE)
+
+
+class SearchUnavailable(Exception):
+    """Raised when the database has no full-text search support"""
+
+
+def build_match_query(query: str) -> str:
+    """
+    Turn free text into a safe FTS5 query
+
+    Every word must match (implicit AND); quoting keeps user input from being
+    parsed as FTS5 syntax. The last word also matches as a prefix, so
+    partially typed words find results.
+    """
+    words = QUERY_TOKEN_PATTERN.findall(query)
+    if not words:
+        return ""
+    terms = [f'"{word}"' for word in words]
+    terms[-1] += "*"
+    return " ".join(terms)
+
+
+async def search_meetings(db: AsyncSession, query: str, limit: int = 20) -> list[dict]:
+    """
+    Ranked full-text search
+
+    Args:
+        db: Database session
+        query: Free-text query
+        limit: Maximum number of meetings
+
+    Returns:
+        List of dicts with 'meeting_id', 'title', 'date', 'duration', 'rank'
+        (lower is better), 'snippet' and 'segments' (start, end, snippet)
+    """
+    if not IS_SQLITE:
+        raise SearchUnavailable("Full-text search requires SQLite with FTS5")
+
+    match = build_match_query(query)
+    if not match:
+        return []
+
+    result = await db.execute(
+        text(f"""
+            WITH meeting_hits AS MATERIALIZED (
+                SELECT rowid AS id, bm25(meetings_fts, {RANK_WEIGHTS}) AS rank,
+                       snippet(meetings_fts, -1, :match_start, :match_end, '…', {SNIPPET_TOKENS}) AS snippet
+                FROM meetings_fts
+                WHERE meetings_fts MATCH :match
+            ),
+            segment_hits AS MATERIALIZED (
+                SELECT meeting_id AS id, bm25(segments_fts) AS rank,
+                       snippet(segments_fts, 0, :match_start, :match_end, '…', {SNIPPET_TOKENS}) AS snippet
+                FROM segments_fts
+                WHERE segments_fts MATCH :match
+                  AND meeting_id IN (SELECT id FROM meetings WHERE transcript_blob IS NOT NULL)
+            ),
+            hits AS (
+                SELECT id, rank, snippet FROM meeting_hits
+                UNION ALL
+                SELECT id, min(rank), snippet FROM segment_hits
+                WHERE id NOT IN (SELECT id FROM meeting_hits)
+                GROUP BY id
+            )
+            SELECT m.id, m.title, m.date, m.duration, hits.rank, hits.snippet
+            FROM hits
+            JOIN meetings m ON m.id = hits.id
+            ORDER BY hits.rank
+            LIMIT :limit
+        """),
+        {"match": match, "limit": limit, "match_start": MATCH_START, "match_end": MATCH_END}
+    )
+    hits = [
+        {
+            "meeting_id": row.id,
+            "title": row.title,
+            "date": row.date,
+            "duration": row.duration,
+            "rank": row.rank,
+            "snippet": row.snippet,
+            "segments": [],
+        }
+        for row in result
+    ]
+
+    # Best matching segments of each meeting; the rowid range keeps each
+    # lookup inside one meeting's segments
+    for hit in hits:
+        base = hit["meeting_id"] * SEGMENT_ROWID_STRIDE
+        result = await db.execute(
+            text(f"""
+                SELECT start, "end", snippet(segments_fts, 0, :match_start, :match_end, '…', {SNIPPET_TOKENS}) AS snippet
+                FROM segments_fts
+                WHERE segments_fts MATCH :match AND rowid BETWEEN :low AND :high
+                ORDER BY bm25(segments_fts)
+                LIMIT :per_meeting
+            """),
+            {
+                "match": match,
+                "low": base,
+                "high": base + SEGMENT_ROWID_STRIDE - 1,
+                "per_meeting": SEARCH_SEGMENTS_PER_MEETING,
+                "match_start": MATCH_START,
+                "match_end": MATCH_END,
+            }
+        )
+        hit["segments"] = sorted(
+            ({"start": row[0], "end": row[1], "snippet": row[2]} for row in result),
+            key=lambda s: s["start"]
+        )
+
+    return hits
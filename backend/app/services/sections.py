@@ -0,0 +1,289 @@
+"""Hierarchical (map-reduce) summarization of long transcripts
+
+A long meeting is split into sections of about SECTION_SECONDS, each
+ending where the topic shifts most: at the segment boundary within reach
+whose surrounding windows of segments share the fewest terms. Sections
+are summarized in parallel on a process pool (map), then the final
+summary, key points and action items are picked by running the same
+summarizer over the section results (reduce). Section results are stored
+in transcript_sections for the meeting outline.
+
+Meetings shorter than HIERARCHICAL_MIN_SECONDS, or without stored
+segments, are summarized in one pass. Both go through the summary cache;
+a map-reduce result is cached with its sections under a key that includes
+the section settings, and a hit restores the outline from it.
+"""
+import os
+import math
+import time
+import asyncio
+import multiprocessing
+from collections import Counter
+from typing import Optional, NamedTuple
+from sqlalchemy import select, delete, insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from dotenv import load_dotenv
+
+from app.database import SEGMENT_ROWID_STRIDE
+from app.models import Meeting, TranscriptSection
+from app.services.nlp import generate_summary, segments_text, STOP_WORDS, SUMMARIZER
+from app.services.summarizer import TOKEN_PATTERN, SENTENCE_PATTERN
+from app.services.segments import get_segment_range, count_segments
+from app.services.summary_cache import cached_summary, lookup_summary, store_summary
+from app.metrics import InstrumentedProcessPool, stage_timer
+
+load_dotenv()
+
+HIERARCHICAL_MIN_SECONDS = float(os.getenv("HIERARCHICAL_MIN_SECONDS", "1800"))
+SECTION_SECONDS = float(os.getenv("SECTION_SECONDS", "600"))
+SECTION_PROCESSES = int(os.getenv("SECTION_PROCESSES", str(min(4, os.cpu_count() or 1))))
+SHIFT_WINDOW = 8  # segments compared on each side of a candidate boundary
+
+# Part of the summary cache key of map-reduce summaries
+HIERARCHICAL_PARAMS = {"section_seconds": SECTION_SECONDS, "shift_window": SHIFT_WINDOW}
+
+# What the summarizers return when a text has nothing to offer
+PLACEHOLDERS = {
+    "No content to summarize",
+    "No content available",
+    "No action items found",
+    "No specific key points identified",
+    "No specific action items identified",
+}
+
+_process_pool = None
+
+
+def _get_process_pool() -> InstrumentedProcessPool:
+    """Summarizer processes, started on first use"""
+    global _process_pool
+    if _process_pool is None:
+        # spawn: forking a process that runs threads (Whisper, executors) is unsafe
+        _process_pool = InstrumentedProcessPool(
+            "sections", SECTION_PROCESSES, mp_context=multiprocessing.get_context("spawn")
+        )
+    return _process_pool
+
+
+def shutdown_process_pool():
+    global _process_pool
+    if _process_pool is not None:
+        _process_pool.shutdown(wait=False, cancel_futures=True)
+        _process_pool = None
+
+
+def _cosine(a: Counter, b: Counter) -> float:
+    if not a or not b:
+        return 0.0
+    dot = sum(count * b[term] for term, count in a.items() if term in b)
+    return dot / math.sqrt(sum(c * c for c in a.values()) * sum(c * c for c in b.values()))
+
+
+def _boundary_similarity(texts: list[str]) -> list[float]:
+    """
+    Term overlap across each segment boundary
+
+    similarity[i] compares the SHIFT_WINDOW segments before segment i with
+    the SHIFT_WINDOW segments from i on; low values mark topic shifts.
+    """
+    bags = [Counter(t for t in TOKEN_PATTERN.findall(text.lower()) if t not in STOP_WORDS) for text in texts]
+    similarity = [1.0] * len(bags)
+    for i in range(1, len(bags)):
+        before = sum(bags[max(0, i - SHIFT_WINDOW):i], Counter())
+        after = sum(bags[i:i + SHIFT_WINDOW], Counter())
+        similarity[i] = _cosine(before, after)
+    return similarity
+
+
+def split_sections(segments: list[tuple[float, float, str]], target: float = SECTION_SECONDS) -> list[tuple[int, int]]:
+    """
+    Split timed segments into sections of roughly `target` seconds
+
+    Each section ends at the boundary between 0.5x and 1.5x the target
+    length with the lowest term overlap (closest to the target on ties).
+
+    Args:
+        segments: (start, end, text) in transcript order
+
+    Returns:
+        [first, last) segment index ranges, one per section
+    """
+    count = len(segments)
+    if not count:
+        return []
+    similarity = _boundary_similarity([text for _, _, text in segments])
+
+    ranges = []
+    first = 0
+    while True:
+        section_start = segments[first][0]
+        if segments[-1][1] - section_start <= 1.5 * target:
+            ranges.append((first, count))
+            return ranges
+
+        candidates = []
+        for i in range(first + 1, count):
+            offset = segments[i][0] - section_start
+            if offset > 1.5 * target:
+                break
+            if offset >= 0.5 * target:
+                candidates.append(i)
+        if candidates:
+            cut = min(candidates, key=lambda i: (similarity[i], abs(segments[i][0] - section_start - target)))
+        else:
+            # A long silence: cut at the first segment past it
+            cut = next((i for i in range(first + 1, count) if segments[i][0] - section_start > 1.5 * target), count)
+
+        ranges.append((first, cut))
+        if cut >= count:
+            return ranges
+        first = cut
+
+
+def _reduce_text(results: list[dict]) -> str:
+    """
+    Section summaries, key points and action items as one text, in transcript order
+
+    Each sentence appears once (compared ignoring case and spacing): a
+    summary sentence is often also a key point, and a repeated sentence
+    could be picked twice by the reduce pass.
+    """
+    sentences = {}
+    for result in results:
+        for item in [result["summary"], *result["key_points"], *result["action_items"]]:
+            for match in SENTENCE_PATTERN.finditer(item):
+                sentence = " ".join(match.group().split())
+                if sentence and sentence not in PLACEHOLDERS:
+                    sentences.setdefault(sentence.lower(), sentence)
+    return ". ".join(sentences.values()) + "." if sentences else ""
+
+
+async def summarize_sections(
+    db: AsyncSession,
+    meeting: Meeting,
+    method: str = None,
+    profile: str = None,
+    corpus=None
+) -> tuple[Optional[dict], list[tuple[float, float, dict]]]:
+    """
+    Map-reduce summary of a long meeting from its stored segments
+
+    Section summaries replace the meeting's stored outline in the caller's
+    transaction.
+
+    Returns:
+        (summary dict, (start, end, section summary) per section); no
+        sections if the meeting has no stored segments
+    """
+    method = method or SUMMARIZER
+    rows = await get_segment_range(db, meeting.id, 0, SEGMENT_ROWID_STRIDE)
+    segments = [(row.start, row.end, row.text) for row in rows]
+    if not segments:
+        return None, []
+
+    loop = asyncio.get_event_loop()
+    ranges = await loop.run_in_executor(None, split_sections, segments)
+    texts = [segments_text([{"text": text} for _, _, text in segments[first:last]]) for first, last in ranges]
+    # Worker processes get the IDF of this transcript's terms, not the whole index
+    if corpus is not None:
+        corpus = await loop.run_in_executor(None, corpus.snapshot, meeting.transcript_text)
+
+    pool = _get_process_pool()
+    with stage_timer("summarize", "sections"):
+        results = await asyncio.gather(*(
+            generate_summary(text, method, meeting.language, profile, corpus, executor=pool) for text in texts
+        ))
+    with stage_timer("summarize", "reduce"):
+        summary_data = await generate_summary(
+            _reduce_text(results), method, meeting.language, profile, corpus, executor=pool
+        )
+
+    sections = [(segments[first][0], segments[last - 1][1], result) for (first, last), result in zip(ranges, results)]
+    await replace_sections(db, meeting.id, method, sections)
+    return summary_data, sections
+
+
+def is_long(meeting: Meeting) -> bool:
+    """Whether a meeting is summarized by sections"""
+    return (meeting.duration or 0) >= HIERARCHICAL_MIN_SECONDS
+
+
+class MeetingSummary(NamedTuple):
+    result: dict
+    cached: bool
+    sections: int
+
+
+async def summarize_meeting_text(
+    db: AsyncSession,
+    meeting: Meeting,
+    method: str = None,
+    profile: str = None,
+    corpus=None,
+    executor=None
+) -> MeetingSummary:
+    """
+    Summarize a meeting whose transcript is loaded, by sections if it is long
+
+    Args:
+        db: Database session
+        meeting: Meeting with its transcript loaded
+        method: One of SUMMARIZERS (default: SUMMARIZER setting)
+        profile: Team lexicon profile
+        corpus: CorpusIndex for corpus-wide IDF
+        executor: Executor for one-pass summaries (default: the event loop's)
+    """
+    if is_long(meeting) and await count_segments(db, meeting.id):
+        lookup = await lookup_summary(
+            db, meeting.transcript_text, method, meeting.language, profile, corpus, HIERARCHICAL_PARAMS
+        )
+        if lookup.result is not None:
+            sections = [(start, end, section) for start, end, section in lookup.result["sections"]]
+            await replace_sections(db, meeting.id, lookup.method, sections)
+            return MeetingSummary(_without_sections(lookup.result), True, len(sections))
+
+        started = time.perf_counter()
+        result, sections = await summarize_sections(db, meeting, lookup.method, profile, corpus)
+        await store_summary(db, lookup, {**result, "sections": sections}, time.perf_counter() - started)
+        return MeetingSummary(result, False, len(sections))
+
+    result, cached = await cached_summary(
+        db, meeting.transcript_text, method, meeting.language, profile, corpus, executor
+    )
+    return MeetingSummary(result, cached, 0)
+
+
+def _without_sections(result: dict) -> dict:
+    return {key: value for key, value in result.items() if key != "sections"}
+
+
+async def replace_sections(db: AsyncSession, meeting_id: int, method: str, sections: list[tuple[float, float, dict]]):
+    """Replace a meeting's stored outline (in the caller's transaction)"""
+    await delete_sections(db, meeting_id)
+    rows = [
+        {
+            "meeting_id": meeting_id,
+            "idx": idx,
+            "start": start,
+            "end": end,
+            "method": method,
+            "summary": result["summary"],
+            "key_points": "\n".join(result["key_points"]),
+            "action_items": "\n".join(result["action_items"]),
+        }
+        for idx, (start, end, result) in enumerate(sections)
+    ]
+    if rows:
+        await db.execute(insert(TranscriptSection), rows)
+
+
+async def delete_sections(db: AsyncSession, meeting_id: int):
+    """Delete a meeting's stored outline (in the caller's transaction)"""
+    await db.execute(delete(TranscriptSection).where(TranscriptSection.meeting_id == meeting_id))
+
+
+async def get_sections(db: AsyncSession, meeting_id: int) -> list[TranscriptSection]:
+    result = await db.execute(
+        select(TranscriptSection).where(TranscriptSection.meeting_id == meeting_id).order_by(TranscriptSection.idx)
+    )
+    return result.scalars().all()
@@ -0,0 +1,122 @@
+"""Timestamped transcript segments
+
+Each meeting's segments are stored as rows of ``transcript_segments`` so a
+long transcript can be read a window at a time instead of as one blob. Row
+ids are meeting_id * SEGMENT_ROWID_STRIDE + idx: a meeting's segments are
+one primary-key range, which is also how segments_fts finds them.
+"""
+from typing import Optional
+from sqlalchemy import select, delete, insert, func
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database import SEGMENT_ROWID_STRIDE
+from app.models import TranscriptSegment
+
+# Whisper decodes 30-second windows, so no segment is longer than this
+MAX_SEGMENT_SECONDS = 30.0
+
+
+def _id_range(meeting_id: int) -> tuple[int, int]:
+    base = meeting_id * SEGMENT_ROWID_STRIDE
+    return base, base + SEGMENT_ROWID_STRIDE - 1
+
+
+async def replace_segments(db: AsyncSession, meeting_id: int, segments: list[dict]) -> int:
+    """
+    Replace a meeting's stored segments (in the caller's transaction)
+
+    The new rows are written with one executemany insert, so a transcript
+    is either fully replaced or, if the transaction rolls back, untouched.
+
+    Args:
+        db: Database session
+        meeting_id: Meeting ID
+        segments: Cleaned segments with 'start', 'end', 'text' and optional 'avg_logprob'
+
+    Returns:
+        Number of segments stored
+    """
+    await delete_segments(db, meeting_id)
+
+    base = meeting_id * SEGMENT_ROWID_STRIDE
+    rows = [
+        {
+            "id": base + idx,
+            "meeting_id": meeting_id,
+            "idx": idx,
+            "start": segment["start"],
+            "end": segment["end"],
+            "text": segment["text"],
+            "avg_logprob": segment.get("avg_logprob"),
+        }
+        for idx, segment in enumerate(segments[:SEGMENT_ROWID_STRIDE])
+    ]
+    if rows:
+        await db.execute(insert(TranscriptSegment), rows)
+    return len(rows)
+
+
+async def delete_segments(db: AsyncSession, meeting_id: int):
+    """Delete a meeting's segments (in the caller's transaction)"""
+    low, high = _id_range(meeting_id)
+    await db.execute(delete(TranscriptSegment).where(TranscriptSegment.id.between(low, high)))
+
+
+async def count_segments(db: AsyncSession, meeting_id: int) -> int:
+    low, high = _id_range(meeting_id)
+    result = await db.execute(
+        select(func.count()).select_from(TranscriptSegment).where(TranscriptSegment.id.between(low, high))
+    )
+    return result.scalar_one()
+
+
+async def get_segment_range(db: AsyncSession, meeting_id: int, offset: int = 0, limit: int = 100) -> list[TranscriptSegment]:
+    """
+    Segments offset .. offset + limit - 1 of a meeting, in order
+
+    A primary-key range scan; no other segments are read.
+    """
+    base = meeting_id * SEGMENT_ROWID_STRIDE
+    low = base + max(offset, 0)
+    high = min(low + limit, base + SEGMENT_ROWID_STRIDE) - 1
+    result = await db.execute(
+        select(TranscriptSegment)
+        .where(TranscriptSegment.id.between(low, high))
+        .order_by(TranscriptSegment.id)
+    )
+    return result.scalars().all()
+
+
+async def get_segment_window(
+    db: AsyncSession,
+    meeting_id: int,
+    start: float,
+    end: Optional[float] = None,
+    limit: int = 500
+) -> list[TranscriptSegment]:
+    """
+    Segments overlapping the time window [start, end), in order
+
+    Args:
+        db: Database session
+        meeting_id: Meeting ID
+        start: Window start (seconds)
+        end: Window end (seconds; default: end of the recording)
+        limit: Maximum number of segments
+
+    Returns:
+        Segments whose [start, end] overlaps the window
+    """
+    query = (
+        select(TranscriptSegment)
+        .where(TranscriptSegment.meeting_id == meeting_id)
+        # Bounds the index range scan from below as well
+        .where(TranscriptSegment.start >= start - MAX_SEGMENT_SECONDS)
+        .where(TranscriptSegment.end > start)
+        .order_by(TranscriptSegment.start, TranscriptSegment.idx)
+        .limit(limit)
+    )
+    if end is not None:
+        query = query.where(TranscriptSegment.start < end)
+    result = await db.execute(query)
+    return result.scalars().all()
@@ -1,37 +1,108 @@
 """File storage service"""
-import os
+import uuid
+import hashlib
 import aiofiles
+import aiofiles.os
 from pathlib import Path
 from datetime import datetime
+from typing import AsyncIterator
 
 
-async def save_audio_file(file_content: bytes, filename: str, upload_dir: str) -> str:
+class FileTooLargeError(Exception):
+    """Raised when an upload exceeds the configured size limit"""
+
+
+def _new_audio_path(filename: str, upload_dir: str) -> Path:
+    """Build a unique path for a new upload, keeping the original extension"""
+    # Create unique filename with timestamp
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    file_extension = Path(filename).suffix
+    new_filename = f"meeting_{timestamp}_{uuid.uuid4().hex[:8]}{file_extension}"
+    
+    return Path(upload_dir) / new_filename
+
+
+async def save_audio_stream(
+    chunks: AsyncIterator[bytes],
+    filename: str,
+    upload_dir: str,
+    max_bytes: int
+) -> dict:
     """
-    Save uploaded audio file
+    Stream an upload to disk chunk by chunk
+    
+    The size limit is enforced while receiving and the SHA-256 is computed on
+    the fly, so memory use is bounded by the chunk size.
     
     Args:
-        file_content: Audio file bytes
+        chunks: Async iterator of file content blocks
         filename: Original filename
         upload_dir: Directory to save uploads
+        max_bytes: Maximum accepted file size
         
     Returns:
-        Path to saved file
+        dict with 'path', 'size' and 'sha256'
+        
+    Raises:
+        FileTooLargeError: If the upload exceeds max_bytes (nothing is kept)
     """
-    # Create unique filename with timestamp
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    file_extension = Path(filename).suffix
-    new_filename = f"meeting_{timestamp}{file_extension}"
+    file_path = _new_audio_path(filename, upload_dir)
+    await aiofiles.os.makedirs(upload_dir, exist_ok=True)
+    partial_path = file_path.with_name(file_path.name + ".part")
+    digest = hashlib.sha256()
+    size = 0
     
-    file_path = Path(upload_dir) / new_filename
+    try:
+        async with aiofiles.open(partial_path, 'wb') as f:
+            async for chunk in chunks:
+                size += len(chunk)
+                if size > max_bytes:
+                    raise FileTooLargeError(f"Upload exceeds {max_bytes} bytes")
+                digest.update(chunk)
+                await f.write(chunk)
+        await aiofiles.os.replace(partial_path, file_path)
+    except BaseException:
+        if await aiofiles.os.path.exists(partial_path):
+            await aiofiles.os.remove(partial_path)
+        raise
     
-    # Create directory if it doesn't exist
-    file_path.parent.mkdir(parents=True, exist_ok=True)
+    return {"path": str(file_path), "size": size, "sha256": digest.hexdigest()}
+
+
+async def iter_upload_file(upload_file, chunk_size: int) -> AsyncIterator[bytes]:
+    """
+    Read a FastAPI UploadFile in fixed-size blocks
     
-    # Save file
-    async with aiofiles.open(file_path, 'wb') as f:
-        await f.write(file_content)
+    Args:
+        upload_file: fastapi.UploadFile
+        chunk_size: Bytes per block
+        
+    Yields:
+        File content blocks
+    """
+    while True:
+        chunk = await upload_file.read(chunk_size)
+        if not chunk:
+            break
+        yield chunk
+
+
+def file_sha256(file_path: str, chunk_size: int = 1024 * 1024) -> str:
+    """
+    Compute the SHA-256 of a file without reading it into memory at once
     
-    return str(file_path)
+    Args:
+        file_path: Path to the file
+        chunk_size: Bytes read per iteration
+        
+    Returns:
+        Hex digest
+    """
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for block in iter(lambda: f.read(chunk_size), b''):
+            digest.update(block)
+    return digest.hexdigest()
 
 
 def validate_audio_file(filename: str, allowed_formats: list) -> bool:
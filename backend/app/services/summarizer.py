@@ -0,0 +1,198 @@
+"""Vectorized extractive summarization (TF-IDF and TextRank)
+
+The transcript is split and tokenized once into a SentenceIndex: the
+sentence texts plus a sparse sentence x term count matrix. Sentence scores
+come from sparse matrix products instead of per-word Python loops, and the
+same index (and scores) are reused to pick the summary, key points and
+action items.
+"""
+import os
+import re
+import numpy as np
+from scipy import sparse
+from dotenv import load_dotenv
+
+from app.services.nlp import STOP_WORDS, MAX_LIST_ITEMS
+from app.services.phrase_matcher import get_matcher, group_by_span
+
+load_dotenv()
+
+SUMMARY_SENTENCES = int(os.getenv("SUMMARY_SENTENCES", "3"))
+TEXTRANK_DAMPING = 0.85
+TEXTRANK_MAX_ITERATIONS = 100
+TEXTRANK_TOLERANCE = 1e-6
+
+SENTENCE_PATTERN = re.compile(r'[^.!?]+')
+# Words in any script: letters, digits and apostrophes (\w without "_")
+TOKEN_PATTERN = re.compile(r"(?:[^\W_]|')+", re.UNICODE)
+
+
+class SentenceIndex:
+    """Sentences of a transcript and their sparse term counts"""
+
+    def __init__(self, text: str, min_words: int = 4):
+        self.sentences = []
+        self.starts = []  # character span of each sentence in the text
+        self.ends = []
+        lengths = []
+        vocabulary = {}
+        indices = []
+        indptr = [0]
+
+        for match in SENTENCE_PATTERN.finditer(text):
+            sentence = match.group().strip()
+            lowered = sentence.lower()
+            tokens = TOKEN_PATTERN.findall(lowered)
+            if len(tokens) < min_words:
+                continue
+
+            self.sentences.append(sentence)
+            self.starts.append(match.start())
+            self.ends.append(match.end())
+            lengths.append(len(tokens))
+            for token in tokens:
+                if token not in STOP_WORDS:
+                    indices.append(vocabulary.setdefault(token, len(vocabulary)))
+            indptr.append(len(indices))
+
+        self.vocabulary = vocabulary
+        self.lengths = np.array(lengths, dtype=np.int32)
+        counts = sparse.csr_matrix(
+            (np.ones(len(indices), dtype=np.float32), np.array(indices, dtype=np.int32), np.array(indptr, dtype=np.int32)),
+            shape=(len(self.sentences), len(vocabulary))
+        )
+        counts.sum_duplicates()
+        self.counts = counts
+
+    def __len__(self) -> int:
+        return len(self.sentences)
+
+    def tfidf(self, corpus=None) -> sparse.csr_matrix:
+        """
+        L2-normalized TF-IDF rows
+
+        IDF comes from the corpus of all transcripts when a CorpusIndex with
+        enough documents is given, otherwise sentences are the documents.
+        """
+        idf = corpus.idf(list(self.vocabulary)) if corpus is not None else None
+        if idf is None:
+            n = len(self)
+            df = np.bincount(self.counts.indices, minlength=self.counts.shape[1])
+            idf = np.log((1 + n) / (1 + df)) + 1.0
+
+        weights = self.counts.multiply(idf.astype(np.float32)).tocsr()
+        norms = np.sqrt(np.asarray(weights.multiply(weights).sum(axis=1)).ravel())
+        norms[norms == 0] = 1.0
+        return sparse.diags(1.0 / norms).dot(weights).tocsr()
+
+    def cue_sentences(self, text: str, kind: str, language: str = None, profile: str = None) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Sentences containing lexicon phrases, from one scan of the text
+
+        Returns:
+            (sentence indices, total weight of the distinct phrases in each)
+        """
+        grouped = group_by_span(get_matcher(kind, language, profile).find(text), self.starts, self.ends)
+        ids = np.array(sorted(grouped), dtype=np.int64)
+        weights = np.array([sum({hit.phrase: hit.weight for hit in grouped[i]}.values()) for i in ids])
+        return ids, weights
+
+
+def tfidf_scores(index: SentenceIndex, corpus=None) -> np.ndarray:
+    """Cosine similarity of each sentence to the transcript's TF-IDF centroid"""
+    weights = index.tfidf(corpus)
+    centroid = np.asarray(weights.mean(axis=0)).ravel()
+    return weights.dot(centroid)
+
+
+def textrank_scores(index: SentenceIndex, corpus=None) -> np.ndarray:
+    """
+    PageRank over the sentence cosine-similarity graph
+
+    The similarity matrix S = W W^T (minus its diagonal) is never built: every
+    product with it is taken as W (W^T x), so each iteration costs O(nnz) rather
+    than O(sentences^2) on long transcripts.
+    """
+    n = len(index)
+    weights = index.tfidf(corpus).astype(np.float64)
+    weights_t = weights.T.tocsr()
+    self_similarity = np.asarray(weights.multiply(weights).sum(axis=1)).ravel()
+
+    def similarity_dot(x: np.ndarray) -> np.ndarray:
+        return np.maximum(weights.dot(weights_t.dot(x)) - self_similarity * x, 0.0)
+
+    # Sentences sharing no terms with any other sentence have no out-edges
+    out_weight = similarity_dot(np.ones(n))
+    dangling = out_weight <= 1e-9
+    out_weight[dangling] = 1.0
+
+    rank = np.full(n, 1.0 / n)
+    for _ in range(TEXTRANK_MAX_ITERATIONS):
+        # Rank flows along similarity edges in proportion to edge weight
+        flow = similarity_dot(np.where(dangling, 0.0, rank / out_weight))
+        leaked = rank[dangling].sum() / n
+        updated = (1 - TEXTRANK_DAMPING) / n + TEXTRANK_DAMPING * (flow + leaked)
+        converged = np.abs(updated - rank).sum() < TEXTRANK_TOLERANCE
+        rank = updated
+        if converged:
+            break
+    return rank
+
+
+SCORERS = {
+    "tfidf": tfidf_scores,
+    "textrank": textrank_scores,
+}
+
+
+def _top_in_order(candidates: np.ndarray, scores: np.ndarray, limit: int) -> np.ndarray:
+    """Highest-scoring candidates, returned in transcript order"""
+    if len(candidates) > limit:
+        best = np.argpartition(-scores, limit - 1)[:limit]
+        candidates = candidates[best]
+    return np.sort(candidates)
+
+
+def summarize(transcript: str, method: str = "tfidf", language: str = None, profile: str = None, corpus=None) -> dict:
+    """
+    Extractive summary scored with a vectorized ranking method
+
+    Args:
+        transcript: Meeting transcript text
+        method: One of SCORERS ('tfidf' or 'textrank')
+        language: Transcript language, selects the cue-phrase lexicons
+        profile: Team lexicon profile
+        corpus: CorpusIndex for corpus-wide IDF (optional)
+
+    Returns:
+        dict with 'summary', 'key_points', and 'action_items'
+    """
+    index = SentenceIndex(transcript)
+
+    if not len(index):
+        return {
+            "summary": "No content to summarize",
+            "key_points": ["No content available"],
+            "action_items": ["No action items found"]
+        }
+
+    scores = SCORERS[method](index, corpus)
+    sentences = index.sentences
+
+    summary_ids = _top_in_order(np.arange(len(index)), scores, SUMMARY_SENTENCES)
+
+    # Key points and action items: longer sentences with cue phrases, ranked by
+    # phrase weight with the sentence score (scaled to [0, 1]) breaking ties
+    scaled = scores / scores.max() if scores.max() > 0 else scores
+    lists = {}
+    for kind in ("key_points", "action_items"):
+        ids, weights = index.cue_sentences(transcript, kind, language, profile)
+        keep = index.lengths[ids] > 5
+        ids, weights = ids[keep], weights[keep]
+        lists[kind] = [sentences[i] for i in _top_in_order(ids, weights + scaled[ids], MAX_LIST_ITEMS)]
+
+    return {
+        "summary": '. '.join(sentences[i] for i in summary_ids) + '.',
+        "key_points": lists["key_points"] or ["No specific key points identified"],
+        "action_items": lists["action_items"] or ["No specific action items identified"]
+    }
@@ -0,0 +1,227 @@
+"""Memoized summaries: in-process LRU in front of the summary_cache table
+
+A summary is fully determined by the cleaned transcript, the summarizer,
+its settings and its version, so results are stored under a hash of all
+four. Settings include the language, lexicon profile and lexicon file
+versions, the output sizes, and for the IDF-weighted methods the corpus
+version. A changed transcript, edited lexicon, grown corpus or bumped
+SUMMARIZER_VERSIONS entry therefore never matches an old entry; superseded
+rows for the same transcript and method are replaced when the new result
+is stored.
+"""
+import os
+import json
+import time
+import hashlib
+from collections import OrderedDict
+from typing import Optional, NamedTuple
+from sqlalchemy import select, delete, func
+from sqlalchemy.ext.asyncio import AsyncSession
+from dotenv import load_dotenv
+
+from app.database import IS_SQLITE
+from app.models import SummaryCacheEntry
+from app.services.nlp import generate_summary, SUMMARIZER, SUMMARIZER_VERSIONS, MAX_LIST_ITEMS
+from app.services.lexicons import normalize_language, lexicon_version, LEXICON_PROFILE
+from app.services.summarizer import SUMMARY_SENTENCES
+from app.services.corpus import CORPUS_IDF_MIN_DOCUMENTS
+from app.metrics import SUMMARY_CACHE_LOOKUPS
+
+if IS_SQLITE:
+    from sqlalchemy.dialects.sqlite import insert
+else:
+    from sqlalchemy.dialects.postgresql import insert
+
+load_dotenv()
+
+SUMMARY_CACHE_ENABLED = os.getenv("SUMMARY_CACHE_ENABLED", "true").lower() == "true"
+SUMMARY_CACHE_ENTRIES = int(os.getenv("SUMMARY_CACHE_ENTRIES", "256"))  # in-process LRU size
+
+
+def transcript_hash(transcript: str) -> str:
+    return hashlib.sha256(transcript.encode("utf-8")).hexdigest()
+
+
+def summary_params(
+    method: str,
+    language: Optional[str],
+    profile: Optional[str],
+    corpus=None,
+    hierarchical: Optional[dict] = None
+) -> dict:
+    """Everything besides the transcript that changes a summary"""
+    language = normalize_language(language)
+    profile = profile or LEXICON_PROFILE
+    uses_corpus = method != "heuristic" and corpus is not None and corpus.documents >= CORPUS_IDF_MIN_DOCUMENTS
+    params = {
+        "version": SUMMARIZER_VERSIONS[method],
+        "language": language,
+        "profile": profile,
+        "lexicons": lexicon_version(language, profile),
+        "sentences": SUMMARY_SENTENCES,
+        "max_items": MAX_LIST_ITEMS,
+        "corpus": corpus.version if uses_corpus else None,
+    }
+    # Section settings of a map-reduce summary (app.services.sections)
+    if hierarchical is not None:
+        params["hierarchical"] = hierarchical
+    return params
+
+
+class SummaryCache:
+    """LRU of recent summaries plus hit counters; the table is the shared second level"""
+
+    def __init__(self, max_entries: int, enabled: bool = True):
+        self.max_entries = max_entries
+        self.enabled = enabled
+        self._entries = OrderedDict()  # key -> (transcript hash, result, compute seconds)
+        self.memory_hits = 0
+        self.db_hits = 0
+        self.misses = 0
+        self.saved_seconds = 0.0
+        self.computed_seconds = 0.0
+
+    @staticmethod
+    def make_key(text_hash: str, method: str, params: dict) -> str:
+        material = json.dumps({"transcript": text_hash, "method": method, "params": params}, sort_keys=True)
+        return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+    def _remember(self, key: str, text_hash: str, result: dict, seconds: float):
+        self._entries[key] = (text_hash, result, seconds)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    async def get(self, db: AsyncSession, key: str) -> Optional[dict]:
+        """Cached result for a key, from memory or the table"""
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+            self.memory_hits += 1
+            SUMMARY_CACHE_LOOKUPS.labels("memory").inc()
+            self.saved_seconds += entry[2]
+            return entry[1]
+
+        row = (await db.execute(select(SummaryCacheEntry).where(SummaryCacheEntry.key == key))).scalar_one_or_none()
+        if row is None:
+            self.misses += 1
+            SUMMARY_CACHE_LOOKUPS.labels("miss").inc()
+            return None
+
+        result = json.loads(row.result)
+        self._remember(key, row.transcript_hash, result, row.compute_seconds)
+        self.db_hits += 1
+        SUMMARY_CACHE_LOOKUPS.labels("db").inc()
+        self.saved_seconds += row.compute_seconds
+        return result
+
+    async def put(self, db: AsyncSession, key: str, text_hash: str, method: str, result: dict, seconds: float):
+        """Store a result (in the caller's transaction), replacing superseded entries"""
+        self._remember(key, text_hash, result, seconds)
+        self.computed_seconds += seconds
+
+        await db.execute(
+            delete(SummaryCacheEntry).where(
+                SummaryCacheEntry.transcript_hash == text_hash,
+                SummaryCacheEntry.method == method,
+                SummaryCacheEntry.key != key
+            )
+        )
+        await db.execute(
+            insert(SummaryCacheEntry).values(
+                key=key, transcript_hash=text_hash, method=method,
+                result=json.dumps(result), compute_seconds=seconds
+            ).on_conflict_do_nothing(index_elements=[SummaryCacheEntry.key])
+        )
+
+    async def forget(self, db: AsyncSession, transcript: str):
+        """Drop every entry for a transcript that was replaced or deleted (in the caller's transaction)"""
+        text_hash = transcript_hash(transcript)
+        for key in [k for k, entry in self._entries.items() if entry[0] == text_hash]:
+            del self._entries[key]
+        await db.execute(delete(SummaryCacheEntry).where(SummaryCacheEntry.transcript_hash == text_hash))
+
+    async def stats(self, db: AsyncSession) -> dict:
+        """Hit counters and compute time saved in this process, and the table size"""
+        rows = await db.scalar(select(func.count()).select_from(SummaryCacheEntry))
+        lookups = self.memory_hits + self.db_hits + self.misses
+        return {
+            "enabled": self.enabled,
+            "memory_entries": len(self._entries),
+            "max_memory_entries": self.max_entries,
+            "stored_entries": rows,
+            "memory_hits": self.memory_hits,
+            "db_hits": self.db_hits,
+            "misses": self.misses,
+            "hit_rate": (self.memory_hits + self.db_hits) / lookups if lookups else None,
+            "saved_seconds": self.saved_seconds,
+            "computed_seconds": self.computed_seconds,
+        }
+
+
+summary_cache = SummaryCache(SUMMARY_CACHE_ENTRIES, SUMMARY_CACHE_ENABLED)
+
+
+class SummaryLookup(NamedTuple):
+    """Result of a cache lookup; key is None when caching is off"""
+    key: Optional[str]
+    transcript_hash: Optional[str]
+    method: str
+    result: Optional[dict]
+
+
+async def lookup_summary(
+    db: AsyncSession,
+    transcript: str,
+    method: str = None,
+    language: str = None,
+    profile: str = None,
+    corpus=None,
+    hierarchical: Optional[dict] = None
+) -> SummaryLookup:
+    """
+    Look up a summary; on a miss, pass the lookup to store_summary with the computed result
+
+    hierarchical holds the section settings of a map-reduce summary, which
+    is cached apart from a one-pass summary of the same transcript.
+    """
+    method = method or SUMMARIZER
+    if not summary_cache.enabled or method not in SUMMARIZER_VERSIONS:
+        return SummaryLookup(None, None, method, None)
+
+    text_hash = transcript_hash(transcript)
+    key = summary_cache.make_key(text_hash, method, summary_params(method, language, profile, corpus, hierarchical))
+    return SummaryLookup(key, text_hash, method, await summary_cache.get(db, key))
+
+
+async def store_summary(db: AsyncSession, lookup: SummaryLookup, result: dict, seconds: float):
+    """Cache a computed summary (in the caller's transaction)"""
+    if lookup.key is not None:
+        await summary_cache.put(db, lookup.key, lookup.transcript_hash, lookup.method, result, seconds)
+
+
+async def cached_summary(
+    db: AsyncSession,
+    transcript: str,
+    method: str = None,
+    language: str = None,
+    profile: str = None,
+    corpus=None,
+    executor=None
+) -> tuple[dict, bool]:
+    """
+    generate_summary, memoized
+
+    A new result is added to the session; the caller's commit persists it.
+
+    Returns:
+        (summary dict, True if it came from the cache)
+    """
+    lookup = await lookup_summary(db, transcript, method, language, profile, corpus)
+    if lookup.result is not None:
+        return lookup.result, True
+
+    started = time.perf_counter()
+    result = await generate_summary(transcript, lookup.method, language, profile, corpus, executor)
+    await store_summary(db, lookup, result, time.perf_counter() - started)
+    return result, False
@@ -0,0 +1,124 @@
+"""Content-addressed on-disk cache of transcription results
+
+Entries are keyed by (audio hash, model name, decode options), so the same
+recording uploaded twice is transcribed once. Each entry is one JSON file;
+when the directory grows past its size limit the least recently used
+entries are removed.
+"""
+import os
+import json
+import hashlib
+import threading
+from pathlib import Path
+from typing import Optional
+
+
+class TranscriptCache:
+    """Size-bounded transcription result cache with hit/miss counters"""
+
+    def __init__(self, cache_dir: str, max_mb: float, enabled: bool = True):
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = int(max_mb * 1024 * 1024)
+        self.enabled = enabled
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(audio_hash: str, model_name: str, options: dict) -> str:
+        """Build the cache key for an audio file and decode settings"""
+        material = json.dumps(
+            {"audio": audio_hash, "model": model_name, "options": options},
+            sort_keys=True
+        )
+        return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / key[:2] / f"{key}.json"
+
+    def get(self, key: str) -> Optional[dict]:
+        """
+        Look up a cached result
+
+        Args:
+            key: Cache key from make_key
+
+        Returns:
+            The cached transcription result, or None on a miss
+        """
+        if not self.enabled:
+            return None
+
+        path = self._path(key)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                result = json.load(f)
+            os.utime(path)  # mtime doubles as last-access time for LRU eviction
+        except (OSError, ValueError):
+            with self._lock:
+                self.misses += 1
+            return None
+
+        with self._lock:
+            self.hits += 1
+        return result
+
+    def put(self, key: str, result: dict):
+        """Store a result and evict old entries if over the size limit"""
+        if not self.enabled:
+            return
+
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        # Write then rename so readers never see a partial entry
+        tmp_path = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(result, f)
+        os.replace(tmp_path, path)
+
+        self._evict()
+
+    def _entries(self) -> list[os.DirEntry]:
+        """All cache entry files"""
+        if not self.cache_dir.exists():
+            return []
+        entries = []
+        for shard in os.scandir(self.cache_dir):
+            if shard.is_dir():
+                entries.extend(e for e in os.scandir(shard.path) if e.name.endswith(".json"))
+        return entries
+
+    def _evict(self):
+        """Remove least recently used entries until within max_bytes"""
+        entries = [(e.stat().st_mtime, e.stat().st_size, e.path) for e in self._entries()]
+        total = sum(size for _, size, _ in entries)
+        if total <= self.max_bytes:
+            return
+
+        for _, size, path in sorted(entries):
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total -= size
+            with self._lock:
+                self.evictions += 1
+            if total <= self.max_bytes:
+                break
+
+    def stats(self) -> dict:
+        """Cache size and hit/miss counters for this process"""
+        entries = self._entries()
+        lookups = self.hits + self.misses
+        return {
+            "enabled": self.enabled,
+            "entries": len(entries),
+            "size_mb": sum(e.stat().st_size for e in entries) / (1024 * 1024),
+            "max_mb": self.max_bytes / (1024 * 1024),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else None,
+            "evictions": self.evictions,
+        }
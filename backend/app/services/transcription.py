@@ -1,36 +1,121 @@
 """Local Whisper transcription service (FREE)"""
 import os
+import time
 import asyncio
+import threading
 from pathlib import Path
-import whisper
-import librosa
+from typing import AsyncIterator, Callable, Optional
 from dotenv import load_dotenv
 
+from app.services.chunking import (
+    ChunkedTranscriber, _normalize_segments, find_chunk_boundaries, stitch_chunks
+)
+from app.services.audio import decode_audio, audio_duration
+from app.services.model_registry import ModelRegistry
+from app.services.transcript_cache import TranscriptCache
+from app.services.storage import file_sha256
+from app.metrics import stage_timer, observe_transcription
+from app.profiling import profiled
+
 load_dotenv()
 
-# Load Whisper model (cached after first load)
+# Whisper models are loaded on first use and kept under a memory budget
 WHISPER_MODEL_NAME = os.getenv("WHISPER_MODEL", "base")
+WHISPER_MODELS = os.getenv("WHISPER_MODELS", "tiny,base,small").split(",")
+WHISPER_MEMORY_BUDGET_MB = float(os.getenv("WHISPER_MEMORY_BUDGET_MB", "2048"))
 DEVICE = os.getenv("DEVICE", "cpu")
 
-print(f"Loading Whisper model '{WHISPER_MODEL_NAME}' on {DEVICE}...")
-model = whisper.load_model(WHISPER_MODEL_NAME, device=DEVICE)
-print("✅ Whisper model loaded successfully!")
+if WHISPER_MODEL_NAME not in WHISPER_MODELS:
+    WHISPER_MODELS.append(WHISPER_MODEL_NAME)
+
+model_registry = ModelRegistry(DEVICE, WHISPER_MEMORY_BUDGET_MB, WHISPER_MODELS)
+
+# Chunked mode: split long recordings and transcribe chunks in parallel processes
+TRANSCRIBE_MODE = os.getenv("TRANSCRIBE_MODE", "single")  # single | chunked
+CHUNK_SECONDS = float(os.getenv("CHUNK_SECONDS", "300"))
+CHUNK_OVERLAP_SECONDS = float(os.getenv("CHUNK_OVERLAP_SECONDS", "2"))
+TRANSCRIBE_WORKERS = int(os.getenv("TRANSCRIBE_WORKERS", "2"))
+
+chunked_transcriber = ChunkedTranscriber(DEVICE, TRANSCRIBE_WORKERS, WHISPER_MEMORY_BUDGET_MB)
+
+# Transcription results cached by (audio hash, model, decode options)
+transcript_cache = TranscriptCache(
+    os.getenv("TRANSCRIPTION_CACHE_DIR", "../data/cache/transcriptions"),
+    float(os.getenv("TRANSCRIPTION_CACHE_MAX_MB", "512")),
+    os.getenv("TRANSCRIPTION_CACHE_ENABLED", "true").lower() == "true"
+)
+
+# Streaming: audio is decoded in windows this long so the first text arrives quickly
+STREAM_CHUNK_SECONDS = float(os.getenv("STREAM_CHUNK_SECONDS", "30"))
+
+
+def resolve_model_name(model_name: Optional[str]) -> str:
+    """
+    Validate a requested model name, falling back to WHISPER_MODEL
+    
+    Raises:
+        ValueError: If the model is not enabled in WHISPER_MODELS
+    """
+    name = model_name or WHISPER_MODEL_NAME
+    if name not in WHISPER_MODELS:
+        raise ValueError(f"Model '{name}' is not enabled. Allowed: {', '.join(WHISPER_MODELS)}")
+    return name
+
+
+def _decode_options() -> dict:
+    """Settings that change the transcription output (part of the cache key)"""
+    options = {"mode": TRANSCRIBE_MODE, "fp16": False}
+    if TRANSCRIBE_MODE == "chunked":
+        options.update(chunk_seconds=CHUNK_SECONDS, overlap_seconds=CHUNK_OVERLAP_SECONDS)
+    return options
+
+
+async def _cache_key(audio_file_path: str, model_name: str, audio_hash: Optional[str]) -> str:
+    """Cache key for a file, hashing it if the caller has no hash yet"""
+    if audio_hash is None:
+        loop = asyncio.get_event_loop()
+        with stage_timer("transcribe", "hash"):
+            audio_hash = await loop.run_in_executor(None, file_sha256, audio_file_path)
+    return transcript_cache.make_key(audio_hash, model_name, _decode_options())
 
 
-async def transcribe_audio(audio_file_path: str) -> dict:
+async def transcribe_audio(
+    audio_file_path: str,
+    progress: Optional[Callable[[float], None]] = None,
+    model_name: Optional[str] = None,
+    audio_hash: Optional[str] = None
+) -> dict:
     """
     Transcribe audio file using local Whisper model (FREE)
     
+    Results are cached by audio content, so duplicate uploads are served
+    without running Whisper again.
+    
     Args:
         audio_file_path: Path to the audio file
+        progress: Optional callback receiving the finished fraction (chunked mode)
+        model_name: Whisper model to use (default: WHISPER_MODEL)
+        audio_hash: SHA-256 of the file if already known
         
     Returns:
-        dict with 'text' and 'duration' keys
+        dict with 'text', 'duration', 'segments' and 'language' keys
     """
     try:
-        # Run transcription in thread pool to avoid blocking
+        model_name = resolve_model_name(model_name)
+        cache_key = await _cache_key(audio_file_path, model_name, audio_hash)
+        
+        # Run cache lookups and transcription in thread pool to avoid blocking
         loop = asyncio.get_event_loop()
-        result = await loop.run_in_executor(None, _transcribe_sync, audio_file_path)
+        with stage_timer("transcribe", "cache_lookup"):
+            cached = await loop.run_in_executor(None, transcript_cache.get, cache_key)
+        if cached:
+            return cached
+        
+        result = await loop.run_in_executor(
+            None, profiled(_transcribe_sync), audio_file_path, progress, model_name
+        )
+        with stage_timer("transcribe", "cache_store"):
+            await loop.run_in_executor(None, transcript_cache.put, cache_key, result)
         
         return result
     
@@ -38,39 +123,146 @@ async def transcribe_audio(audio_file_path: str) -> dict:
         raise Exception(f"Transcription failed: {str(e)}")
 
 
-def _transcribe_sync(audio_file_path: str) -> dict:
+def _transcribe_sync(
+    audio_file_path: str,
+    progress: Optional[Callable[[float], None]] = None,
+    model_name: str = WHISPER_MODEL_NAME
+) -> dict:
     """Synchronous transcription helper"""
-    # Get audio duration
-    duration = librosa.get_duration(path=audio_file_path)
+    # Decode once; duration and Whisper both read the cached samples
+    started = time.perf_counter()
+    with stage_timer("transcribe", "decode"):
+        audio = decode_audio(audio_file_path)
+    duration = audio_duration(audio)
+    
+    # Short recordings are not worth the pool round-trip
+    if TRANSCRIBE_MODE == "chunked" and duration > CHUNK_SECONDS * 1.5:
+        with stage_timer("transcribe", "inference"):
+            result = chunked_transcriber.transcribe(
+                audio, model_name, CHUNK_SECONDS, CHUNK_OVERLAP_SECONDS, progress
+            )
+        observe_transcription(model_name, "chunked", duration, time.perf_counter() - started)
+        return {
+            "text": result["text"],
+            "duration": duration,
+            "segments": result["segments"],
+            "language": result.get("language")
+        }
     
-    # Transcribe
-    result = model.transcribe(audio_file_path, fp16=False)
+    # Transcribe (the first use of a model includes loading it)
+    with stage_timer("transcribe", "inference"):
+        result = model_registry.get(model_name).transcribe(audio, fp16=False)
+    observe_transcription(model_name, "single", duration, time.perf_counter() - started)
     
     return {
         "text": result["text"],
-        "duration": duration
+        "duration": duration,
+        "segments": _normalize_segments(result["segments"]),
+        "language": result.get("language")
     }
 
 
-async def save_transcript(transcript_text: str, meeting_id: int, transcript_dir: str) -> str:
+async def stream_transcription(
+    audio_file_path: str,
+    model_name: Optional[str] = None,
+    audio_hash: Optional[str] = None
+) -> AsyncIterator[dict]:
     """
-    Save transcript to a text file
+    Transcribe audio and yield segments as soon as they are decoded
+    
+    A cached full transcription of the same audio is replayed instead, and
+    a completed stream is cached like transcribe_audio's results.
     
     Args:
-        transcript_text: The transcript text
-        meeting_id: Meeting ID
-        transcript_dir: Directory to save transcripts
+        audio_file_path: Path to the audio file
+        model_name: Whisper model to use (default: WHISPER_MODEL)
+        audio_hash: SHA-256 of the file if already known
         
-    Returns:
-        Path to saved transcript file
+    Yields:
+        {'event': 'start', 'duration': ...} first, then one
+        {'event': 'segment', 'start', 'end', 'text', 'avg_logprob'} per segment,
+        and last {'event': 'transcript', 'text', 'duration', 'segments',
+        'language'} with the whole result
     """
-    transcript_path = Path(transcript_dir) / f"meeting_{meeting_id}_transcript.txt"
+    loop = asyncio.get_running_loop()
+    queue: asyncio.Queue = asyncio.Queue()
+    cancelled = threading.Event()
+    model_name = resolve_model_name(model_name)
+    
+    cache_key = await _cache_key(audio_file_path, model_name, audio_hash)
+    cached = await loop.run_in_executor(None, transcript_cache.get, cache_key)
+    if cached:
+        yield {"event": "start", "duration": cached["duration"]}
+        for segment in cached["segments"]:
+            yield {"event": "segment", **segment}
+        yield {"event": "transcript", **cached}
+        return
     
-    # Create directory if it doesn't exist
-    transcript_path.parent.mkdir(parents=True, exist_ok=True)
+    def emit(item):
+        loop.call_soon_threadsafe(queue.put_nowait, item)
     
-    # Save transcript
-    with open(transcript_path, "w", encoding="utf-8") as f:
-        f.write(transcript_text)
+    def produce():
+        try:
+            language = _stream_sync(audio_file_path, model_name, emit, cancelled)
+            emit({"event": "language", "language": language})
+            emit(None)
+        except Exception as e:
+            emit(e)
     
-    return str(transcript_path)
+    loop.run_in_executor(None, produce)
+    
+    result = {"text": "", "duration": None, "segments": [], "language": None}
+    try:
+        while True:
+            item = await queue.get()
+            if item is None:
+                break
+            if isinstance(item, Exception):
+                raise Exception(f"Transcription failed: {str(item)}")
+            if item["event"] == "language":
+                result["language"] = item["language"]
+                continue
+            if item["event"] == "start":
+                result["duration"] = item["duration"]
+            else:
+                result["segments"].append({key: value for key, value in item.items() if key != "event"})
+            yield item
+    finally:
+        # Stop decoding after the current window if the consumer went away early
+        cancelled.set()
+    
+    result["text"] = "".join(segment["text"] for segment in result["segments"])
+    await loop.run_in_executor(None, transcript_cache.put, cache_key, result)
+    yield {"event": "transcript", **result}
+
+
+def _stream_sync(
+    audio_file_path: str,
+    model_name: str,
+    emit: Callable[[dict], None],
+    cancelled: threading.Event
+) -> Optional[str]:
+    """Synchronous streaming helper: transcribe window by window, returning the detected language"""
+    model = model_registry.get(model_name)
+    audio = decode_audio(audio_file_path)
+    emit({"event": "start", "duration": audio_duration(audio)})
+    
+    previous_text = ""
+    language = None
+    for chunk in find_chunk_boundaries(audio, STREAM_CHUNK_SECONDS, 1.0, search_seconds=5.0):
+        if cancelled.is_set():
+            return language
+        
+        # Condition each window on the tail of the previous one, like Whisper does internally
+        result = model.transcribe(
+            audio[chunk["start"]:chunk["end"]],
+            fp16=False,
+            initial_prompt=previous_text[-200:] or None
+        )
+        stitched = stitch_chunks([{**chunk, "segments": _normalize_segments(result["segments"])}])
+        language = language or result.get("language")
+        
+        for segment in stitched["segments"]:
+            emit({"event": "segment", **segment})
+        previous_text = stitched["text"] or previous_text
+    return language
@@ -0,0 +1,226 @@
+"""Resumable chunked upload sessions for large recordings
+
+A session owns a directory holding the target file, pre-sized to the final
+length. Each numbered chunk is written straight to its offset in that file,
+so chunks can arrive in any order and in parallel, and finalizing is a
+rename rather than a concatenation. A marker file per chunk records which
+chunks are complete.
+"""
+import os
+import json
+import time
+import uuid
+import shutil
+import aiofiles
+from pathlib import Path
+from datetime import datetime
+from typing import AsyncIterator
+from dotenv import load_dotenv
+
+from app.services.storage import _new_audio_path, file_sha256
+
+load_dotenv()
+
+UPLOAD_SESSION_DIR = os.getenv("UPLOAD_SESSION_DIR", "../data/uploads")
+MAX_SESSION_UPLOAD_MB = int(os.getenv("MAX_SESSION_UPLOAD_MB", "2048"))
+UPLOAD_SESSION_CHUNK_MB = int(os.getenv("UPLOAD_SESSION_CHUNK_MB", "8"))
+UPLOAD_SESSION_TTL_HOURS = float(os.getenv("UPLOAD_SESSION_TTL_HOURS", "24"))
+
+# Sessions may choose their chunk size within these bounds
+MIN_CHUNK_BYTES = 256 * 1024
+MAX_CHUNK_BYTES = 64 * 1024 * 1024
+
+
+class UploadSessionNotFound(Exception):
+    """Raised for unknown or expired upload ids"""
+
+
+class UploadSessionError(Exception):
+    """Raised for invalid chunk or session operations"""
+
+
+def _session_dir(upload_id: str) -> Path:
+    # Ids are generated by us; reject anything that could escape the directory
+    if not upload_id.isalnum():
+        raise UploadSessionNotFound(upload_id)
+    return Path(UPLOAD_SESSION_DIR) / upload_id
+
+
+def create_session(filename: str, title: str, total_size: int, chunk_size: int = None) -> dict:
+    """
+    Start a new upload session
+
+    Args:
+        filename: Original filename
+        title: Meeting title
+        total_size: Final file size in bytes
+        chunk_size: Bytes per chunk (default UPLOAD_SESSION_CHUNK_MB)
+
+    Returns:
+        Session dict
+    """
+    if total_size <= 0:
+        raise UploadSessionError("total_size must be positive")
+    if total_size > MAX_SESSION_UPLOAD_MB * 1024 * 1024:
+        raise UploadSessionError(f"File too large. Max size: {MAX_SESSION_UPLOAD_MB}MB")
+
+    chunk_size = chunk_size or UPLOAD_SESSION_CHUNK_MB * 1024 * 1024
+    if not MIN_CHUNK_BYTES <= chunk_size <= MAX_CHUNK_BYTES:
+        raise UploadSessionError(f"chunk_size must be between {MIN_CHUNK_BYTES} and {MAX_CHUNK_BYTES} bytes")
+
+    cleanup_expired_sessions()
+
+    session = {
+        "upload_id": uuid.uuid4().hex,
+        "filename": filename,
+        "title": title,
+        "total_size": total_size,
+        "chunk_size": chunk_size,
+        "total_chunks": -(-total_size // chunk_size),
+        "created_at": datetime.utcnow().isoformat(),
+    }
+
+    session_dir = _session_dir(session["upload_id"])
+    (session_dir / "chunks").mkdir(parents=True)
+
+    # Pre-size the target file (sparse where supported) so chunks land in place
+    with open(session_dir / "data", "wb") as f:
+        f.truncate(total_size)
+    with open(session_dir / "session.json", "w", encoding="utf-8") as f:
+        json.dump(session, f)
+
+    return session
+
+
+def load_session(upload_id: str) -> dict:
+    """Load a session by id"""
+    try:
+        with open(_session_dir(upload_id) / "session.json", "r", encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        raise UploadSessionNotFound(upload_id)
+
+
+def session_status(session: dict) -> dict:
+    """
+    Session details with received and missing chunk numbers
+
+    Args:
+        session: Session dict
+
+    Returns:
+        Session dict extended with 'received_chunks' and 'missing_chunks'
+    """
+    chunk_dir = _session_dir(session["upload_id"]) / "chunks"
+    received = sorted(int(name) for name in os.listdir(chunk_dir) if name.isdigit())
+    received_set = set(received)
+    missing = [i for i in range(session["total_chunks"]) if i not in received_set]
+    return {**session, "received_chunks": received, "missing_chunks": missing}
+
+
+def _chunk_length(session: dict, index: int) -> int:
+    """Expected length of a chunk (the last one may be short)"""
+    start = index * session["chunk_size"]
+    return min(session["chunk_size"], session["total_size"] - start)
+
+
+async def write_chunk(session: dict, index: int, blocks: AsyncIterator[bytes]) -> int:
+    """
+    Write one chunk at its offset in the session file
+
+    Re-sending a chunk overwrites it, so failed chunks can simply be retried.
+
+    Args:
+        session: Session dict
+        index: Zero-based chunk number
+        blocks: Async iterator of the chunk's content
+
+    Returns:
+        Number of bytes written
+    """
+    if not 0 <= index < session["total_chunks"]:
+        raise UploadSessionError(f"Chunk index must be between 0 and {session['total_chunks'] - 1}")
+
+    session_dir = _session_dir(session["upload_id"])
+    marker = session_dir / "chunks" / str(index)
+    expected = _chunk_length(session, index)
+    written = 0
+
+    # A chunk being rewritten is not complete until it is fully received again
+    if marker.exists():
+        marker.unlink()
+
+    async with aiofiles.open(session_dir / "data", "r+b") as f:
+        await f.seek(index * session["chunk_size"])
+        async for block in blocks:
+            written += len(block)
+            if written > expected:
+                raise UploadSessionError(f"Chunk {index} is larger than {expected} bytes")
+            await f.write(block)
+
+    if written != expected:
+        raise UploadSessionError(f"Chunk {index} is incomplete: got {written} of {expected} bytes")
+
+    marker.touch()
+    return written
+
+
+def finalize_session(session: dict, upload_dir: str) -> dict:
+    """
+    Move a complete upload into the audio directory
+
+    Args:
+        session: Session dict
+        upload_dir: Directory to save uploads
+
+    Returns:
+        dict with 'path', 'size' and 'sha256'
+    """
+    status = session_status(session)
+    if status["missing_chunks"]:
+        raise UploadSessionError(f"Missing chunks: {status['missing_chunks'][:20]}")
+
+    session_dir = _session_dir(session["upload_id"])
+    file_path = _new_audio_path(session["filename"], upload_dir)
+    file_path.parent.mkdir(parents=True, exist_ok=True)
+
+    # Same filesystem: a rename, no data is copied
+    try:
+        shutil.move(str(session_dir / "data"), str(file_path))
+    except FileNotFoundError:
+        # Completed concurrently by another request
+        raise UploadSessionNotFound(session["upload_id"])
+    shutil.rmtree(session_dir, ignore_errors=True)
+
+    return {
+        "path": str(file_path),
+        "size": session["total_size"],
+        "sha256": file_sha256(str(file_path)),
+    }
+
+
+def abort_session(upload_id: str):
+    """Delete a session and its partial data"""
+    session_dir = _session_dir(upload_id)
+    if not session_dir.exists():
+        raise UploadSessionNotFound(upload_id)
+    shutil.rmtree(session_dir, ignore_errors=True)
+
+
+def cleanup_expired_sessions():
+    """Remove sessions older than UPLOAD_SESSION_TTL_HOURS"""
+    root = Path(UPLOAD_SESSION_DIR)
+    if not root.exists():
+        return
+
+    cutoff = time.time() - UPLOAD_SESSION_TTL_HOURS * 3600
+    for entry in os.scandir(root):
+        if not entry.is_dir():
+            continue
+        # The chunks directory changes whenever a chunk completes
+        try:
+            last_activity = os.stat(os.path.join(entry.path, "chunks")).st_mtime
+        except OSError:
+            last_activity = entry.stat().st_mtime
+        if last_activity < cutoff:
+            shutil.rmtree(entry.path, ignore_errors=True)
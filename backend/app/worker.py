@@ -0,0 +1,144 @@
+"""Job worker: pulls work from the durable job queue
+
+Workers run inside the API process (see JOB_WORKERS) or standalone:
+
+    cd backend && python -m app.worker --concurrency 2
+"""
+import os
+import socket
+import asyncio
+import argparse
+from typing import Optional
+from dotenv import load_dotenv
+
+from app.database import AsyncSessionLocal, init_db
+from app.services.jobs import (
+    JOB_HANDLERS, JOB_LEASE_SECONDS, JobContext,
+    claim_job, heartbeat, complete_job, fail_job
+)
+from app.metrics import InstrumentedThreadPool, QUEUE_WAIT_SECONDS, stage_timer, mark_process_dead
+from app.loop_monitor import LOOP_MONITOR_ENABLED, loop_monitor
+from app.logs import stop_logging
+
+load_dotenv()
+
+JOB_POLL_INTERVAL = float(os.getenv("JOB_POLL_INTERVAL", "1.0"))
+
+
+def make_worker_id(index: int = 0) -> str:
+    """Build a worker id that is unique across hosts and processes"""
+    return f"{socket.gethostname()}:{os.getpid()}:{index}"
+
+
+async def run_worker(worker_id: str, stop_event: asyncio.Event, kinds: Optional[list[str]] = None):
+    """
+    Claim and execute jobs until stop_event is set
+
+    Args:
+        worker_id: Unique worker id used as lease owner
+        stop_event: Set to request a graceful stop
+        kinds: Only process these job kinds (default: all registered kinds)
+    """
+    while not stop_event.is_set():
+        try:
+            async with AsyncSessionLocal() as db:
+                job = await claim_job(db, worker_id, kinds)
+        except Exception as e:
+            print(f"❌ Worker {worker_id} could not claim a job: {e}")
+            job = None
+
+        if job is None:
+            try:
+                await asyncio.wait_for(stop_event.wait(), timeout=JOB_POLL_INTERVAL)
+            except asyncio.TimeoutError:
+                pass
+            continue
+
+        await _execute(job, worker_id)
+
+
+async def _execute(job, worker_id: str):
+    """Run one claimed job under a heartbeat-renewed lease"""
+    ctx = JobContext(job)
+    handler = JOB_HANDLERS[job.kind]
+    if job.attempts == 1 and job.started_at and job.created_at:
+        QUEUE_WAIT_SECONDS.labels("jobs").observe((job.started_at - job.created_at).total_seconds())
+
+    async def run_handler():
+        with stage_timer("job", job.kind):
+            async with AsyncSessionLocal() as db:
+                return await handler(db, ctx)
+
+    task = asyncio.create_task(run_handler())
+    interval = JOB_LEASE_SECONDS / 3
+
+    # Renew the lease until the handler finishes
+    while not task.done():
+        await asyncio.wait({task}, timeout=interval)
+        if task.done():
+            break
+        try:
+            async with AsyncSessionLocal() as db:
+                owned = await heartbeat(db, ctx.job_id, worker_id, ctx.progress)
+        except Exception as e:
+            print(f"⚠️ Heartbeat for job {ctx.job_id} failed: {e}")
+            continue
+        if not owned:
+            print(f"⚠️ Lost lease on job {ctx.job_id}, abandoning it")
+            task.cancel()
+            return
+
+    async with AsyncSessionLocal() as db:
+        try:
+            result = task.result()
+        except Exception as e:
+            print(f"❌ Job {ctx.job_id} ({ctx.kind}) attempt {ctx.attempt} failed: {e}")
+            await fail_job(db, ctx.job_id, worker_id, str(e))
+        else:
+            await complete_job(db, ctx.job_id, worker_id, result)
+
+
+def start_workers(count: int, stop_event: asyncio.Event, kinds: Optional[list[str]] = None) -> list[asyncio.Task]:
+    """
+    Start worker loops in the running event loop
+
+    Args:
+        count: Number of concurrent workers
+        stop_event: Shared stop signal
+        kinds: Only process these job kinds
+
+    Returns:
+        The worker tasks
+    """
+    return [
+        asyncio.create_task(run_worker(make_worker_id(i), stop_event, kinds))
+        for i in range(count)
+    ]
+
+
+async def main(concurrency: int, kinds: Optional[list[str]]):
+    """Standalone worker entry point"""
+    # Reports into the API's /metrics through PROMETHEUS_MULTIPROC_DIR
+    asyncio.get_running_loop().set_default_executor(InstrumentedThreadPool("default"))
+    if LOOP_MONITOR_ENABLED:
+        loop_monitor.start()
+    await init_db()
+    stop_event = asyncio.Event()
+    print(f"✅ Worker started with {concurrency} slot(s)")
+
+    try:
+        await asyncio.gather(*start_workers(concurrency, stop_event, kinds))
+    finally:
+        stop_event.set()
+        loop_monitor.stop()
+        stop_logging()
+        mark_process_dead()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Process queued meeting jobs")
+    parser.add_argument("--concurrency", type=int, default=int(os.getenv("JOB_WORKERS", "1")))
+    parser.add_argument("--kinds", default=None, help="Comma-separated job kinds to process")
+    args = parser.parse_args()
+
+    asyncio.run(main(args.concurrency, args.kinds.split(",") if args.kinds else None))
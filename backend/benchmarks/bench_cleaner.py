@@ -0,0 +1,96 @@
+"""Benchmark the single-pass transcript cleaner against the old multi-pass one
+
+Usage (from backend/):
+    python -m benchmarks.bench_cleaner [--words 500000] [--repeat 5] [--file transcript.txt]
+"""
+import re
+import time
+import random
+import argparse
+
+from app.services.nlp import clean_transcript, clean_segments, segments_text
+
+
+def legacy_clean_transcript(text: str) -> str:
+    """The previous implementation: one re.sub per filler, then three more"""
+    filler_words = [
+        r'\bum\b', r'\buh\b', r'\blike\b', r'\byou know\b',
+        r'\bso\b', r'\bbasically\b', r'\bactually\b'
+    ]
+
+    cleaned = text
+    for filler in filler_words:
+        cleaned = re.sub(filler, '', cleaned, flags=re.IGNORECASE)
+
+    cleaned = re.sub(r'\s+', ' ', cleaned)
+    cleaned = re.sub(r'\s+([.,!?])', r'\1', cleaned)
+
+    return cleaned.strip()
+
+
+VOCABULARY = (
+    "we need to ship the release before the end of the quarter and the budget "
+    "review is on friday so um I think uh we should like you know basically "
+    "actually talk to the customer about the data migration plan"
+).split()
+
+
+def synthetic_transcript(words: int, seed: int = 0) -> str:
+    """Random meeting-like text with fillers and punctuation"""
+    rng = random.Random(seed)
+    out = []
+    for i in range(words):
+        out.append(rng.choice(VOCABULARY))
+        if rng.random() < 0.08:
+            out.append(rng.choice([".", ",", "?", "!"]))
+        if rng.random() < 0.02:
+            out.append("Um")
+    return " ".join(out)
+
+
+def synthetic_segments(text: str, words_per_segment: int = 20) -> list[dict]:
+    words = text.split(" ")
+    return [
+        {"start": i * 0.4, "end": (i + words_per_segment) * 0.4, "text": " " + " ".join(words[i:i + words_per_segment])}
+        for i in range(0, len(words), words_per_segment)
+    ]
+
+
+def best_time(fn, arg, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(arg)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--words", type=int, default=500_000, help="Synthetic transcript length")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per implementation (best is reported)")
+    parser.add_argument("--file", help="Benchmark a real transcript instead")
+    args = parser.parse_args()
+
+    if args.file:
+        with open(args.file, "r", encoding="utf-8") as f:
+            text = f.read()
+    else:
+        text = synthetic_transcript(args.words)
+
+    expected = legacy_clean_transcript(text)
+    assert clean_transcript(text, "en") == expected, "single-pass cleaner output differs from the legacy cleaner"
+
+    legacy = best_time(legacy_clean_transcript, text, args.repeat)
+    single = best_time(lambda t: clean_transcript(t, "en"), text, args.repeat)
+    segments = synthetic_segments(text)
+    segmented = best_time(lambda s: segments_text(clean_segments(s, "en")), segments, args.repeat)
+
+    print(f"Transcript: {len(text.split()):,} words, {len(text) / 1e6:.1f} MB, {len(segments):,} segments")
+    print(f"legacy (10 passes):   {legacy * 1000:8.1f} ms")
+    print(f"single pass:          {single * 1000:8.1f} ms  ({legacy / single:.1f}x)")
+    print(f"single pass segments: {segmented * 1000:8.1f} ms  ({legacy / segmented:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""Shared test setup
+
+Settings are read from the environment when app modules are imported, so
+the database and data directories are pointed at a temporary directory
+before anything from ``app`` is imported.
+"""
+import os
+import tempfile
+
+DATA_DIR = tempfile.mkdtemp(prefix="meeting-notes-tests-")
+
+os.environ.update({
+    "DATABASE_URL": f"sqlite+aiosqlite:///{DATA_DIR}/meetings.db",
+    "AUDIO_UPLOAD_DIR": f"{DATA_DIR}/audio",
+    "TRANSCRIPTION_CACHE_DIR": f"{DATA_DIR}/cache",
+    "UPLOAD_SESSION_DIR": f"{DATA_DIR}/uploads",
+    "PROFILE_DIR": f"{DATA_DIR}/profiles",
+    "JOB_WORKERS": "0",
+    "LOOP_MONITOR_ENABLED": "false",
+})
+
+import pytest  # noqa: E402
+from sqlalchemy import event  # noqa: E402
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession  # noqa: E402
+from sqlalchemy.orm import sessionmaker  # noqa: E402
+
+from app.models import Base  # noqa: E402
+from app.database import _set_sqlite_pragmas, _create_search_index  # noqa: E402
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+@pytest.fixture(scope="session")
+def client():
+    """API client; the app starts once for the whole test run"""
+    from fastapi.testclient import TestClient
+    from app.main import app
+
+    with TestClient(app) as test_client:
+        yield test_client
+
+
+@pytest.fixture
+async def sessions(tmp_path):
+    """Session factory for a fresh database with the app's schema and pragmas"""
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path}/test.db")
+    event.listen(engine.sync_engine, "connect", _set_sqlite_pragmas)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+        await conn.run_sync(_create_search_index)
+
+    yield sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    await engine.dispose()
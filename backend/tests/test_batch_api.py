@@ -0,0 +1,43 @@
+"""Batch summarize endpoint"""
+from app.database import AsyncSessionLocal
+from app.models import Meeting
+
+TRANSCRIPT = (
+    "We reviewed the quarterly budget in detail. Alice will send the revised numbers by Friday. "
+    "The team agreed to move the launch to next month. Bob owns the deployment checklist."
+)
+
+
+def _run(client, fn, *args):
+    """Run a coroutine function on the app's event loop"""
+    return client.portal.call(fn, *args)
+
+
+async def _add_transcribed(count: int) -> list[int]:
+    async with AsyncSessionLocal() as db:
+        meetings = [Meeting(title=f"Batch {i}", audio_path=f"batch_{i}.wav") for i in range(count)]
+        for meeting in meetings:
+            meeting.set_transcript(TRANSCRIPT, "none")
+        db.add_all(meetings)
+        await db.commit()
+        return [meeting.id for meeting in meetings]
+
+
+def test_batch_summarize(client):
+    ids = _run(client, _add_transcribed, 2)
+
+    response = client.post("/api/batch/summarize", json={"meeting_ids": ids + [ids[-1] + 1000]})
+
+    assert response.status_code == 200
+    statuses = {item["meeting_id"]: item["status"] for item in response.json()["items"]}
+    assert statuses == {ids[0]: "ok", ids[1]: "ok", ids[-1] + 1000: "not_found"}
+
+
+def test_invalid_lexicon_profile_is_rejected(client):
+    ids = _run(client, _add_transcribed, 2)
+
+    response = client.post("/api/batch/summarize", json={"meeting_ids": ids, "lexicon": "../x"})
+
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Invalid lexicon profile '../x'"
+    assert client.post(f"/api/summarize/{ids[0]}", params={"lexicon": "../x"}).status_code == 400
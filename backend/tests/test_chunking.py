@@ -0,0 +1,107 @@
+"""Chunk planning and stitching for chunked transcription"""
+import random
+
+import numpy as np
+import pytest
+
+from app.services.chunking import find_chunk_boundaries, stitch_chunks
+
+SAMPLE_RATE = 1000
+
+
+def _noise(seconds: float, seed: int = 0) -> np.ndarray:
+    return np.random.default_rng(seed).uniform(-0.5, 0.5, int(seconds * SAMPLE_RATE)).astype(np.float32)
+
+
+def _plan(audio, chunk_seconds=20, overlap_seconds=2, search_seconds=5):
+    return find_chunk_boundaries(audio, chunk_seconds, overlap_seconds, search_seconds, sample_rate=SAMPLE_RATE)
+
+
+def _fake_transcribe(chunk: dict, timeline: list[dict]) -> dict:
+    """What a model would return for a chunk: every segment inside its audio, chunk-relative"""
+    offset = chunk["start"] / SAMPLE_RATE
+    end = chunk["end"] / SAMPLE_RATE
+    segments = [
+        {**segment, "start": segment["start"] - offset, "end": segment["end"] - offset}
+        for segment in timeline
+        if segment["start"] >= offset and segment["end"] <= end
+    ]
+    return {**chunk, "segments": segments, "language": "en"}
+
+
+def test_short_audio_is_one_chunk():
+    audio = _noise(15)
+    assert _plan(audio) == [{"start": 0, "end": len(audio), "core_start": 0, "core_end": len(audio)}]
+
+
+def test_cut_is_placed_in_the_quietest_frame():
+    audio = _noise(60)
+    # A pause 3 s after the first target cut, within the search window
+    audio[22_500:23_500] = 0.0
+
+    plan = _plan(audio)
+
+    first_cut = plan[0]["core_end"]
+    assert 22_500 <= first_cut < 23_500
+    assert plan[1]["core_start"] == first_cut
+
+
+def test_cores_tile_the_recording_and_overlap_is_added_around_cuts():
+    audio = _noise(95)
+    plan = _plan(audio)
+
+    assert len(plan) > 1
+    assert plan[0]["core_start"] == 0
+    assert plan[-1]["core_end"] == len(audio)
+    for previous, current in zip(plan, plan[1:]):
+        assert previous["core_end"] == current["core_start"]
+    for chunk in plan:
+        assert chunk["start"] == max(0, chunk["core_start"] - 2 * SAMPLE_RATE)
+        assert chunk["end"] == min(len(audio), chunk["core_end"] + 2 * SAMPLE_RATE)
+
+
+def test_stitching_keeps_every_segment_once_at_absolute_times():
+    audio = _noise(95)
+    plan = _plan(audio)
+    # A 0.8 s segment every second, so several fall in each overlap
+    timeline = [
+        {"start": float(second), "end": second + 0.8, "text": f" word{second}"}
+        for second in range(94)
+    ]
+    results = [_fake_transcribe(chunk, timeline) for chunk in plan]
+    # Overlap segments really are reported by both neighbours
+    assert sum(len(result["segments"]) for result in results) > len(timeline)
+    random.Random(0).shuffle(results)
+
+    stitched = stitch_chunks(results, sample_rate=SAMPLE_RATE)
+
+    assert [s["text"] for s in stitched["segments"]] == [s["text"] for s in timeline]
+    for got, expected in zip(stitched["segments"], timeline):
+        assert got["start"] == pytest.approx(expected["start"])
+        assert got["end"] == pytest.approx(expected["end"])
+    assert stitched["text"] == "".join(s["text"] for s in timeline)
+    assert stitched["language"] == "en"
+
+
+def test_overlap_segment_belongs_to_the_chunk_holding_its_midpoint():
+    # Cut at 10 s, chunks overlap by 2 s on each side
+    first = {"start": 0, "end": 12_000, "core_start": 0, "core_end": 10_000}
+    second = {"start": 8_000, "end": 20_000, "core_start": 10_000, "core_end": 20_000}
+    # Both chunks hear the segments at 9.0-9.8 s and 9.6-10.6 s
+    first["segments"] = [
+        {"start": 9.0, "end": 9.8, "text": " before", "source": "first"},
+        {"start": 9.6, "end": 10.6, "text": " across", "source": "first"},
+    ]
+    second["segments"] = [
+        {"start": 1.0, "end": 1.8, "text": " before", "source": "second"},
+        {"start": 1.6, "end": 2.6, "text": " across", "source": "second"},
+    ]
+
+    stitched = stitch_chunks([second, first], sample_rate=SAMPLE_RATE)
+
+    assert [(s["text"], s["source"]) for s in stitched["segments"]] == [
+        (" before", "first"),   # midpoint 9.4 s, before the cut
+        (" across", "second"),  # midpoint 10.1 s, after the cut
+    ]
+    assert stitched["segments"][1]["start"] == pytest.approx(9.6)
+    assert stitched["segments"][1]["end"] == pytest.approx(10.6)
@@ -0,0 +1,75 @@
+"""Incremental corpus document frequencies"""
+from collections import Counter
+
+from sqlalchemy import select
+
+from app.database import AsyncSessionLocal
+from app.models import Meeting, CorpusTerm, CorpusStats
+from app.services.corpus import document_terms
+from app.services.meetings import get_meeting, store_transcription
+
+
+def _run(client, fn, *args):
+    """Run a coroutine function on the app's event loop"""
+    return client.portal.call(fn, *args)
+
+
+def _transcript(text: str) -> dict:
+    return {"text": text, "segments": [{"start": 0.0, "end": 5.0, "text": text}], "language": "en", "duration": 5.0}
+
+
+async def _add_transcribed(text: str) -> int:
+    async with AsyncSessionLocal() as db:
+        meeting = Meeting(title="Corpus", audio_path="corpus.wav")
+        db.add(meeting)
+        await db.commit()
+        await store_transcription(db, meeting, _transcript(text))
+        return meeting.id
+
+
+async def _retranscribe(meeting_id: int, text: str):
+    async with AsyncSessionLocal() as db:
+        await store_transcription(db, await get_meeting(db, meeting_id, with_transcript=True), _transcript(text))
+
+
+async def _stored_counts() -> tuple[dict, int, dict]:
+    """(corpus_terms rows, corpus_stats documents, counts recomputed from the indexed transcripts)"""
+    async with AsyncSessionLocal() as db:
+        terms = dict((await db.execute(select(CorpusTerm.term, CorpusTerm.doc_freq))).all())
+        documents = (await db.execute(select(CorpusStats.documents))).scalar() or 0
+        meetings = (await db.execute(select(Meeting.id).where(Meeting.terms_indexed.is_(True)))).scalars().all()
+        expected = Counter()
+        for meeting_id in meetings:
+            meeting = await get_meeting(db, meeting_id, with_transcript=True)
+            expected.update(document_terms(meeting.transcript_text))
+        return terms, documents, dict(expected)
+
+
+def _assert_consistent(client) -> dict:
+    terms, documents, expected = _run(client, _stored_counts)
+    assert terms == expected
+    stats = client.get("/api/corpus").json()
+    assert stats["terms"] == len(terms)
+    assert stats["documents"] == documents
+    return stats
+
+
+def test_counts_follow_add_update_and_delete(client):
+    before = _assert_consistent(client)
+
+    first = _run(client, _add_transcribed, "Alpha planning covers the zygomorph budget")
+    second = _run(client, _add_transcribed, "Zygomorph budget review with the vendor")
+    stats = _assert_consistent(client)
+    assert stats["documents"] == before["documents"] + 2
+    assert _run(client, _stored_counts)[0]["zygomorph"] == 2
+
+    _run(client, _retranscribe, first, "Quillwort hiring update for the vendor")
+    stats = _assert_consistent(client)
+    assert stats["documents"] == before["documents"] + 2
+    terms = _run(client, _stored_counts)[0]
+    assert terms["zygomorph"] == 1 and terms["quillwort"] == 1 and terms["vendor"] == 2
+
+    assert client.delete(f"/api/meetings/{second}").status_code == 200
+    stats = _assert_consistent(client)
+    assert stats["documents"] == before["documents"] + 1
+    assert "zygomorph" not in _run(client, _stored_counts)[0]
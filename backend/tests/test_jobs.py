@@ -0,0 +1,192 @@
+"""Durable job queue: claiming, leases, retries and lease loss"""
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import update
+from sqlalchemy.exc import IntegrityError
+
+from app import worker
+from app.models import Job
+from app.services.jobs import (
+    JOB_HANDLERS, JOB_RETRY_BACKOFF_SECONDS, JOB_QUEUED, JOB_RUNNING, JOB_FAILED, JOB_COMPLETED,
+    enqueue_job, claim_job, heartbeat, complete_job, fail_job, get_job
+)
+
+pytestmark = pytest.mark.anyio
+
+KINDS = ["transcribe"]
+
+
+def _is_candidate_query(statement) -> bool:
+    """True for claim_job's SELECT of candidate job ids"""
+    return getattr(statement, "is_select", False) and [c.key for c in statement.selected_columns] == ["id"]
+
+
+async def _expire_lease(db, job_id: str):
+    await db.execute(
+        update(Job).where(Job.id == job_id).values(lease_expires_at=datetime.utcnow() - timedelta(seconds=1))
+    )
+    await db.commit()
+
+
+async def _make_available(db, job_id: str):
+    await db.execute(
+        update(Job).where(Job.id == job_id).values(available_at=datetime.utcnow() - timedelta(seconds=1))
+    )
+    await db.commit()
+
+
+async def test_job_is_claimed_by_one_worker_only(sessions):
+    async with sessions() as first, sessions() as second:
+        job = await enqueue_job(first, "transcribe", meeting_id=1)
+        claimed_by_first = []
+
+        # The second worker reads the same candidate, then the first claims
+        # it before the second one's compare-and-swap runs
+        execute = second.execute
+
+        async def execute_then_race(statement, *args, **kwargs):
+            result = await execute(statement, *args, **kwargs)
+            if _is_candidate_query(statement) and not claimed_by_first:
+                candidates = result.freeze()
+                assert job.id in candidates().scalars().all()
+                claimed_by_first.append(await claim_job(first, "worker-1", KINDS))
+                return candidates()
+            return result
+
+        second.execute = execute_then_race
+        assert await claim_job(second, "worker-2", KINDS) is None
+
+        assert claimed_by_first[0].id == job.id
+        stored = await get_job(first, job.id)
+        await first.refresh(stored)
+        assert stored.lease_owner == "worker-1"
+        assert stored.attempts == 1
+
+
+async def test_concurrent_claims_take_a_job_once(sessions):
+    async with sessions() as db:
+        job = await enqueue_job(db, "transcribe", meeting_id=1)
+
+    async def claim(index: int):
+        async with sessions() as db:
+            return await claim_job(db, f"worker-{index}", KINDS)
+
+    claimed = [j for j in await asyncio.gather(*(claim(i) for i in range(5))) if j is not None]
+    assert [j.id for j in claimed] == [job.id]
+    assert claimed[0].attempts == 1
+
+
+async def test_expired_lease_makes_job_claimable_again(sessions):
+    async with sessions() as db:
+        job = await enqueue_job(db, "transcribe", meeting_id=1)
+        assert (await claim_job(db, "worker-1", KINDS)).id == job.id
+        assert await claim_job(db, "worker-2", KINDS) is None
+
+        await _expire_lease(db, job.id)
+        reclaimed = await claim_job(db, "worker-2", KINDS)
+
+        assert reclaimed.id == job.id
+        assert reclaimed.lease_owner == "worker-2"
+        assert reclaimed.attempts == 2
+        # The first worker can neither renew nor finish the job any more
+        assert await heartbeat(db, job.id, "worker-1") is False
+        assert await complete_job(db, job.id, "worker-1", None) is False
+        assert await heartbeat(db, job.id, "worker-2") is True
+
+
+async def test_expired_lease_on_final_attempt_fails_job(sessions):
+    async with sessions() as db:
+        job = await enqueue_job(db, "transcribe", meeting_id=1, max_attempts=1)
+        await claim_job(db, "worker-1", KINDS)
+        await _expire_lease(db, job.id)
+
+        assert await claim_job(db, "worker-2", KINDS) is None
+        stored = await get_job(db, job.id)
+        await db.refresh(stored)
+        assert stored.state == JOB_FAILED
+
+
+async def test_failed_attempts_back_off_exponentially_then_fail(sessions):
+    async with sessions() as db:
+        job = await enqueue_job(db, "transcribe", meeting_id=1, max_attempts=3)
+
+        for attempt in (1, 2):
+            claimed = await claim_job(db, "worker-1", KINDS)
+            assert claimed.attempts == attempt
+            before = datetime.utcnow()
+            assert await fail_job(db, job.id, "worker-1", f"error {attempt}") is True
+
+            stored = await get_job(db, job.id)
+            assert stored.state == JOB_QUEUED
+            delay = (stored.available_at - before).total_seconds()
+            expected = JOB_RETRY_BACKOFF_SECONDS * 2 ** (attempt - 1)
+            assert expected - 1 <= delay <= expected + 1
+            # Not claimable until the backoff has passed
+            assert await claim_job(db, "worker-1", KINDS) is None
+            await _make_available(db, job.id)
+
+        await claim_job(db, "worker-1", KINDS)
+        assert await fail_job(db, job.id, "worker-1", "error 3") is True
+
+        stored = await get_job(db, job.id)
+        assert stored.state == JOB_FAILED
+        assert stored.error == "error 3"
+        assert stored.finished_at is not None
+        await _make_available(db, job.id)
+        assert await claim_job(db, "worker-1", KINDS) is None
+
+
+async def test_one_active_job_per_meeting(sessions):
+    async with sessions() as db:
+        db.add(Job(id="a" * 32, kind="transcribe", meeting_id=1, state=JOB_QUEUED))
+        await db.commit()
+
+        db.add(Job(id="b" * 32, kind="transcribe", meeting_id=1, state=JOB_RUNNING))
+        with pytest.raises(IntegrityError):
+            await db.commit()
+        await db.rollback()
+
+        # enqueue_job returns the active job instead of adding another
+        assert (await enqueue_job(db, "transcribe", meeting_id=1)).id == "a" * 32
+
+        # Finished jobs do not count
+        await db.execute(update(Job).where(Job.id == "a" * 32).values(state=JOB_COMPLETED))
+        await db.commit()
+        assert (await enqueue_job(db, "transcribe", meeting_id=1)).id != "a" * 32
+
+
+async def test_worker_that_loses_its_lease_cancels_the_job(sessions, monkeypatch):
+    started = asyncio.Event()
+    cancelled = asyncio.Event()
+
+    async def slow_handler(db, ctx):
+        # Another worker takes the job over
+        async with sessions() as other:
+            await other.execute(update(Job).where(Job.id == ctx.job_id).values(lease_owner="worker-2"))
+            await other.commit()
+        started.set()
+        try:
+            await asyncio.sleep(30)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+    monkeypatch.setitem(JOB_HANDLERS, "slow", slow_handler)
+    monkeypatch.setattr(worker, "AsyncSessionLocal", sessions)
+    monkeypatch.setattr(worker, "JOB_LEASE_SECONDS", 0.3)
+
+    async with sessions() as db:
+        await enqueue_job(db, "slow", meeting_id=1)
+        job = await claim_job(db, "worker-1", ["slow"])
+
+    await asyncio.wait_for(worker._execute(job, "worker-1"), timeout=5)
+    await asyncio.wait_for(cancelled.wait(), timeout=5)
+
+    assert started.is_set()
+    async with sessions() as db:
+        stored = await get_job(db, job.id)
+        # Left to the new owner: neither completed nor failed by the old one
+        assert stored.state == JOB_RUNNING
+        assert stored.lease_owner == "worker-2"
@@ -0,0 +1,39 @@
+"""Event loop block detection"""
+import time
+import asyncio
+
+import pytest
+
+from app.loop_monitor import LoopMonitor
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_block_is_timed_once_the_loop_responds():
+    monitor = LoopMonitor(interval=0.01, threshold=0.05)
+    monitor.start()
+    try:
+        time.sleep(0.2)
+        # Let the pending ping through and the watchdog record the block
+        while monitor.last_lag is None:
+            await asyncio.sleep(0.01)
+    finally:
+        monitor.stop()
+
+    block = monitor.blocks[0]
+    assert block["finished"] is True
+    assert block["duration_seconds"] >= 0.2
+    assert "test_block_is_timed_once_the_loop_responds" in block["stack"]
+
+
+async def test_block_still_running_at_stop_keeps_its_duration_so_far():
+    monitor = LoopMonitor(interval=0.01, threshold=0.05)
+    monitor.start()
+    time.sleep(0.2)
+    # Stopped from the blocked loop itself, before the ping can be answered
+    monitor.stop()
+
+    assert monitor.block_count == 1
+    block = monitor.blocks[0]
+    assert block["finished"] is False
+    assert block["duration_seconds"] >= 0.2
@@ -0,0 +1,78 @@
+"""Keyset pagination of GET /api/meetings"""
+import base64
+from datetime import datetime
+
+import pytest
+from sqlalchemy import delete
+
+from app.database import AsyncSessionLocal
+from app.models import Meeting
+
+
+def _run(client, fn, *args):
+    """Run a coroutine function on the app's event loop"""
+    return client.portal.call(fn, *args)
+
+
+async def _reset_meetings(created: list[datetime]) -> list[int]:
+    async with AsyncSessionLocal() as db:
+        await db.execute(delete(Meeting))
+        meetings = [Meeting(title=f"Meeting {i}", audio_path=f"meeting_{i}.wav", created_at=at) for i, at in enumerate(created)]
+        db.add_all(meetings)
+        await db.commit()
+        return [meeting.id for meeting in meetings]
+
+
+def _page_through(client, limit: int, max_pages: int = 50) -> list[list[dict]]:
+    pages = []
+    cursor = None
+    for _ in range(max_pages):
+        params = {"limit": limit, **({"cursor": cursor} if cursor else {})}
+        response = client.get("/api/meetings", params=params)
+        assert response.status_code == 200
+        body = response.json()
+        pages.append(body["items"])
+        cursor = body["next_cursor"]
+        if cursor is None:
+            return pages
+    pytest.fail(f"Paging did not finish within {max_pages} pages")
+
+
+@pytest.mark.parametrize("limit", [1, 3, 4, 10, 100])
+def test_pages_cover_every_meeting_once_despite_equal_timestamps(client, limit):
+    same = datetime(2024, 5, 1, 9, 30)
+    ids = _run(client, _reset_meetings, [same] * 7 + [datetime(2024, 5, 2, 9, 30)] * 2 + [datetime(2024, 4, 1)])
+
+    pages = _page_through(client, limit)
+    listed = [item["id"] for page in pages for item in page]
+
+    assert sorted(listed) == sorted(ids)
+    assert len(listed) == len(set(listed))
+    assert all(len(page) <= limit for page in pages)
+    assert all(pages[:-1])
+    # Newest first, ties broken by id
+    keys = [(item["created_at"], item["id"]) for page in pages for item in page]
+    assert keys == sorted(keys, reverse=True)
+
+
+def test_list_rows_leave_out_transcript_and_summary(client):
+    _run(client, _reset_meetings, [datetime(2024, 5, 1)])
+
+    item = client.get("/api/meetings").json()["items"][0]
+
+    assert set(item) == {"id", "title", "date", "duration", "language", "transcribed", "summarized", "created_at"}
+    assert item["transcribed"] is False
+    assert item["summarized"] is False
+
+
+@pytest.mark.parametrize("cursor", [
+    "not-a-cursor!",
+    base64.urlsafe_b64encode(b"garbage").decode(),
+    base64.urlsafe_b64encode(b"2024-05-01T09:30:00|x").decode(),
+    base64.urlsafe_b64encode(b"\xff\xfe|1").decode(),
+])
+def test_malformed_cursor_is_rejected(client, cursor):
+    response = client.get("/api/meetings", params={"cursor": cursor})
+
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Invalid cursor"
@@ -0,0 +1,100 @@
+"""compress-transcripts data migration"""
+from sqlalchemy import select
+from sqlalchemy.orm import undefer_group
+
+from app.database import AsyncSessionLocal
+from app.migrate import compress_transcripts
+from app.models import Meeting
+from app.services.compression import LZMA_MAGIC
+from app.services.segments import replace_segments
+
+LEGACY_TEXT = "The zebracorn launch moves to the third quarter of next year."
+SEGMENTED_TEXT = ["Our quokkaword rollout starts on Monday morning."] + ["Everyone agreed on the plan."] * 10
+
+
+def _run(client, fn, *args):
+    """Run a coroutine function on the app's event loop"""
+    return client.portal.call(fn, *args)
+
+
+async def _add_meetings() -> tuple[int, int]:
+    async with AsyncSessionLocal() as db:
+        # Transcribed before segments were stored
+        legacy = Meeting(title="Legacy", audio_path="legacy.wav")
+        legacy.set_transcript(LEGACY_TEXT, "none")
+        segmented = Meeting(title="Segmented", audio_path="segmented.wav")
+        segmented.set_transcript(" ".join(SEGMENTED_TEXT), "none")
+        db.add_all([legacy, segmented])
+        await db.flush()
+        await replace_segments(db, segmented.id, [
+            {"start": i * 5.0, "end": i * 5.0 + 4.0, "text": text} for i, text in enumerate(SEGMENTED_TEXT)
+        ])
+        await db.commit()
+        return legacy.id, segmented.id
+
+
+async def _stored(meeting_id: int) -> tuple[bool, str]:
+    async with AsyncSessionLocal() as db:
+        result = await db.execute(
+            select(Meeting).options(undefer_group("transcript")).where(Meeting.id == meeting_id)
+        )
+        meeting = result.scalar_one()
+        return meeting.transcript_blob is not None, meeting.transcript_text
+
+
+def _search_ids(client, query: str) -> set[int]:
+    response = client.get("/api/search", params={"q": query})
+    assert response.status_code == 200
+    return {hit["meeting_id"] for hit in response.json()}
+
+
+def test_meetings_stay_searchable_after_compression(client):
+    legacy, segmented = _run(client, _add_meetings)
+
+    report = _run(client, compress_transcripts, "lzma")
+
+    assert report["unsegmented"] >= 1
+    assert _run(client, _stored, legacy) == (False, LEGACY_TEXT)
+    assert _run(client, _stored, segmented) == (True, " ".join(SEGMENTED_TEXT))
+    assert legacy in _search_ids(client, "zebracorn")
+    assert segmented in _search_ids(client, "quokkaword")
+
+    # Decompressing puts the transcript back in meetings_fts
+    _run(client, compress_transcripts, "none")
+    assert _run(client, _stored, segmented) == (False, " ".join(SEGMENTED_TEXT))
+    assert segmented in _search_ids(client, "quokkaword monday")
+
+
+def test_transcripts_that_do_not_shrink_stay_plain():
+    meeting = Meeting(title="Short", audio_path="short.wav")
+
+    meeting.set_transcript("Short note.", "lzma")
+    assert (meeting.transcript_text, meeting.transcript_blob) == ("Short note.", None)
+
+    meeting.set_transcript("Long note. " * 20, "lzma")
+    assert meeting.transcript_blob.startswith(LZMA_MAGIC)
+    assert len(meeting.transcript_blob) < len("Long note. " * 20)
+    assert meeting.transcript_text == "Long note. " * 20
+
+
+async def _add_short(text: str) -> int:
+    async with AsyncSessionLocal() as db:
+        meeting = Meeting(title="Short", audio_path="short.wav")
+        meeting.set_transcript(text, "none")
+        db.add(meeting)
+        await db.flush()
+        await replace_segments(db, meeting.id, [{"start": 0.0, "end": 2.0, "text": text}])
+        await db.commit()
+        return meeting.id
+
+
+def test_migration_never_grows_a_transcript(client):
+    _run(client, compress_transcripts, "lzma")
+    short = _run(client, _add_short, "Ok, thanks all.")
+
+    report = _run(client, compress_transcripts, "lzma")
+
+    assert report["meetings"] == 0
+    assert report["incompressible"] >= 1
+    assert report["saved"] == 0
+    assert _run(client, _stored, short) == (False, "Ok, thanks all.")
@@ -0,0 +1,97 @@
+"""Word-level Aho-Corasick phrase matching"""
+from app.services.phrase_matcher import PhraseMatcher, PhraseHit, group_by_span, rank_phrases
+
+
+def _found(matcher: PhraseMatcher, text: str) -> list[tuple[str, str]]:
+    """(phrase, matched text) per hit, in the matcher's order"""
+    return [(hit.phrase, text[hit.start:hit.end]) for hit in matcher.find(text)]
+
+
+def test_overlapping_phrases_are_all_reported():
+    matcher = PhraseMatcher({"follow": 1.0, "follow up": 2.0, "up": 0.5})
+    text = "Please follow up tomorrow"
+
+    assert _found(matcher, text) == [
+        ("follow", "follow"),
+        ("follow up", "follow up"),
+        ("up", "up"),
+    ]
+
+
+def test_failure_links_reach_phrases_sharing_a_suffix():
+    matcher = PhraseMatcher({"we will review": 1.0, "will review the plan": 1.0, "review": 1.0, "the plan": 1.0})
+    text = "Then we will review the plan"
+
+    # At "review" the automaton is deep in "we will review" and must also
+    # report "review"; at "the" it falls back to "will review" to continue
+    assert _found(matcher, text) == [
+        ("we will review", "we will review"),
+        ("review", "review"),
+        ("will review the plan", "will review the plan"),
+        ("the plan", "the plan"),
+    ]
+
+
+def test_mismatch_falls_back_and_restarts():
+    matcher = PhraseMatcher({"action item": 1.0, "item list": 1.0})
+    text = "action action item list"
+
+    assert _found(matcher, text) == [("action item", "action item"), ("item list", "item list")]
+
+
+def test_whole_words_only():
+    matcher = PhraseMatcher({"follow up": 1.0, "don": 1.0, "plan": 1.0})
+
+    assert matcher.find("She followed up on the planning") == []
+    assert matcher.find("I don't know") == []
+    assert _found(matcher, "A follow-up on the plan.") == [("follow up", "follow-up"), ("plan", "plan")]
+
+
+def test_case_and_punctuation_are_ignored():
+    matcher = PhraseMatcher({"Don't forget": 1.0})
+    text = "OK. DON'T   forget, please"
+
+    assert _found(matcher, text) == [("Don't forget", "DON'T   forget")]
+
+
+def test_empty_lexicon_and_wordless_phrases():
+    assert PhraseMatcher({}).find("anything") == []
+    matcher = PhraseMatcher({"...": 1.0, "next steps": 1.0})
+    assert len(matcher) == 1
+    assert _found(matcher, "Next steps:") == [("next steps", "Next steps")]
+
+
+def test_group_by_span_assigns_hits_to_containing_sentences():
+    text = "We need to follow up. Decide the plan. Action item: review"
+    matcher = PhraseMatcher({"follow up": 1.0, "plan": 1.0, "action item": 1.0, "up decide": 1.0})
+    starts = [0, 22, 39]
+    ends = [21, 38, 58]
+
+    grouped = group_by_span(matcher.find(text), starts, ends)
+
+    assert {span: [hit.phrase for hit in hits] for span, hits in grouped.items()} == {
+        0: ["follow up"],
+        1: ["plan"],
+        2: ["action item"],
+    }  # "up decide" crosses a sentence boundary and is dropped
+
+
+def test_group_by_span_drops_hits_outside_spans():
+    hits = [PhraseHit("a", 1.0, 0, 3), PhraseHit("b", 1.0, 12, 15)]
+    assert group_by_span(hits, [5], [10]) == {}
+
+
+def test_rank_phrases_orders_by_score_then_first_occurrence():
+    matcher = PhraseMatcher({"todo": 1.0, "decided": 2.0, "deadline": 1.5, "owner": 1.5})
+    text = "todo owner deadline decided todo todo deadline"
+
+    ranked = rank_phrases(matcher.find(text))
+
+    # todo and deadline tie on score; todo occurs first
+    assert [(entry["phrase"], entry["count"], entry["score"]) for entry in ranked] == [
+        ("todo", 3, 3.0),
+        ("deadline", 2, 3.0),
+        ("decided", 1, 2.0),
+        ("owner", 1, 1.5),
+    ]
+    assert ranked[0]["positions"] == [[0, 4], [28, 32], [33, 37]]
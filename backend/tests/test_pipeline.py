@@ -0,0 +1,195 @@
+"""In-process decode -> transcribe -> summarize pipeline"""
+import wave
+import asyncio
+
+import pytest
+
+from app.models import Meeting
+from app.services import pipeline as pipeline_module
+from app.services.jobs import enqueue_job
+from app.services.pipeline import ProcessingPipeline, PipelineItem, PipelineFull, ITEM_COMPLETED, ITEM_FAILED
+
+pytestmark = pytest.mark.anyio
+
+TRANSCRIPT = {
+    "text": "We agreed to ship the release on Friday after the security review.",
+    "segments": [
+        {"start": 0.0, "end": 4.0, "text": "We agreed to ship the release on Friday after the security review."}
+    ],
+    "language": "en",
+    "duration": 4.0,
+}
+
+
+@pytest.fixture
+def transcribed(monkeypatch, sessions):
+    """Pipeline stages against the test database, with Whisper and decoding faked"""
+    calls = []
+
+    async def transcribe_audio(audio_path, model_name=None, audio_hash=None):
+        calls.append(audio_path)
+        return TRANSCRIPT
+
+    monkeypatch.setattr(pipeline_module, "AsyncSessionLocal", sessions)
+    monkeypatch.setattr(pipeline_module, "transcribe_audio", transcribe_audio)
+    monkeypatch.setattr(pipeline_module, "decode_audio", lambda path: None)
+    monkeypatch.setattr(pipeline_module, "audio_duration", lambda audio: 4.0)
+    return calls
+
+
+async def _add_meeting(sessions) -> int:
+    async with sessions() as db:
+        meeting = Meeting(title="Release sync", audio_path="release.wav")
+        db.add(meeting)
+        await db.commit()
+        return meeting.id
+
+
+def _item(meeting_id: int) -> PipelineItem:
+    return PipelineItem(meeting_id, f"meeting_{meeting_id}.wav", None, "base", "heuristic", None)
+
+
+async def test_item_runs_every_stage(transcribed, sessions):
+    meeting_id = await _add_meeting(sessions)
+    pipeline = ProcessingPipeline()
+    try:
+        item = await pipeline.submit(_item(meeting_id))
+        await item.done.wait()
+    finally:
+        await pipeline.stop()
+
+    assert item.state == ITEM_COMPLETED, item.error
+    assert list(item.timings) == ["decode", "transcribe", "summarize"]
+    async with sessions() as db:
+        meeting = await db.get(Meeting, meeting_id)
+        assert meeting.summary
+
+
+async def test_meeting_with_an_active_transcription_job_is_not_transcribed(transcribed, sessions):
+    meeting_id = await _add_meeting(sessions)
+    async with sessions() as db:
+        await enqueue_job(db, "transcribe", meeting_id)
+    pipeline = ProcessingPipeline()
+    try:
+        item = await pipeline.submit(_item(meeting_id))
+        await item.done.wait()
+    finally:
+        await pipeline.stop()
+
+    assert item.state == ITEM_FAILED
+    assert item.stage == "transcribe"
+    assert item.error == "Meeting is already being transcribed"
+    assert transcribed == []
+
+
+async def test_stop_fails_running_and_queued_items(transcribed, sessions, monkeypatch):
+    started = asyncio.Event()
+
+    async def transcribe_audio(audio_path, model_name=None, audio_hash=None):
+        started.set()
+        await asyncio.Event().wait()  # until cancelled
+
+    monkeypatch.setattr(pipeline_module, "transcribe_audio", transcribe_audio)
+    pipeline = ProcessingPipeline()
+    items = [await pipeline.submit(_item(await _add_meeting(sessions))) for _ in range(3)]
+    await started.wait()
+
+    await pipeline.stop()
+
+    assert [(item.state, item.error) for item in items] == [(ITEM_FAILED, "Pipeline stopped")] * 3
+    assert all(item.done.is_set() and item.finished_at for item in items)
+    assert pipeline.stats()["in_flight"] == 0
+
+
+async def test_without_decoded_audio_cache_duration_comes_from_the_headers(transcribed, sessions, monkeypatch, tmp_path):
+    audio_path = tmp_path / "meeting.wav"
+    with wave.open(str(audio_path), "wb") as f:
+        f.setnchannels(1)
+        f.setsampwidth(2)
+        f.setframerate(16000)
+        f.writeframes(b"\x00\x00" * 16000 * 3)
+
+    def decode_audio(path):
+        raise AssertionError("decoded although the cache is off")
+
+    monkeypatch.setattr(pipeline_module, "DECODED_AUDIO_CACHE", False)
+    monkeypatch.setattr(pipeline_module, "decode_audio", decode_audio)
+    pipeline = ProcessingPipeline()
+    try:
+        item = _item(await _add_meeting(sessions))
+        item.audio_path = str(audio_path)
+        await pipeline.submit(item)
+        await item.done.wait()
+    finally:
+        await pipeline.stop()
+
+    assert item.state == ITEM_COMPLETED, item.error
+    assert item.duration == 3.0
+
+
+async def test_stages_overlap_across_meetings(transcribed, sessions, monkeypatch):
+    events = []
+    release = asyncio.Event()
+
+    def decode_audio(path):
+        events.append(("decode", path))
+
+    async def transcribe_audio(audio_path, model_name=None, audio_hash=None):
+        events.append(("transcribe", audio_path))
+        await release.wait()
+        return TRANSCRIPT
+
+    monkeypatch.setattr(pipeline_module, "decode_audio", decode_audio)
+    monkeypatch.setattr(pipeline_module, "transcribe_audio", transcribe_audio)
+    pipeline = ProcessingPipeline()
+    try:
+        first = await pipeline.submit(_item(await _add_meeting(sessions)))
+        second = await pipeline.submit(_item(await _add_meeting(sessions)))
+        # The second meeting is decoded while the first is still being transcribed
+        while len(events) < 3:
+            await asyncio.sleep(0.01)
+        await asyncio.sleep(0.05)
+        assert sorted(events) == [
+            ("decode", first.audio_path), ("decode", second.audio_path), ("transcribe", first.audio_path)
+        ]
+        release.set()
+        await first.done.wait()
+        await second.done.wait()
+    finally:
+        await pipeline.stop()
+
+    assert events[3:] == [("transcribe", second.audio_path)]
+    assert first.state == second.state == ITEM_COMPLETED
+    assert first.finished_at <= second.finished_at
+
+
+async def test_full_queues_push_back_to_submit(transcribed, sessions, monkeypatch):
+    release = asyncio.Event()
+
+    async def transcribe_audio(audio_path, model_name=None, audio_hash=None):
+        await release.wait()
+        return TRANSCRIPT
+
+    monkeypatch.setattr(pipeline_module, "transcribe_audio", transcribe_audio)
+    monkeypatch.setattr(pipeline_module, "PIPELINE_QUEUE_SIZE", 1)
+    monkeypatch.setattr(pipeline_module, "PIPELINE_SUBMIT_TIMEOUT", 0.2)
+    pipeline = ProcessingPipeline()
+    try:
+        # 1: transcribing, 2: waiting for transcribe, 3: decoded and blocked
+        # handing over, 4: waiting for decode; then the pipeline is full
+        items = [await pipeline.submit(_item(await _add_meeting(sessions))) for _ in range(4)]
+        with pytest.raises(PipelineFull):
+            await pipeline.submit(_item(await _add_meeting(sessions)))
+
+        stats = pipeline.stats()
+        assert stats["in_flight"] == 4
+        assert stats["stages"]["decode"]["queued"] == 1
+        assert stats["stages"]["transcribe"]["queued"] == 1
+
+        release.set()
+        for item in items:
+            await item.done.wait()
+    finally:
+        await pipeline.stop()
+
+    assert [item.state for item in items] == [ITEM_COMPLETED] * 4
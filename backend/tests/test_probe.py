@@ -0,0 +1,242 @@
+"""Header-only audio probing on synthetic WAV, MP3, MP4 and WebM files"""
+import struct
+
+import pytest
+
+from app.services.probe import probe_audio, AudioProbeError
+
+
+# ---------------------------------------------------------------------------
+# Builders
+# ---------------------------------------------------------------------------
+
+def _chunk(chunk_id: bytes, body: bytes) -> bytes:
+    return chunk_id + struct.pack("<I", len(body)) + body + b"\x00" * (len(body) % 2)
+
+
+def make_wav(channels=2, sample_rate=16000, bits=16, frames=32000) -> bytes:
+    block_align = channels * bits // 8
+    fmt = struct.pack("<HHIIHH", 1, channels, sample_rate, sample_rate * block_align, block_align, bits)
+    # An odd-sized chunk before fmt exercises chunk skipping and padding
+    chunks = _chunk(b"LIST", b"INFOabc") + _chunk(b"fmt ", fmt) + _chunk(b"data", b"\x00" * frames * block_align)
+    return b"RIFF" + struct.pack("<I", 4 + len(chunks)) + b"WAVE" + chunks
+
+
+def mpeg_frame(header: bytes, length: int, payload: bytes = b"", at: int = 4) -> bytes:
+    frame = bytearray(header + b"\x00" * (length - 4))
+    frame[at:at + len(payload)] = payload
+    return bytes(frame)
+
+
+# MPEG-1 Layer III, 128 kbit/s, 44.1 kHz, stereo: 417-byte frames of 1152 samples
+MPEG1_HEADER = b"\xff\xfb\x90\x00"
+MPEG1_FRAME = 144 * 128000 // 44100
+# MPEG-2 Layer III, 64 kbit/s, 22.05 kHz, mono: 208-byte frames of 576 samples
+MPEG2_HEADER = b"\xff\xf3\x80\xc0"
+MPEG2_FRAME = 72 * 64000 // 22050
+
+
+def id3_tag(body_size: int) -> bytes:
+    syncsafe = bytes((body_size >> shift) & 0x7F for shift in (21, 14, 7, 0))
+    return b"ID3\x04\x00\x00" + syncsafe + b"\x00" * body_size
+
+
+def _box(box_type: bytes, body: bytes) -> bytes:
+    return struct.pack(">I", 8 + len(body)) + box_type + body
+
+
+def _large_box(box_type: bytes, body: bytes) -> bytes:
+    return struct.pack(">I", 1) + box_type + struct.pack(">Q", 16 + len(body)) + body
+
+
+def _mdhd(version: int, timescale: int, duration: int) -> bytes:
+    if version == 1:
+        return _box(b"mdhd", b"\x01\x00\x00\x00" + b"\x00" * 16 + struct.pack(">IQ", timescale, duration) + b"\x00" * 4)
+    return _box(b"mdhd", b"\x00" * 12 + struct.pack(">II", timescale, duration) + b"\x00" * 4)
+
+
+def _trak(handler: bytes, fourcc: bytes, channels: int, sample_rate: int, mdhd: bytes) -> bytes:
+    hdlr = _box(b"hdlr", b"\x00" * 8 + handler + b"\x00" * 12)
+    entry = _box(fourcc, b"\x00" * 6 + b"\x00\x01" + b"\x00" * 8 + struct.pack(">HHHHI", channels, 16, 0, 0, sample_rate << 16))
+    stsd = _box(b"stsd", b"\x00" * 4 + struct.pack(">I", 1) + entry)
+    minf = _box(b"minf", _box(b"stbl", stsd))
+    return _box(b"trak", _box(b"mdia", mdhd + hdlr + minf))
+
+
+def make_mp4(mdhd_version=0, channels=2, sample_rate=44100, timescale=44100, duration=44100 * 90) -> bytes:
+    mvhd = _box(b"mvhd", b"\x00" * 12 + struct.pack(">II", 1000, 1))
+    video = _trak(b"vide", b"avc1", 0, 0, _mdhd(0, 90000, 1))
+    audio = _trak(b"soun", b"mp4a", channels, sample_rate, _mdhd(mdhd_version, timescale, duration))
+    return (
+        _box(b"ftyp", b"M4A \x00\x00\x00\x00")
+        + _large_box(b"mdat", b"\x00" * 4096)  # skipped without being read
+        + _box(b"moov", mvhd + video + audio)
+    )
+
+
+def _ebml_size(size: int, width: int = 1) -> bytes:
+    if width == 1:
+        return bytes([0x80 | size])
+    return bytes([1 << (8 - width)]) + size.to_bytes(width, "big")[1:]
+
+
+def _element(element_id: int, body: bytes, width: int = 1) -> bytes:
+    id_bytes = element_id.to_bytes((element_id.bit_length() + 7) // 8, "big")
+    return id_bytes + _ebml_size(len(body), width) + body
+
+
+def make_webm(duration_ms=None, channels=2, sample_rate=48000.0) -> bytes:
+    header = _element(0x1A45DFA3, _element(0x4282, b"webm"))
+    info = _element(0x2AD7B1, (1_000_000).to_bytes(3, "big"))
+    if duration_ms is not None:
+        info += _element(0x4489, struct.pack(">d", duration_ms))
+    video = _element(0xAE, _element(0x83, b"\x01") + _element(0x86, b"V_VP8"))
+    audio = _element(0xAE, _element(0x83, b"\x02") + _element(0x86, b"A_OPUS") + _element(
+        0xE1, _element(0xB5, struct.pack(">d", sample_rate)) + _element(0x9F, bytes([channels]))
+    ))
+    # Multi-byte sizes, and a Segment of unknown size as MediaRecorder writes it
+    body = _element(0x1549A966, info, width=8) + _element(0x1654AE6B, video + audio, width=4)
+    body += _element(0x1F43B675, b"\x00" * 64)
+    segment = b"\x18\x53\x80\x67" + b"\x01\xff\xff\xff\xff\xff\xff\xff" + body
+    return header + segment
+
+
+def _probe(tmp_path, data: bytes, extension: str) -> dict:
+    path = tmp_path / f"audio.{extension}"
+    path.write_bytes(data)
+    return probe_audio(str(path))
+
+
+# ---------------------------------------------------------------------------
+# Valid files
+# ---------------------------------------------------------------------------
+
+@pytest.mark.parametrize("channels, sample_rate, bits", [(1, 16000, 16), (2, 44100, 16), (2, 48000, 24)])
+def test_wav(tmp_path, channels, sample_rate, bits):
+    info = _probe(tmp_path, make_wav(channels, sample_rate, bits, frames=sample_rate * 2), "wav")
+    assert info == {"format": "wav", "codec": "pcm", "duration": 2.0, "sample_rate": sample_rate, "channels": channels}
+
+
+def test_mp3_cbr_duration_from_bitrate(tmp_path):
+    frames = b"".join(mpeg_frame(MPEG1_HEADER, MPEG1_FRAME) for _ in range(100))
+    # Leading ID3v2 tag and trailing ID3v1 tag are not audio
+    data = id3_tag(300) + frames + b"TAG" + b"\x00" * 125
+
+    info = _probe(tmp_path, data, "mp3")
+
+    assert info["codec"] == "mp3"
+    assert info["duration"] == pytest.approx(len(frames) * 8 / 128000)
+    assert info["sample_rate"] == 44100
+    assert info["channels"] == 2
+
+
+def test_mp3_xing_frame_count(tmp_path):
+    # MPEG-1 stereo: the Xing tag follows 32 bytes of side info
+    xing = b"Xing" + struct.pack(">II", 0x01, 5000)
+    data = mpeg_frame(MPEG1_HEADER, MPEG1_FRAME, xing, at=36) + mpeg_frame(MPEG1_HEADER, MPEG1_FRAME) * 3
+
+    info = _probe(tmp_path, data, "mp3")
+
+    assert info["duration"] == pytest.approx(5000 * 1152 / 44100)
+
+
+def test_mp3_vbri_frame_count(tmp_path):
+    vbri = b"VBRI" + b"\x00" * 10 + struct.pack(">I", 2000)
+    data = mpeg_frame(MPEG1_HEADER, MPEG1_FRAME, vbri, at=36) + mpeg_frame(MPEG1_HEADER, MPEG1_FRAME) * 3
+
+    info = _probe(tmp_path, data, "mp3")
+
+    assert info["duration"] == pytest.approx(2000 * 1152 / 44100)
+
+
+def test_mpeg2_mono_frame_layout(tmp_path):
+    # MPEG-2 mono: 9 bytes of side info, 576 samples per frame
+    info_tag = b"Info" + struct.pack(">II", 0x01, 800)
+    data = mpeg_frame(MPEG2_HEADER, MPEG2_FRAME, info_tag, at=13) + mpeg_frame(MPEG2_HEADER, MPEG2_FRAME) * 3
+
+    info = _probe(tmp_path, data, "mp3")
+
+    assert info["duration"] == pytest.approx(800 * 576 / 22050)
+    assert info["sample_rate"] == 22050
+    assert info["channels"] == 1
+
+
+def test_mp3_false_sync_is_skipped(tmp_path):
+    # A frame-looking header whose successor does not line up comes first
+    data = b"\x00\xff\xfb\x90\x00\x00" + mpeg_frame(MPEG1_HEADER, MPEG1_FRAME) * 4
+
+    info = _probe(tmp_path, data[1:], "mp3")
+
+    assert info["duration"] == pytest.approx((len(data) - 6) * 8 / 128000)
+
+
+@pytest.mark.parametrize("mdhd_version", [0, 1])
+def test_mp4_audio_track(tmp_path, mdhd_version):
+    info = _probe(tmp_path, make_mp4(mdhd_version, channels=1, sample_rate=48000, timescale=48000, duration=48000 * 75), "m4a")
+    assert info == {"format": "mp4", "codec": "aac", "duration": 75.0, "sample_rate": 48000, "channels": 1}
+
+
+def test_webm(tmp_path):
+    info = _probe(tmp_path, make_webm(duration_ms=12345.0), "webm")
+    assert info == {"format": "webm", "codec": "opus", "duration": pytest.approx(12.345), "sample_rate": 48000, "channels": 2}
+
+
+def test_webm_without_duration(tmp_path):
+    assert _probe(tmp_path, make_webm(duration_ms=None), "webm")["duration"] is None
+
+
+# ---------------------------------------------------------------------------
+# Invalid files
+# ---------------------------------------------------------------------------
+
+VALID_FILES = {
+    "wav": make_wav(frames=100),
+    "mp3": id3_tag(20) + mpeg_frame(MPEG1_HEADER, MPEG1_FRAME, b"Xing" + struct.pack(">II", 1, 10), at=36),
+    "m4a": make_mp4(),
+    "webm": make_webm(duration_ms=1000.0),
+}
+
+
+@pytest.mark.parametrize("extension", VALID_FILES)
+def test_truncated_files_raise_probe_error(tmp_path, extension):
+    data = VALID_FILES[extension]
+    for length in range(0, len(data), 3):
+        path = tmp_path / f"cut{length}.{extension}"
+        path.write_bytes(data[:length])
+        try:
+            probe_audio(str(path))
+        except AudioProbeError:
+            pass
+
+
+@pytest.mark.parametrize("extension", VALID_FILES)
+def test_corrupted_files_raise_probe_error(tmp_path, extension):
+    data = VALID_FILES[extension]
+    # Overwrite each header byte in turn with values that break sizes and ids
+    for position in range(min(len(data), 400)):
+        for value in (0x00, 0xFF):
+            corrupted = bytearray(data)
+            corrupted[position] = value
+            path = tmp_path / f"corrupt.{extension}"
+            path.write_bytes(bytes(corrupted))
+            try:
+                probe_audio(str(path))
+            except AudioProbeError:
+                pass
+
+
+def test_content_must_match_extension(tmp_path):
+    with pytest.raises(AudioProbeError, match="extension"):
+        _probe(tmp_path, make_wav(), "mp3")
+
+
+def test_unrecognized_file(tmp_path):
+    with pytest.raises(AudioProbeError):
+        _probe(tmp_path, b"not audio at all", "wav")
+
+
+def test_upload_of_corrupt_file_is_rejected(client):
+    data = make_wav()[:40]
+    response = client.post("/api/upload", files={"file": ("meeting.wav", data, "audio/wav")}, data={"title": "Broken"})
+    assert response.status_code == 400
+    assert response.json()["detail"].startswith("Invalid audio file")
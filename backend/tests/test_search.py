@@ -0,0 +1,70 @@
+"""Full-text search index and queries"""
+import sqlite3
+
+import pytest
+
+from app.models import Meeting
+from app.services.search import search_meetings, MATCH_START, MATCH_END
+from app.services.segments import replace_segments
+
+pytestmark = pytest.mark.anyio
+
+
+async def _add_meeting(db, title: str, segments: list[str], codec: str = "none") -> int:
+    meeting = Meeting(title=title, audio_path=f"{title}.wav")
+    meeting.set_transcript(" ".join(segments), codec)
+    db.add(meeting)
+    await db.flush()
+    await replace_segments(db, meeting.id, [
+        {"start": i * 5.0, "end": i * 5.0 + 4.0, "text": text} for i, text in enumerate(segments)
+    ])
+    await db.commit()
+    return meeting.id
+
+
+async def test_plain_and_compressed_transcripts_are_searchable(sessions):
+    async with sessions() as db:
+        plain = await _add_meeting(db, "Planning", ["We reviewed the budget.", "Alice owns the roadmap."])
+        compressed = await _add_meeting(
+            db, "Retro", ["The budget slipped again.", "Bob will fix deployments."], codec="zlib"
+        )
+
+        hits = await search_meetings(db, "budget")
+        assert {hit["meeting_id"] for hit in hits} == {plain, compressed}
+        for hit in hits:
+            assert f"{MATCH_START}budget{MATCH_END}" in hit["snippet"]
+            assert hit["segments"][0]["start"] == 0.0
+
+        hits = await search_meetings(db, "deployments")
+        assert [hit["meeting_id"] for hit in hits] == [compressed]
+        assert hits[0]["segments"][0]["start"] == 5.0
+
+
+async def test_index_triggers_need_no_app_functions(sessions, tmp_path):
+    async with sessions() as db:
+        await _add_meeting(db, "Standup", ["Blockers were discussed."])
+
+    # As from the sqlite3 shell or a backup script: no app-registered functions
+    connection = sqlite3.connect(tmp_path / "test.db")
+    with connection:
+        connection.execute("INSERT INTO meetings (title, audio_path, terms_indexed) VALUES ('Offsite', 'o.wav', 0)")
+        connection.execute("UPDATE meetings SET summary = 'Hiring plan agreed' WHERE title = 'Standup'")
+        connection.execute("UPDATE meetings SET title = 'Offsite 2025' WHERE title = 'Offsite'")
+        connection.execute("DELETE FROM meetings WHERE title = 'Offsite 2025'")
+    # Raises if the index no longer matches the table
+    connection.execute("INSERT INTO meetings_fts(meetings_fts, rank) VALUES ('integrity-check', 1)")
+    connection.close()
+
+    async with sessions() as db:
+        assert [hit["title"] for hit in await search_meetings(db, "hiring")] == ["Standup"]
+        assert await search_meetings(db, "offsite") == []
+
+
+async def test_snippet_markers_are_not_brackets(sessions):
+    async with sessions() as db:
+        await _add_meeting(db, "Notes", ["[inaudible] the budget was [approved] today."])
+
+        hits = await search_meetings(db, "budget")
+
+    assert hits[0]["snippet"] == f"[inaudible] the {MATCH_START}budget{MATCH_END} was [approved] today."
+    assert hits[0]["segments"][0]["snippet"] == hits[0]["snippet"]
@@ -0,0 +1,122 @@
+"""Hierarchical summarization of long meetings"""
+from app.database import AsyncSessionLocal
+from app.models import Meeting
+from app.services import sections as sections_module
+from app.services.sections import split_sections, _reduce_text
+from app.services.segments import replace_segments
+from app.services.summarizer import summarize
+
+
+def _result(summary: str, key_points=(), action_items=()) -> dict:
+    return {"summary": summary, "key_points": list(key_points), "action_items": list(action_items)}
+
+
+def test_reduce_text_keeps_each_sentence_once():
+    results = [
+        _result(
+            "alpha beta gamma delta epsilon. second sentence here ok fine.",
+            key_points=["Alpha beta  gamma delta epsilon."],
+        ),
+        _result("Second sentence here ok fine! A third one from the next section.", action_items=["No action items found"]),
+    ]
+
+    text = _reduce_text(results)
+
+    assert text == "alpha beta gamma delta epsilon. second sentence here ok fine. A third one from the next section."
+    assert summarize(text, "tfidf")["summary"].count("alpha beta gamma delta epsilon") == 1
+
+
+def test_reduce_text_drops_placeholders():
+    results = [_result("No content to summarize", ["No specific key points identified"], ["No action items found"])]
+    assert _reduce_text(results) == ""
+
+
+TOPICS = [
+    "The budget forecast shows revenue growth and higher hosting costs this quarter",
+    "Hiring plans cover two backend engineers and one designer for the mobile team",
+    "The launch checklist needs security review, release notes and a rollback plan",
+]
+
+
+def _topic_segments(per_topic: int = 20, seconds: float = 30.0) -> list[tuple[float, float, str]]:
+    """Three topics of per_topic segments each, back to back"""
+    segments = []
+    for topic in TOPICS:
+        for i in range(per_topic):
+            start = len(segments) * seconds
+            segments.append((start, start + seconds, f"{topic} item {i}."))
+    return segments
+
+
+def test_split_sections_cuts_at_topic_shifts():
+    segments = _topic_segments()
+
+    # 600s target: each cut may fall anywhere from 300s to 900s into a section
+    assert split_sections(segments, target=600) == [(0, 20), (20, 40), (40, 60)]
+
+
+def test_split_sections_covers_every_segment_in_order():
+    segments = _topic_segments(per_topic=37, seconds=17.0)
+
+    ranges = split_sections(segments, target=300)
+
+    assert ranges[0][0] == 0 and ranges[-1][1] == len(segments)
+    assert all(previous[1] == current[0] for previous, current in zip(ranges, ranges[1:]))
+    for first, last in ranges[:-1]:
+        length = segments[last][0] - segments[first][0]
+        assert 150 <= length <= 450
+
+
+def test_split_sections_short_and_empty():
+    assert split_sections([], target=600) == []
+    assert split_sections(_topic_segments(per_topic=5), target=600) == [(0, 15)]
+
+
+def test_split_sections_cuts_after_a_long_silence():
+    segments = [(0.0, 30.0, "opening remarks about the agenda today"), (2000.0, 2030.0, "back after the break")]
+    assert split_sections(segments, target=600) == [(0, 1), (1, 2)]
+
+
+async def _add_long_meeting() -> int:
+    async with AsyncSessionLocal() as db:
+        segments = _topic_segments()
+        meeting = Meeting(title="All hands", audio_path="all_hands.wav", duration=segments[-1][1])
+        meeting.set_transcript(" ".join(text for _, _, text in segments), "none")
+        db.add(meeting)
+        await db.flush()
+        await replace_segments(db, meeting.id, [{"start": s, "end": e, "text": t} for s, e, t in segments])
+        await db.commit()
+        return meeting.id
+
+
+def test_long_meeting_outline_and_cached_resummarize(client, monkeypatch):
+    monkeypatch.setattr(sections_module, "HIERARCHICAL_MIN_SECONDS", 1200)
+    meeting_id = client.portal.call(_add_long_meeting)
+
+    first = client.post(f"/api/summarize/{meeting_id}", params={"method": "tfidf"}).json()
+    outline = client.get(f"/api/meetings/{meeting_id}/outline").json()
+
+    assert first["sections"] == 3
+    assert first["cached"] is False
+    assert outline["method"] == "tfidf"
+    assert [(s["idx"], s["start"], s["end"]) for s in outline["sections"]] == [
+        (0, 0.0, 600.0), (1, 600.0, 1200.0), (2, 1200.0, 1800.0)
+    ]
+    assert "budget" in outline["sections"][0]["summary"].lower()
+
+    # The outline is replaced by another method's sections, then restored from the cache
+    client.post(f"/api/summarize/{meeting_id}", params={"method": "textrank"})
+    assert client.get(f"/api/meetings/{meeting_id}/outline").json()["method"] == "textrank"
+
+    again = client.post(f"/api/summarize/{meeting_id}", params={"method": "tfidf"}).json()
+
+    assert again["cached"] is True
+    assert again["sections"] == 3
+    assert {key: again[key] for key in ("summary", "key_points", "action_items")} == {
+        key: first[key] for key in ("summary", "key_points", "action_items")
+    }
+    assert client.get(f"/api/meetings/{meeting_id}/outline").json() == outline
+
+
+def test_missing_meeting_has_no_outline(client):
+    assert client.get("/api/meetings/999999/outline").status_code == 404
@@ -0,0 +1,74 @@
+"""Streamed transcription: SSE events, caching and stored language"""
+import json
+
+import numpy as np
+from sqlalchemy.orm import undefer_group
+
+from app.database import AsyncSessionLocal
+from app.models import Meeting
+from app.services import transcription
+from app.services.audio import SAMPLE_RATE
+
+
+class FakeModel:
+    """Whisper stand-in: one German segment per window"""
+
+    def __init__(self):
+        self.calls = 0
+
+    def transcribe(self, audio, fp16=False, initial_prompt=None):
+        self.calls += 1
+        seconds = len(audio) / SAMPLE_RATE
+        return {
+            "text": f" Abschnitt {self.calls}.",
+            "segments": [{"start": 0.0, "end": seconds, "text": f" Abschnitt {self.calls}.", "avg_logprob": -0.2}],
+            "language": "de",
+        }
+
+
+async def _add_meeting(audio_path: str) -> int:
+    async with AsyncSessionLocal() as db:
+        meeting = Meeting(title="Streamed", audio_path=audio_path)
+        db.add(meeting)
+        await db.commit()
+        return meeting.id
+
+
+async def _stored(meeting_id: int) -> tuple:
+    async with AsyncSessionLocal() as db:
+        meeting = await db.get(Meeting, meeting_id, options=[undefer_group("transcript")])
+        return meeting.language, meeting.transcript_text
+
+
+def _events(client, meeting_id: int) -> list[tuple[str, dict]]:
+    response = client.get(f"/api/transcribe/{meeting_id}/stream")
+    assert response.status_code == 200
+    events = []
+    for block in response.text.strip().split("\n\n"):
+        name, data = block.split("\n")
+        events.append((name.removeprefix("event: "), json.loads(data.removeprefix("data: "))))
+    return events
+
+
+def test_stream_is_cached_and_stores_the_language(client, monkeypatch, tmp_path):
+    model = FakeModel()
+    monkeypatch.setattr(transcription.model_registry, "get", lambda name: model)
+    monkeypatch.setattr(transcription, "decode_audio", lambda path: np.zeros(SAMPLE_RATE * 70, dtype=np.float32))
+    audio_path = tmp_path / "streamed.wav"
+    audio_path.write_bytes(b"unique audio for the streaming test")
+    meeting_id = client.portal.call(_add_meeting, str(audio_path))
+
+    events = _events(client, meeting_id)
+
+    assert [name for name, _ in events] == ["start"] + ["segment"] * model.calls + ["done"]
+    assert events[0][1]["duration"] == 70.0
+    assert model.calls >= 2
+    language, text = client.portal.call(_stored, meeting_id)
+    assert language == "de"
+    assert "Abschnitt 1" in text
+
+    # Streaming the same audio again replays the cached result
+    calls = model.calls
+    assert _events(client, meeting_id) == events
+    assert model.calls == calls
+    assert client.portal.call(_stored, meeting_id)[0] == "de"
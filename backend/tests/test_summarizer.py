@@ -0,0 +1,89 @@
+"""Sentence index, TF-IDF and TextRank scoring, and corpus terms"""
+import numpy as np
+import pytest
+from sqlalchemy import select, update
+
+from app.models import Meeting, CorpusTerm, CorpusStats
+from app.services.corpus import document_terms, update_corpus, reset_stale_corpus, TOKENIZER_VERSION
+from app.services.summarizer import SentenceIndex, tfidf_scores, textrank_scores, summarize
+
+
+def test_sentence_index_tokenizes_any_script():
+    index = SentenceIndex("Das Café öffnet früh am Morgen. Встреча назначена на пятницу утром. Too short.")
+
+    assert index.sentences == ["Das Café öffnet früh am Morgen", "Встреча назначена на пятницу утром"]
+    assert {"café", "öffnet", "früh", "встреча", "пятницу"} <= set(index.vocabulary)
+    assert list(index.lengths) == [6, 5]
+
+
+def test_tokens_keep_apostrophes_and_drop_underscores():
+    assert document_terms("Don't rename the snake_case field in naïve code") == [
+        "case", "code", "don't", "field", "naïve", "rename", "snake"
+    ]
+
+
+def test_sentence_spans_point_into_the_text():
+    text = "First sentence has five words. Second one also has five!"
+    index = SentenceIndex(text)
+
+    assert [text[start:end].strip() for start, end in zip(index.starts, index.ends)] == index.sentences
+
+
+def test_tfidf_scores_favour_central_sentences():
+    index = SentenceIndex(
+        "The budget review covers hosting costs. "
+        "Hosting costs grew with the budget. "
+        "The budget for hosting needs review. "
+        "Someone brought cake to the office."
+    )
+
+    scores = tfidf_scores(index)
+
+    assert scores.shape == (4,)
+    assert np.argmin(scores) == 3
+    # Rows are L2-normalized, so scores are cosines with the centroid
+    norms = np.sqrt(np.asarray(index.tfidf().multiply(index.tfidf()).sum(axis=1)).ravel())
+    assert norms == pytest.approx(np.ones(4))
+
+
+def test_textrank_scores_are_a_distribution():
+    index = SentenceIndex(
+        "The release plan needs a security review. "
+        "Security review of the release starts Monday. "
+        "The release plan was approved. "
+        "Lunch is at noon in the garden."
+    )
+
+    scores = textrank_scores(index)
+
+    assert scores.sum() == pytest.approx(1.0)
+    # The unconnected sentence only gets the teleport share
+    assert np.argmin(scores) == 3
+    assert scores[3] == pytest.approx(scores.min())
+
+
+def test_summary_of_non_latin_text():
+    text = "Мы обсудили бюджет проекта подробно. Бюджет проекта вырос в этом квартале. Погода была хорошей сегодня утром."
+
+    result = summarize(text, "tfidf")
+
+    assert "бюджет" in result["summary"].lower()
+
+
+@pytest.mark.anyio
+async def test_counts_from_another_tokenizer_are_rebuilt(sessions):
+    async with sessions() as db:
+        meeting = Meeting(title="Café", audio_path="cafe.wav", terms_indexed=True)
+        meeting.set_transcript("Das Café öffnet früh", "none")
+        db.add(meeting)
+        await update_corpus(db, added_text="Das Café öffnet früh")
+        await db.execute(update(CorpusStats).values(tokenizer=None))
+        await db.commit()
+
+        assert await reset_stale_corpus(db) is True
+        assert (await db.execute(select(CorpusTerm))).all() == []
+        stats = (await db.execute(select(CorpusStats))).scalar_one()
+        assert (stats.documents, stats.tokenizer) == (0, TOKENIZER_VERSION)
+        assert (await db.execute(select(Meeting.terms_indexed))).scalar_one() is False
+
+        assert await reset_stale_corpus(db) is False
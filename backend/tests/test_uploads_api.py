@@ -0,0 +1,164 @@
+"""Resumable chunked uploads through /api/uploads"""
+import io
+import os
+import wave
+import hashlib
+
+import pytest
+
+from app.services.uploads import MIN_CHUNK_BYTES, UPLOAD_SESSION_DIR
+
+CHUNK = MIN_CHUNK_BYTES
+
+
+def _wav(seconds: float = 20.0) -> bytes:
+    """16 kHz mono WAV; 20 seconds is 640044 bytes, three chunks with a short last one"""
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as f:
+        f.setnchannels(1)
+        f.setsampwidth(2)
+        f.setframerate(16000)
+        f.writeframes(os.urandom(int(16000 * seconds) * 2))
+    return buffer.getvalue()
+
+
+def _chunks(data: bytes) -> list[bytes]:
+    return [data[i:i + CHUNK] for i in range(0, len(data), CHUNK)]
+
+
+def _start(client, data: bytes) -> str:
+    response = client.post("/api/uploads", json={
+        "filename": "long_meeting.wav", "title": "Long meeting", "total_size": len(data), "chunk_size": CHUNK
+    })
+    assert response.status_code == 200
+    session = response.json()
+    assert session["total_chunks"] == len(_chunks(data))
+    assert session["missing_chunks"] == list(range(session["total_chunks"]))
+    return session["upload_id"]
+
+
+def _put(client, upload_id: str, index: int, body: bytes):
+    return client.put(f"/api/uploads/{upload_id}/chunks/{index}", content=body)
+
+
+def _status(client, upload_id: str) -> dict:
+    response = client.get(f"/api/uploads/{upload_id}")
+    assert response.status_code == 200
+    return response.json()
+
+
+def _complete(client, upload_id: str):
+    return client.post(f"/api/uploads/{upload_id}/complete")
+
+
+def _assert_saved(response, data: bytes):
+    assert response.status_code == 200
+    meeting = response.json()
+    with open(meeting["audio_path"], "rb") as f:
+        assert f.read() == data
+    assert meeting["audio_hash"] == hashlib.sha256(data).hexdigest()
+    assert meeting["duration"] == pytest.approx(20.0)
+    return meeting
+
+
+def test_chunks_in_any_order(client):
+    data = _wav()
+    upload_id = _start(client, data)
+    chunks = _chunks(data)
+
+    for index in (2, 0, 1):
+        response = _put(client, upload_id, index, chunks[index])
+        assert response.status_code == 200
+        assert response.json()["size"] == len(chunks[index])
+
+    assert _status(client, upload_id)["received_chunks"] == [0, 1, 2]
+    _assert_saved(_complete(client, upload_id), data)
+    # The session is gone once the meeting exists
+    assert client.get(f"/api/uploads/{upload_id}").status_code == 404
+    assert not os.path.exists(os.path.join(UPLOAD_SESSION_DIR, upload_id))
+
+
+def test_rewritten_chunk_replaces_the_first_attempt(client):
+    data = _wav()
+    upload_id = _start(client, data)
+    chunks = _chunks(data)
+
+    for index, chunk in enumerate(chunks):
+        assert _put(client, upload_id, index, chunk).status_code == 200
+    assert _put(client, upload_id, 1, b"\xff" * len(chunks[1])).status_code == 200
+    assert _put(client, upload_id, 1, chunks[1]).status_code == 200
+
+    _assert_saved(_complete(client, upload_id), data)
+
+
+def test_oversized_chunk_is_rejected(client):
+    data = _wav()
+    upload_id = _start(client, data)
+    chunks = _chunks(data)
+
+    response = _put(client, upload_id, 0, chunks[0] + b"x")
+    assert response.status_code == 400
+    assert response.json()["detail"] == f"Chunk 0 is larger than {CHUNK} bytes"
+    # The last chunk may only be as long as the rest of the file
+    assert _put(client, upload_id, 2, chunks[1]).status_code == 400
+    assert _status(client, upload_id)["missing_chunks"] == [0, 1, 2]
+
+
+def test_short_chunk_is_incomplete(client):
+    data = _wav()
+    upload_id = _start(client, data)
+    chunks = _chunks(data)
+
+    response = _put(client, upload_id, 1, chunks[1][:1000])
+    assert response.status_code == 400
+    assert response.json()["detail"] == f"Chunk 1 is incomplete: got 1000 of {CHUNK} bytes"
+    assert 1 in _status(client, upload_id)["missing_chunks"]
+
+
+def test_failed_rewrite_marks_the_chunk_missing_again(client):
+    data = _wav()
+    upload_id = _start(client, data)
+    chunks = _chunks(data)
+
+    assert _put(client, upload_id, 0, chunks[0]).status_code == 200
+    assert _put(client, upload_id, 0, chunks[0][:10]).status_code == 400
+
+    assert _status(client, upload_id)["missing_chunks"] == [0, 1, 2]
+
+
+def test_complete_with_missing_chunks_keeps_the_session(client):
+    data = _wav()
+    upload_id = _start(client, data)
+    chunks = _chunks(data)
+    assert _put(client, upload_id, 0, chunks[0]).status_code == 200
+    assert _put(client, upload_id, 2, chunks[2]).status_code == 200
+
+    response = _complete(client, upload_id)
+
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Missing chunks: [1]"
+    assert _status(client, upload_id)["missing_chunks"] == [1]
+
+    # Uploading the missing chunk finishes the upload
+    assert _put(client, upload_id, 1, chunks[1]).status_code == 200
+    _assert_saved(_complete(client, upload_id), data)
+
+
+@pytest.mark.parametrize("index", [-1, 3, 100])
+def test_chunk_index_out_of_range(client, index):
+    upload_id = _start(client, _wav())
+
+    response = _put(client, upload_id, index, b"\x00" * CHUNK)
+
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Chunk index must be between 0 and 2"
+
+
+def test_unknown_and_aborted_sessions(client):
+    assert _put(client, "doesnotexist", 0, b"data").status_code == 404
+    assert client.get("/api/uploads/..%2Fetc").status_code == 404
+
+    upload_id = _start(client, _wav())
+    assert client.delete(f"/api/uploads/{upload_id}").status_code == 200
+    assert _complete(client, upload_id).status_code == 404
+    assert client.delete(f"/api/uploads/{upload_id}").status_code == 404
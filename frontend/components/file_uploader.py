@@ -1,8 +1,91 @@
 """File upload component"""
+import os
 import streamlit as st
 import requests
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional
 
+# Files larger than this use the resumable chunked upload API
+CHUNKED_UPLOAD_THRESHOLD_MB = int(os.getenv("CHUNKED_UPLOAD_THRESHOLD_MB", "20"))
+UPLOAD_CHUNK_MB = int(os.getenv("UPLOAD_CHUNK_MB", "8"))
+UPLOAD_PARALLELISM = int(os.getenv("UPLOAD_PARALLELISM", "4"))
+UPLOAD_CHUNK_RETRIES = 3
+
+
+def _put_chunk(api_url: str, upload_id: str, index: int, data) -> int:
+    """Upload one chunk, retrying transient failures"""
+    for attempt in range(UPLOAD_CHUNK_RETRIES):
+        try:
+            response = requests.put(
+                f"{api_url}/api/uploads/{upload_id}/chunks/{index}",
+                data=data,
+                headers={"Content-Type": "application/octet-stream"},
+                timeout=120
+            )
+            if response.status_code == 200:
+                return index
+        except requests.RequestException:
+            if attempt == UPLOAD_CHUNK_RETRIES - 1:
+                raise
+    raise Exception(f"Chunk {index} failed: {response.json().get('detail', 'Unknown error')}")
+
+
+def upload_in_chunks(api_url: str, uploaded_file, meeting_title: str) -> requests.Response:
+    """
+    Upload a large file through a resumable upload session
+    
+    Args:
+        api_url: Backend API URL
+        uploaded_file: Streamlit UploadedFile
+        meeting_title: Meeting title
+    
+    Returns:
+        Response of the completing request (meeting data on success)
+    """
+    response = requests.post(
+        f"{api_url}/api/uploads",
+        json={
+            "filename": uploaded_file.name,
+            "title": meeting_title,
+            "total_size": uploaded_file.size,
+            "chunk_size": UPLOAD_CHUNK_MB * 1024 * 1024
+        },
+        timeout=30
+    )
+    if response.status_code != 200:
+        return response
+    
+    session = response.json()
+    upload_id = session['upload_id']
+    chunk_size = session['chunk_size']
+    buffer = uploaded_file.getbuffer()
+    progress_bar = st.progress(0.0, text="Uploading audio file...")
+    
+    # Send missing chunks in parallel; re-check with the server until none are left
+    for _ in range(UPLOAD_CHUNK_RETRIES):
+        missing = session['missing_chunks']
+        if not missing:
+            break
+        
+        done = session['total_chunks'] - len(missing)
+        with ThreadPoolExecutor(max_workers=UPLOAD_PARALLELISM) as pool:
+            futures = [
+                pool.submit(_put_chunk, api_url, upload_id, i, buffer[i * chunk_size:(i + 1) * chunk_size])
+                for i in missing
+            ]
+            for future in futures:
+                try:
+                    future.result()
+                    done += 1
+                    progress_bar.progress(done / session['total_chunks'], text="Uploading audio file...")
+                except Exception:
+                    pass
+        
+        session = requests.get(f"{api_url}/api/uploads/{upload_id}", timeout=30).json()
+    
+    progress_bar.empty()
+    return requests.post(f"{api_url}/api/uploads/{upload_id}/complete", timeout=300)
+
 
 def upload_audio_file(api_url: str) -> Optional[dict]:
     """
@@ -10,7 +93,7 @@ def upload_audio_file(api_url: str) -> Optional[dict]:
     
     Args:
         api_url: Backend API URL
-        
+    
     Returns:
         Meeting data if upload successful
     """
@@ -20,7 +103,7 @@ def upload_audio_file(api_url: str) -> Optional[dict]:
     uploaded_file = st.file_uploader(
         "Choose an audio file",
         type=["mp3", "wav", "m4a", "mp4", "webm"],
-        help="Supported formats: MP3, WAV, M4A, MP4, WebM (Max 25MB)"
+        help=f"Supported formats: MP3, WAV, M4A, MP4, WebM. Files over {CHUNKED_UPLOAD_THRESHOLD_MB}MB are uploaded in resumable chunks"
     )
     
     # Meeting title input
@@ -35,17 +118,20 @@ def upload_audio_file(api_url: str) -> Optional[dict]:
         if uploaded_file and meeting_title:
             with st.spinner("Uploading audio file..."):
                 try:
-                    # Prepare file for upload
-                    files = {"file": (uploaded_file.name, uploaded_file, uploaded_file.type)}
-                    data = {"title": meeting_title}
-                    
-                    # Upload to backend
-                    response = requests.post(
-                        f"{api_url}/api/upload",
-                        files=files,
-                        data=data,
-                        timeout=60
-                    )
+                    if uploaded_file.size > CHUNKED_UPLOAD_THRESHOLD_MB * 1024 * 1024:
+                        response = upload_in_chunks(api_url, uploaded_file, meeting_title)
+                    else:
+                        # Prepare file for upload
+                        files = {"file": (uploaded_file.name, uploaded_file, uploaded_file.type)}
+                        data = {"title": meeting_title}
+                        
+                        # Upload to backend
+                        response = requests.post(
+                            f"{api_url}/api/upload",
+                            files=files,
+                            data=data,
+                            timeout=60
+                        )
                     
                     if response.status_code == 200:
                         meeting_data = response.json()
@@ -54,7 +140,7 @@ def upload_audio_file(api_url: str) -> Optional[dict]:
                     else:
                         st.error(f"❌ Upload failed: {response.json().get('detail', 'Unknown error')}")
                         return None
-                        
+                
                 except Exception as e:
                     st.error(f"❌ Error: {str(e)}")
                     return None
@@ -2,6 +2,10 @@
 import streamlit as st
 from datetime import datetime
 
+# Match markers in search snippets (MATCH_START / MATCH_END in the backend's app.services.search)
+MATCH_START = "\x02"
+MATCH_END = "\x03"
+
 
 def display_meeting_results(meeting_data: dict):
     """
@@ -120,6 +124,10 @@ def display_meeting_list(meetings: list, api_url: str):
                 if meeting.get('duration'):
                     minutes = int(meeting['duration'] / 60)
                     st.write(f"**Duration:** {minutes} minutes")
+                if meeting.get('summarized'):
+                    st.write("**Status:** ✅ Summarized")
+                elif meeting.get('transcribed'):
+                    st.write("**Status:** 📝 Transcribed")
             
             with col2:
                 if st.button("View Details", key=f"view_{meeting['id']}"):
@@ -136,3 +144,42 @@ def display_meeting_list(meetings: list, api_url: str):
                             st.error("Failed to delete meeting")
                     except Exception as e:
                         st.error(f"Error: {str(e)}")
+
+
+def _format_timestamp(seconds: float) -> str:
+    """Format seconds as M:SS or H:MM:SS"""
+    seconds = int(seconds)
+    hours, remainder = divmod(seconds, 3600)
+    minutes, secs = divmod(remainder, 60)
+    return f"{hours}:{minutes:02d}:{secs:02d}" if hours else f"{minutes}:{secs:02d}"
+
+
+def _highlight(snippet: str) -> str:
+    """Render the match markers of a search snippet as bold"""
+    return snippet.replace(MATCH_START, "**").replace(MATCH_END, "**")
+
+
+def display_search_results(results: list):
+    """
+    Display full-text search results
+    
+    Args:
+        results: Results of GET /api/search
+    """
+    if not results:
+        st.info("No meetings match your search.")
+        return
+    
+    st.caption(f"{len(results)} matching meeting(s)")
+    
+    for result in results:
+        date = (result.get('date') or '')[:10]
+        with st.expander(f"🎙️ {result['title']} - {date}", expanded=True):
+            st.markdown(_highlight(result['snippet']))
+            
+            for segment in result.get('segments', []):
+                st.markdown(f"`{_format_timestamp(segment['start'])}` {_highlight(segment['snippet'])}")
+            
+            if st.button("View Details", key=f"search_view_{result['meeting_id']}"):
+                st.session_state['selected_meeting_id'] = result['meeting_id']
+                st.rerun()
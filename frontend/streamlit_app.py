@@ -1,10 +1,12 @@
 """Smart Meeting Notes Generator - Streamlit Frontend"""
 import os
+import json
+import time
 import streamlit as st
 import requests
 from datetime import datetime
 from components.file_uploader import upload_audio_file
-from components.results_display import display_meeting_results, display_meeting_list
+from components.results_display import display_meeting_results, display_meeting_list, display_search_results
 
 # Page configuration
 st.set_page_config(
@@ -17,6 +19,100 @@ st.set_page_config(
 # Backend API URL (supports both local and deployed environments)
 API_URL = os.getenv("API_URL", "http://localhost:8000")
 
+# Seconds between job status polls
+JOB_POLL_INTERVAL = float(os.getenv("JOB_POLL_INTERVAL", "2"))
+
+# Meetings per history page
+HISTORY_PAGE_SIZE = 20
+
+
+def wait_for_job(api_url: str, job: dict, label: str) -> dict:
+    """
+    Poll a background job until it completes or fails
+    
+    Args:
+        api_url: Backend API URL
+        job: Job data returned when the job was submitted
+        label: Text shown next to the progress bar
+        
+    Returns:
+        Final job data
+    """
+    progress_bar = st.progress(0.0, text=label)
+    
+    while job['state'] not in ('completed', 'failed'):
+        time.sleep(JOB_POLL_INTERVAL)
+        response = requests.get(f"{api_url}/api/jobs/{job['id']}", timeout=10)
+        response.raise_for_status()
+        job = response.json()
+        
+        elapsed = job.get('run_seconds') or 0
+        progress_bar.progress(job['progress'], text=f"{label} ({int(elapsed)}s)")
+    
+    progress_bar.empty()
+    return job
+
+
+def available_models(api_url: str) -> list:
+    """Whisper models enabled on the backend"""
+    try:
+        response = requests.get(f"{api_url}/api/models", timeout=5)
+        response.raise_for_status()
+        return response.json()['allowed_models']
+    except Exception:
+        return ["base"]
+
+
+def stream_transcription(api_url: str, meeting_id: int, model: str) -> dict:
+    """
+    Transcribe a meeting while showing segments as they are decoded
+    
+    Args:
+        api_url: Backend API URL
+        meeting_id: Meeting ID
+        model: Whisper model name
+        
+    Returns:
+        Data of the final 'done' event
+    """
+    progress_bar = st.progress(0.0, text="Transcribing audio...")
+    live_text = st.empty()
+    text = ""
+    duration = None
+    event = None
+    
+    with requests.get(
+        f"{api_url}/api/transcribe/{meeting_id}/stream",
+        params={"model": model},
+        stream=True,
+        timeout=(10, 600)
+    ) as response:
+        if response.status_code != 200:
+            raise Exception(response.json().get('detail', 'Unknown error'))
+        
+        for line in response.iter_lines(decode_unicode=True):
+            if line.startswith("event: "):
+                event = line[len("event: "):]
+            elif line.startswith("data: "):
+                data = json.loads(line[len("data: "):])
+                
+                if event == "start":
+                    duration = data.get('duration')
+                elif event == "segment":
+                    text += data['text']
+                    live_text.markdown(f"> {text.strip()}")
+                    if duration:
+                        progress_bar.progress(min(1.0, data['end'] / duration), text="Transcribing audio...")
+                elif event == "done":
+                    progress_bar.empty()
+                    live_text.empty()
+                    return data
+                elif event == "error":
+                    raise Exception(data.get('detail', 'Unknown error'))
+    
+    raise Exception("Stream ended before the transcript was stored")
+
+
 # Custom CSS
 st.markdown("""
 <style>
@@ -110,27 +206,52 @@ if page == "🎙️ New Meeting":
             
             # Transcription
             if not meeting.get('transcript_text'):
+                model = st.selectbox(
+                    "Whisper model",
+                    available_models(API_URL),
+                    help="Smaller models are faster, larger ones more accurate"
+                )
+                live = st.checkbox("⚡ Show transcript while it is decoded", value=True)
+                
                 if st.button("📝 Transcribe Audio", type="primary", use_container_width=True):
-                    with st.spinner("Transcribing audio... This may take a few minutes."):
+                    if live:
+                        try:
+                            done = stream_transcription(API_URL, meeting['id'], model)
+                            st.success("✅ Transcription complete!")
+                            
+                            # Update meeting data
+                            meeting['transcript_text'] = done['transcript']
+                            meeting['duration'] = done.get('duration')
+                            st.session_state['current_meeting'] = meeting
+                            st.rerun()
+                        except Exception as e:
+                            st.error(f"❌ Transcription failed: {str(e)}")
+                    else:
                         try:
                             response = requests.post(
                                 f"{API_URL}/api/transcribe/{meeting['id']}",
-                                timeout=600  # 10 minutes timeout
+                                params={"model": model},
+                                timeout=30
                             )
                             
-                            if response.status_code == 200:
-                                transcript_data = response.json()
-                                st.success("✅ Transcription complete!")
+                            if response.status_code in (200, 202):
+                                job = wait_for_job(API_URL, response.json(), "Transcribing audio...")
                                 
-                                # Update meeting data
-                                meeting['transcript_text'] = transcript_data['transcript']
-                                meeting['duration'] = transcript_data.get('duration')
-                                st.session_state['current_meeting'] = meeting
-                                st.rerun()
+                                if job['state'] == 'completed':
+                                    st.success("✅ Transcription complete!")
+                                    
+                                    # Reload meeting data with the stored transcript
+                                    meeting_response = requests.get(
+                                        f"{API_URL}/api/meetings/{meeting['id']}",
+                                        timeout=30
+                                    )
+                                    if meeting_response.status_code == 200:
+                                        st.session_state['current_meeting'] = meeting_response.json()
+                                    st.rerun()
+                                else:
+                                    st.error(f"❌ Transcription failed: {job.get('error') or 'Unknown error'}")
                             else:
                                 st.error(f"❌ Transcription failed: {response.json().get('detail', 'Unknown error')}")
-                        except requests.Timeout:
-                            st.error("❌ Transcription timed out. Try with a shorter audio file.")
                         except Exception as e:
                             st.error(f"❌ Error: {str(e)}")
             else:
@@ -138,11 +259,17 @@ if page == "🎙️ New Meeting":
             
             # Summarization
             if meeting.get('transcript_text') and not meeting.get('summary'):
+                summarizer = st.selectbox(
+                    "Summarizer",
+                    ["heuristic", "tfidf", "textrank"],
+                    help="TF-IDF and TextRank rank every sentence; heuristic picks the first, middle and last"
+                )
                 if st.button("🤖 Generate Summary", type="primary", use_container_width=True):
                     with st.spinner("Generating summary..."):
                         try:
                             response = requests.post(
                                 f"{API_URL}/api/summarize/{meeting['id']}",
+                                params={"method": summarizer},
                                 timeout=300  # 5 minutes timeout
                             )
                             
@@ -171,12 +298,21 @@ if page == "🎙️ New Meeting":
         display_meeting_results(st.session_state['current_meeting'])
 
 elif page == "📚 Meeting History":
-    # Fetch all meetings
+    # Cursors of the pages visited so far; the last one is the current page
+    if 'history_cursors' not in st.session_state:
+        st.session_state['history_cursors'] = [None]
+    
+    # Fetch one page of meetings
     try:
-        response = requests.get(f"{API_URL}/api/meetings", timeout=5)
+        response = requests.get(
+            f"{API_URL}/api/meetings",
+            params={"limit": HISTORY_PAGE_SIZE, "cursor": st.session_state['history_cursors'][-1]},
+            timeout=5
+        )
         
         if response.status_code == 200:
-            meetings = response.json()
+            page_data = response.json()
+            meetings = page_data['items']
             
             # Check if user selected a meeting from the list
             if st.session_state.get('selected_meeting_id'):
@@ -200,8 +336,39 @@ elif page == "📚 Meeting History":
                     st.error("Failed to load meeting details")
                     st.session_state['selected_meeting_id'] = None
             else:
-                # Display meeting list
-                display_meeting_list(meetings, API_URL)
+                # Search box; the full list is shown when it is empty
+                query = st.text_input(
+                    "🔍 Search meetings",
+                    placeholder="Search titles, transcripts, summaries and action items",
+                )
+                
+                if query.strip():
+                    search_response = requests.get(
+                        f"{API_URL}/api/search",
+                        params={"q": query},
+                        timeout=10
+                    )
+                    if search_response.status_code == 200:
+                        display_search_results(search_response.json())
+                    else:
+                        st.error(f"Search failed: {search_response.json().get('detail', 'Unknown error')}")
+                else:
+                    # Display meeting list
+                    display_meeting_list(meetings, API_URL)
+                    
+                    col1, col2 = st.columns(2)
+                    with col1:
+                        if len(st.session_state['history_cursors']) > 1 and st.button("← Newer"):
+                            st.session_state['history_cursors'].pop()
+                            st.rerun()
+                    with col2:
+                        if page_data['next_cursor'] and st.button("Older →"):
+                            st.session_state['history_cursors'].append(page_data['next_cursor'])
+                            st.rerun()
+        elif response.status_code == 400:
+            # Stale cursor; start again from the newest meetings
+            st.session_state['history_cursors'] = [None]
+            st.rerun()
         else:
             st.error("Failed to fetch meetings")
     except Exception as e: